@@ -16,6 +16,7 @@ from app.projects.models import Project
 from app.boards.models import Board
 from app.tasks.models import Task
 from app.comments.models import Comment
+from app.auth.models import RevokedToken
 
 config = context.config
 
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.database.base import Base, TimestampMixin
+
+
+class RevokedToken(Base, TimestampMixin):
+    """
+    Revoked token model - deny-list of tokens invalidated before expiry.
+    
+    Two kinds of entries:
+    - jti set: a single access or refresh token (e.g. logout)
+    - jti NULL: every token of user_id issued up to created_at, limited to
+      organization_id when set (e.g. a deactivated membership)
+      
+    The auto-increment id doubles as a change cursor so workers can load
+    new revocations incrementally; created_at covers ids that commit out
+    of order (see RevocationRegistry).
+    """
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        Index("ix_revoked_tokens_created_at", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String(64), nullable=True, unique=True)
+    user_id = Column(Integer, nullable=True, index=True)
+    organization_id = Column(Integer, nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,384 @@
+import calendar
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import event, func, inspect, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.auth.models import RevokedToken
+from app.core.config import settings
+from app.database.session import engine
+from app.users.models import UserOrganization
+
+
+logger = logging.getLogger(__name__)
+
+revoked_tokens = RevokedToken.__table__
+
+
+def _epoch(value: datetime) -> int:
+    """Convert a naive UTC datetime to epoch seconds (same unit as JWT iat/exp)."""
+    return calendar.timegm(value.utctimetuple())
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys.
+    
+    Answers "definitely not present" with no false negatives; a positive
+    answer is only probable and must be confirmed elsewhere.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.size = max(64, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+    
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+    
+    def add(self, key: str) -> None:
+        positions = self._positions(key)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationRegistry:
+    """
+    Per-process view of the revoked_tokens table.
+    
+    - Single-token revocations (jti) are held in a Bloom filter. A miss, which
+      is the common case, needs no I/O; a hit is confirmed with one indexed lookup.
+    - User-wide revocations are held as (user_id, organization_id) -> cutoff,
+      where organization_id None covers every organization.
+    - New rows are pulled incrementally once per refresh interval by a
+      background thread, which is how revocations reach the other workers,
+      so checks on the request path read memory only. Ids from concurrent
+      transactions can commit out of order, so each load takes the rows past
+      the last seen id plus every row created within the lookback window
+      before the previous load; rows already applied are skipped.
+      The filter is rebuilt from scratch when it fills up so expired entries
+      drop out; the new state replaces the old one only once fully loaded.
+      
+    Without start() (scripts, tests) checks refresh inline when due.
+    """
+    
+    def __init__(
+        self,
+        bind: Engine,
+        refresh_seconds: float,
+        capacity: int,
+        error_rate: float,
+        lookback_seconds: float
+    ):
+        self._bind = bind
+        self._refresh_seconds = refresh_seconds
+        self._lookback = timedelta(seconds=lookback_seconds)
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._user_cutoffs: Dict[Tuple[int, Optional[int]], Tuple[int, int]] = {}
+        self._last_id = 0
+        self._last_load: Optional[datetime] = None
+        self._recent: Dict[int, datetime] = {}
+        self._next_refresh = 0.0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Load the revocation list and refresh it in the background (called on application startup)."""
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="revocation-refresh", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the background refresh (called on application shutdown)."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout=self._refresh_seconds + 1)
+        self._thread = None
+    
+    def _refresh_loop(self) -> None:
+        while not self._stopping.wait(self._refresh_seconds):
+            self.refresh()
+    
+    def _refresh_due(self) -> bool:
+        return self._thread is None and time.monotonic() >= self._next_refresh
+    
+    def _user_revoked(self, payload: Dict[str, Any]) -> bool:
+        cutoffs = self._user_cutoffs
+        if not cutoffs:
+            return False
+        user_id = payload.get("user_id")
+        issued_at = payload.get("iat", 0)
+        now = int(time.time())
+        for key in ((user_id, None), (user_id, payload.get("organization_id"))):
+            cutoff = cutoffs.get(key)
+            if cutoff and issued_at <= cutoff[0] and now < cutoff[1]:
+                return True
+        return False
+    
+    def _bloom_hit(self, payload: Dict[str, Any]) -> Optional[str]:
+        jti = payload.get("jti")
+        return jti if jti and jti in self._bloom else None
+    
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        """
+        Check whether a decoded token has been revoked.
+        
+        A filter hit is confirmed with a blocking query on this thread;
+        use is_revoked_async on the event loop.
+        
+        Args:
+            payload: Decoded JWT payload
+            
+        Returns:
+            True if the token must be rejected
+        """
+        if self._refresh_due():
+            self.refresh()
+        if self._user_revoked(payload):
+            return True
+        jti = self._bloom_hit(payload)
+        return jti is not None and self._confirm(jti)
+    
+    async def is_revoked_async(self, payload: Dict[str, Any]) -> bool:
+        """
+        Check whether a decoded token has been revoked, without blocking the event loop.
+        
+        Reads memory only; the rare filter hit is confirmed in the threadpool.
+        
+        Args:
+            payload: Decoded JWT payload
+            
+        Returns:
+            True if the token must be rejected
+        """
+        if self._refresh_due():
+            await run_in_threadpool(self.refresh)
+        if self._user_revoked(payload):
+            return True
+        jti = self._bloom_hit(payload)
+        return jti is not None and await run_in_threadpool(self._confirm, jti)
+    
+    def refresh(self) -> None:
+        """Pull revocations added since the last refresh."""
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_refresh = time.monotonic() + self._refresh_seconds
+            if self._bloom.count >= self._bloom.capacity:
+                self._rebuild()
+            else:
+                self._load()
+        except SQLAlchemyError:
+            logger.exception("Failed to refresh token revocation list")
+        finally:
+            self._lock.release()
+    
+    def add_local(self, jti: str) -> None:
+        """Record a revocation committed by this process without waiting for the next refresh."""
+        self._bloom.add(jti)
+    
+    def _load(self) -> None:
+        now = datetime.utcnow()
+        cutoffs = dict(self._user_cutoffs)
+        criteria = revoked_tokens.c.id > self._last_id
+        if self._last_load is not None:
+            window_start = self._last_load - self._lookback
+            criteria = or_(criteria, revoked_tokens.c.created_at >= window_start)
+            self._recent = {row_id: created for row_id, created in self._recent.items() if created >= window_start}
+        query = select(
+            revoked_tokens.c.id,
+            revoked_tokens.c.jti,
+            revoked_tokens.c.user_id,
+            revoked_tokens.c.organization_id,
+            revoked_tokens.c.created_at,
+            revoked_tokens.c.expires_at
+        ).where(criteria).order_by(revoked_tokens.c.id)
+        
+        with self._bind.connect() as connection:
+            rows = connection.execute(query).all()
+        self._last_load = now
+        
+        for row in rows:
+            if row.id in self._recent:
+                continue
+            self._recent[row.id] = row.created_at
+            self._last_id = max(self._last_id, row.id)
+            if row.expires_at <= now:
+                continue
+            if row.jti:
+                self._bloom.add(row.jti)
+            elif row.user_id is not None:
+                key = (row.user_id, row.organization_id)
+                cutoff = (_epoch(row.created_at), _epoch(row.expires_at))
+                current = cutoffs.get(key)
+                if not current or cutoff[0] > current[0]:
+                    cutoffs[key] = cutoff
+        
+        # Replaced, not mutated, so concurrent checks never see it change mid-read
+        self._user_cutoffs = {key: cutoff for key, cutoff in cutoffs.items() if cutoff[1] > _epoch(now)}
+    
+    def _rebuild(self) -> None:
+        with self._bind.connect() as connection:
+            live = connection.execute(
+                select(func.count()).select_from(revoked_tokens).where(
+                    revoked_tokens.c.jti.isnot(None),
+                    revoked_tokens.c.expires_at > datetime.utcnow()
+                )
+            ).scalar()
+        # Size for what is live now, with headroom before the next rebuild
+        capacity = max(self._capacity, live * 2)
+        fresh = RevocationRegistry(
+            self._bind, self._refresh_seconds, capacity, self._error_rate, self._lookback.total_seconds()
+        )
+        fresh._load()
+        self._capacity = capacity
+        self._bloom, self._user_cutoffs = fresh._bloom, fresh._user_cutoffs
+        self._last_id, self._last_load, self._recent = fresh._last_id, fresh._last_load, fresh._recent
+    
+    def _confirm(self, jti: str) -> bool:
+        try:
+            with self._bind.connect() as connection:
+                row = connection.execute(
+                    select(revoked_tokens.c.id).where(
+                        revoked_tokens.c.jti == jti,
+                        revoked_tokens.c.expires_at > datetime.utcnow()
+                    )
+                ).first()
+        except SQLAlchemyError:
+            logger.exception("Failed to confirm token revocation")
+            # Fail closed: a filter hit we cannot disprove is treated as revoked
+            return True
+        return row is not None
+
+
+revocation_registry = RevocationRegistry(
+    engine,
+    refresh_seconds=settings.TOKEN_REVOCATION_REFRESH_SECONDS,
+    capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    lookback_seconds=settings.TOKEN_REVOCATION_LOOKBACK_SECONDS
+)
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING
+_INSERT_IGNORE = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def _revoked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token has been revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def ensure_not_revoked(payload: Dict[str, Any]) -> None:
+    """
+    Reject a decoded token that has been revoked.
+    
+    Args:
+        payload: Decoded JWT payload
+        
+    Raises:
+        HTTPException: If the token has been revoked
+    """
+    if revocation_registry.is_revoked(payload):
+        raise _revoked()
+
+
+async def ensure_not_revoked_async(payload: Dict[str, Any]) -> None:
+    """
+    Reject a decoded token that has been revoked, without blocking the event loop.
+    
+    Args:
+        payload: Decoded JWT payload
+        
+    Raises:
+        HTTPException: If the token has been revoked
+    """
+    if await revocation_registry.is_revoked_async(payload):
+        raise _revoked()
+
+
+def revoke_token(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Add a single decoded token to the revocation table.
+    
+    Idempotent: concurrent revocations of the same token (two logouts
+    racing) insert one row and neither fails on the unique jti.
+    
+    The caller commits the session; call revocation_registry.add_local
+    afterwards so this process sees the revocation immediately.
+    
+    Args:
+        db: Database session
+        payload: Decoded JWT payload with jti and exp
+    """
+    jti = payload.get("jti")
+    if not jti:
+        return
+    
+    values = {
+        "jti": jti,
+        "user_id": payload.get("user_id"),
+        "organization_id": payload.get("organization_id"),
+        "expires_at": datetime.utcfromtimestamp(payload["exp"])
+    }
+    insert_ignore = _INSERT_IGNORE.get(db.get_bind().dialect.name)
+    if insert_ignore is not None:
+        db.execute(insert_ignore(revoked_tokens).values(**values).on_conflict_do_nothing(index_elements=["jti"]))
+        return
+    
+    try:
+        with db.begin_nested():
+            db.execute(revoked_tokens.insert().values(**values))
+    except IntegrityError:
+        pass
+
+
+@event.listens_for(UserOrganization, "after_update")
+def _revoke_on_membership_deactivation(mapper, connection, target):
+    """
+    Revoke the user's tokens for an organization when the membership is deactivated.
+    
+    Runs inside the flush, so the revocation commits or rolls back together
+    with the membership change. Bulk query.update() calls bypass this hook.
+    """
+    history = inspect(target).attrs.is_active.history
+    if not history.deleted or not history.deleted[0] or target.is_active:
+        return
+    
+    connection.execute(
+        revoked_tokens.insert().values(
+            user_id=target.user_id,
+            organization_id=target.organization_id,
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        )
+    )
@@ -1,15 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from typing import List
 from app.database.session import get_db
+from app.core.dependencies import get_current_user, security
+from app.core.tracing import TracedRoute
 from app.auth.schemas import (
     LoginRequest, LoginResponse,
     RegisterRequest, RegisterResponse,
-    RefreshTokenRequest, RefreshTokenResponse
+    RefreshTokenRequest, RefreshTokenResponse,
+    LogoutRequest,
+    SwitchOrganizationRequest, MembershipResponse
 )
 from app.auth.service import AuthService
 
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TracedRoute)
 
 
 @router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
@@ -57,3 +63,54 @@ async def refresh_token(
     """
     access_token = AuthService.refresh_access_token(db, data.refresh_token)
     return RefreshTokenResponse(access_token=access_token, token_type="bearer")
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    data: LogoutRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke the current access token and the optional refresh token.
+    
+    Revoked tokens are rejected by every worker within the revocation
+    refresh interval, and immediately by the worker handling this request.
+    """
+    AuthService.logout(db, credentials.credentials, data.refresh_token)
+
+
+@router.post("/switch-organization", response_model=LoginResponse)
+async def switch_organization(
+    data: SwitchOrganizationRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Switch the active organization without logging in again.
+    
+    Verifies the refresh token and the user's membership in the target
+    organization, then returns tokens scoped to that organization.
+    """
+    result = AuthService.switch_organization(db, data.refresh_token, data.organization_id)
+    return LoginResponse(**result, token_type="bearer")
+
+
+@router.get("/memberships", response_model=List[MembershipResponse])
+async def list_memberships(
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    List the organizations the current user belongs to.
+    
+    The organization of the current access token is flagged with is_current.
+    """
+    memberships = AuthService.list_memberships(db, current_user["user_id"])
+    return [
+        MembershipResponse(
+            **membership,
+            is_current=membership["organization_id"] == current_user.get("organization_id")
+        )
+        for membership in memberships
+    ]
@@ -26,6 +26,11 @@ class RefreshTokenResponse(BaseModel):
     token_type: str = "bearer"
 
 
+class LogoutRequest(BaseModel):
+    """Schema for logout request."""
+    refresh_token: Optional[str] = None
+
+
 class RegisterRequest(BaseModel):
     """Schema for user registration."""
     email: EmailStr
@@ -43,3 +48,18 @@ class RegisterResponse(BaseModel):
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
+
+
+class SwitchOrganizationRequest(BaseModel):
+    """Schema for switching the active organization."""
+    refresh_token: str
+    organization_id: int = Field(..., gt=0)
+
+
+class MembershipResponse(BaseModel):
+    """Schema for an organization membership of the current user."""
+    organization_id: int
+    organization_name: str
+    organization_slug: str
+    role: str
+    is_current: bool = False
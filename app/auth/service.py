@@ -1,13 +1,17 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.invalidation import invalidation_bus
 from app.users.models import User, UserOrganization
 from app.organizations.models import Organization
 from app.roles.models import Role
 from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token, verify_token_type
+from app.core.tracing import traced_service
 from app.auth.schemas import LoginRequest, RegisterRequest
-from typing import Dict, Any
+from app.auth.revocation import ensure_not_revoked, revoke_token, revocation_registry
+from typing import Dict, Any, List, Optional
 
 
+@traced_service
 class AuthService:
     """
     Service layer for authentication operations.
@@ -78,6 +82,7 @@ class AuthService:
         )
         db.add(user_org)
         db.commit()
+        invalidation_bus.publish(organization.id, "users")
         
         token_data = {
             "user_id": user.id,
@@ -89,7 +94,10 @@ class AuthService:
         }
         
         access_token = create_access_token(token_data)
-        refresh_token = create_refresh_token({"user_id": user.id})
+        refresh_token = create_refresh_token({
+            "user_id": user.id,
+            "organization_id": organization.id
+        })
         
         return {
             "user_id": user.id,
@@ -158,7 +166,10 @@ class AuthService:
         }
         
         access_token = create_access_token(token_data)
-        refresh_token = create_refresh_token({"user_id": user.id})
+        refresh_token = create_refresh_token({
+            "user_id": user.id,
+            "organization_id": user_org.organization_id
+        })
         
         return {
             "access_token": access_token,
@@ -178,10 +189,11 @@ class AuthService:
             New access token
             
         Raises:
-            HTTPException: If refresh token is invalid
+            HTTPException: If refresh token is invalid or revoked
         """
         payload = decode_token(refresh_token)
         verify_token_type(payload, "refresh")
+        ensure_not_revoked(payload)
         
         user_id = payload.get("user_id")
         if not user_id:
@@ -197,12 +209,19 @@ class AuthService:
                 detail="User not found or inactive"
             )
         
-        user_org_data = db.query(UserOrganization, Role).join(
+        user_org_query = db.query(UserOrganization, Role).join(
             Role, UserOrganization.role_id == Role.id
         ).filter(
             UserOrganization.user_id == user.id,
             UserOrganization.is_active == True
-        ).first()
+        )
+        
+        # Keep the organization context the refresh token was issued for
+        organization_id = payload.get("organization_id")
+        if organization_id:
+            user_org_query = user_org_query.filter(UserOrganization.organization_id == organization_id)
+        
+        user_org_data = user_org_query.first()
         
         if not user_org_data:
             raise HTTPException(
@@ -222,3 +241,148 @@ class AuthService:
         }
         
         return create_access_token(token_data)
+    
+    @staticmethod
+    def switch_organization(db: Session, refresh_token: str, organization_id: int) -> Dict[str, str]:
+        """
+        Issue tokens for another organization the user belongs to.
+        
+        The refresh token proves identity, so no password check (and no bcrypt
+        round) is needed. User, membership and role are resolved with a single
+        query on the (user_id, organization_id) index.
+        
+        Args:
+            db: Database session
+            refresh_token: Valid refresh token
+            organization_id: Target organization ID
+            
+        Returns:
+            Dictionary with access_token and refresh_token scoped to the target organization
+            
+        Raises:
+            HTTPException: If refresh token is invalid, revoked, or user is not an active member
+        """
+        payload = decode_token(refresh_token)
+        verify_token_type(payload, "refresh")
+        ensure_not_revoked(payload)
+        
+        user_id = payload.get("user_id")
+        if not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token"
+            )
+        
+        membership = db.query(User, Role).join(
+            UserOrganization, UserOrganization.user_id == User.id
+        ).join(
+            Role, UserOrganization.role_id == Role.id
+        ).join(
+            Organization, UserOrganization.organization_id == Organization.id
+        ).filter(
+            UserOrganization.user_id == user_id,
+            UserOrganization.organization_id == organization_id,
+            UserOrganization.is_active == True,
+            User.is_active == True,
+            Organization.is_active == True
+        ).first()
+        
+        if not membership:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User is not an active member of this organization"
+            )
+        
+        user, role = membership
+        
+        token_data = {
+            "user_id": user.id,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "organization_id": organization_id,
+            "role": role.name
+        }
+        
+        access_token = create_access_token(token_data)
+        new_refresh_token = create_refresh_token({
+            "user_id": user.id,
+            "organization_id": organization_id
+        })
+        
+        return {
+            "access_token": access_token,
+            "refresh_token": new_refresh_token
+        }
+    
+    @staticmethod
+    def list_memberships(db: Session, user_id: int) -> List[Dict[str, Any]]:
+        """
+        List the active organizations a user belongs to, with their role in each.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            
+        Returns:
+            List of membership dictionaries
+        """
+        rows = db.query(
+            UserOrganization.organization_id,
+            Organization.name,
+            Organization.slug,
+            Role.name
+        ).join(
+            Organization, UserOrganization.organization_id == Organization.id
+        ).join(
+            Role, UserOrganization.role_id == Role.id
+        ).filter(
+            UserOrganization.user_id == user_id,
+            UserOrganization.is_active == True,
+            Organization.is_active == True
+        ).order_by(Organization.name).all()
+        
+        return [
+            {
+                "organization_id": organization_id,
+                "organization_name": name,
+                "organization_slug": slug,
+                "role": role_name
+            }
+            for organization_id, name, slug, role_name in rows
+        ]
+    
+    @staticmethod
+    def logout(db: Session, access_token: str, refresh_token: Optional[str] = None) -> None:
+        """
+        Revoke the current access token and, if given, its refresh token.
+        
+        Args:
+            db: Database session
+            access_token: Access token of the current request
+            refresh_token: Optional refresh token to revoke as well
+            
+        Raises:
+            HTTPException: If a token is invalid or belongs to another user
+        """
+        access_payload = decode_token(access_token)
+        verify_token_type(access_payload, "access")
+        payloads = [access_payload]
+        
+        if refresh_token:
+            refresh_payload = decode_token(refresh_token)
+            verify_token_type(refresh_payload, "refresh")
+            if refresh_payload.get("user_id") != access_payload.get("user_id"):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Refresh token belongs to a different user"
+                )
+            payloads.append(refresh_payload)
+        
+        for payload in payloads:
+            revoke_token(db, payload)
+        db.commit()
+        
+        for payload in payloads:
+            if payload.get("jti"):
+                revocation_registry.add_local(payload["jti"])
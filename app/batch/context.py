@@ -0,0 +1,21 @@
+from typing import Any, Dict
+from sqlalchemy.orm import Session
+
+
+BATCH_SCOPE_KEY = "saas.batch"
+
+
+class BatchContext:
+    """
+    State shared by all sub-requests of one /batch call.
+    
+    Stored in each sub-request's ASGI scope under BATCH_SCOPE_KEY.
+    get_current_user returns the already decoded user for the batch's own
+    token, and get_db yields the batch's session instead of opening one.
+    """
+    __slots__ = ("token", "user", "db")
+    
+    def __init__(self, token: str, user: Dict[str, Any], db: Session):
+        self.token = token
+        self.user = user
+        self.db = db
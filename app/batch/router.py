@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+from app.database.session import get_db
+from app.core.dependencies import get_current_user, security
+from app.core.tracing import TracedRoute
+from app.batch.context import BatchContext
+from app.batch.schemas import BatchRequest, BatchResponse
+from app.batch.service import BatchService
+from app.utils.serialization import PreEncodedJSONResponse
+
+
+router = APIRouter(prefix="/batch", tags=["Batch"], route_class=TracedRoute)
+
+
+@router.post("/", response_model=BatchResponse)
+async def run_batch(
+    request: Request,
+    data: BatchRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Run several API calls in one round trip.
+    
+    Paths are relative to the API prefix (e.g. "/projects/?page=1").
+    The token is decoded once and one database session serves all items.
+    Items run one after another, in request order.
+    Each item reports its own status, headers and body; a failing item
+    does not fail the batch.
+    """
+    context = BatchContext(credentials.credentials, current_user, db)
+    body = await BatchService.execute(request, data.requests, context)
+    return PreEncodedJSONResponse(content=body)
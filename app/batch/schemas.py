@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Literal, Optional
+from app.core.config import settings
+
+
+# Routes whose responses never end (realtime) or are whole files (exports):
+# a batch would hold its shared session for the duration and buffer the body.
+STREAMING_SECTIONS = ("realtime", "exports")
+
+
+class BatchOperation(BaseModel):
+    """Schema for a single sub-request of a batch."""
+    id: Optional[str] = Field(None, max_length=64)
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., min_length=1, max_length=2048)
+    body: Optional[Any] = None
+    headers: Dict[str, str] = Field(default_factory=dict)
+    
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, value: str) -> str:
+        """Paths are relative to the API prefix, e.g. "/projects/?page=2"."""
+        if not value.startswith("/") or value.startswith("//"):
+            raise ValueError("path must start with a single '/'")
+        section = value.split("?", 1)[0].split("/")[1]
+        if section == "batch":
+            raise ValueError("batches cannot be nested")
+        if section in STREAMING_SECTIONS:
+            raise ValueError(f"/{section} responses are streamed and cannot be batched")
+        return value
+
+
+class BatchRequest(BaseModel):
+    """Schema for a batch of sub-requests."""
+    requests: List[BatchOperation] = Field(..., min_length=1, max_length=settings.BATCH_MAX_REQUESTS)
+
+
+class BatchItemResponse(BaseModel):
+    """Schema for the result of one sub-request."""
+    id: Optional[str]
+    status: int
+    headers: Dict[str, str]
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """Schema for batch response, in request order."""
+    responses: List[BatchItemResponse]
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List
+from fastapi import Request
+from pydantic_core import to_json
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.types import ASGIApp, Message
+from app.batch.context import BATCH_SCOPE_KEY, BatchContext
+from app.batch.schemas import BatchOperation
+from app.core.config import settings
+from app.core.tracing import traced_service
+from app.utils.serialization import JSON, current_format
+
+
+logger = logging.getLogger(__name__)
+
+# Per-item headers a client may set; authorization always comes from the batch.
+FORWARDED_HEADERS = {"if-none-match", "if-match", "accept"}
+
+# Keys set on the outer scope by routing, which each sub-request resolves anew.
+ROUTING_SCOPE_KEYS = ("route", "endpoint", "path_params", "fastapi_astack")
+
+INTERNAL_ERROR = b'{"detail":"Internal Server Error"}'
+
+
+@traced_service
+class BatchService:
+    """
+    Runs the sub-requests of a /batch call in-process.
+    
+    Sub-requests go through the application's router and exception
+    handlers, so they behave exactly like separate HTTP calls (validation,
+    RBAC, ETags, response cache) without the per-request HTTP, middleware,
+    token decode and session setup costs.
+    """
+    
+    @staticmethod
+    async def execute(request: Request, operations: List[BatchOperation], context: BatchContext) -> bytes:
+        """
+        Run all operations and encode the batch response body.
+        
+        Items run one at a time, in request order, so writes see the
+        effects of earlier items. Items share one session and cached GETs
+        build in the threadpool, so running items concurrently could use
+        the session from two threads at once. Each write commits on its
+        own: a failing item does not roll back earlier ones, and the
+        session is rolled back after it so the following items start clean.
+        
+        Item bodies are spliced into the JSON batch response, so items are
+        always encoded as JSON whatever format the batch request negotiated.
+        
+        Args:
+            request: The /batch request
+            operations: Sub-requests in order
+            context: Shared user and session
+            
+        Returns:
+            Encoded BatchResponse JSON
+        """
+        app = ExceptionMiddleware(request.app.router, handlers=request.app.exception_handlers)
+        base_scope = {k: v for k, v in request.scope.items() if k not in ROUTING_SCOPE_KEYS}
+        base_scope[BATCH_SCOPE_KEY] = context
+        
+        results: List[bytes] = []
+        token = current_format.set(JSON)
+        try:
+            for op in operations:
+                results.append(await BatchService._run(app, base_scope, context, op))
+        finally:
+            current_format.reset(token)
+        return b'{"responses":[' + b",".join(results) + b"]}"
+    
+    @staticmethod
+    async def _run(app: ASGIApp, base_scope: Dict[str, Any], context: BatchContext, op: BatchOperation) -> bytes:
+        path, _, query = op.path.partition("?")
+        full_path = settings.API_V1_STR + path
+        body = to_json(op.body) if op.body is not None else b""
+        headers = [
+            (b"authorization", f"Bearer {context.token}".encode("latin-1")),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        headers.extend(
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in op.headers.items()
+            if name.lower() in FORWARDED_HEADERS
+        )
+        
+        body_sent = False
+        
+        async def receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Sub-requests never disconnect; wait until the response is done.
+            await asyncio.Event().wait()
+        
+        status_code = 500
+        response_headers: Dict[str, str] = {}
+        chunks: List[bytes] = []
+        
+        async def send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    name = name.decode("latin-1")
+                    if name != "content-length":
+                        response_headers[name] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+        
+        try:
+            async with AsyncExitStack() as stack:
+                scope = {
+                    **base_scope,
+                    "method": op.method,
+                    "path": full_path,
+                    "raw_path": full_path.encode("utf-8"),
+                    "query_string": query.encode("latin-1"),
+                    "headers": headers,
+                    "fastapi_astack": stack
+                }
+                await app(scope, receive, send)
+        except Exception:
+            logger.exception("Batch item %s %s failed", op.method, op.path)
+            status_code, response_headers, chunks = 500, {"content-type": "application/json"}, [INTERNAL_ERROR]
+        
+        if status_code >= 400:
+            # Discard whatever the item left uncommitted (or a failed
+            # transaction) so the following items start clean.
+            context.db.rollback()
+        
+        payload = b"".join(chunks)
+        if not payload:
+            encoded_body = b"null"
+        elif response_headers.get("content-type", "").startswith("application/json"):
+            encoded_body = payload
+        else:
+            encoded_body = to_json(payload.decode("utf-8", errors="replace"))
+        
+        item = to_json({"id": op.id, "status": status_code, "headers": response_headers})
+        return item[:-1] + b',"body":' + encoded_body + b"}"
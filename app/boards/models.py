@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
-from app.database.base import Base, TimestampMixin, TenantMixin
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Index
+from app.database.base import Base, TimestampMixin, TenantMixin, VersionMixin, tenant_index
 
 
-class Board(Base, TimestampMixin, TenantMixin):
+class Board(Base, TimestampMixin, TenantMixin, VersionMixin):
     """
     Board model - represents a board within a project (e.g., Kanban board).
     
@@ -12,9 +12,13 @@ class Board(Base, TimestampMixin, TenantMixin):
     - Double isolation: project_id AND organization_id
     """
     __tablename__ = "boards"
+    __table_args__ = (
+        tenant_index("boards"),
+        Index("ix_boards_project_id_position", "project_id", "position"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(String(500))
     position = Column(Integer, default=0)
@@ -1,21 +1,25 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 from app.database.session import get_db
 from app.core.dependencies import get_current_user, get_tenant_id, require_manager_or_admin
 from app.boards.schemas import BoardCreate, BoardUpdate, BoardResponse
 from app.boards.service import BoardService
+from app.utils.serialization import json_response, json_list_response
+from app.core.cache import response_cache
+from app.core.tracing import TracedRoute
+from app.utils.etag import make_etag, entity_etag, etag_headers, if_match_versions, is_not_modified, not_modified_response
 
 
-router = APIRouter(prefix="/boards", tags=["Boards"])
+router = APIRouter(prefix="/boards", tags=["Boards"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=BoardResponse, status_code=status.HTTP_201_CREATED)
 async def create_board(
     data: BoardCreate,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(require_manager_or_admin),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Create a new board within a project.
@@ -28,55 +32,81 @@ async def create_board(
 
 @router.get("/project/{project_id}", response_model=List[BoardResponse])
 async def list_boards_by_project(
+    request: Request,
     project_id: int,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     List all boards for a specific project.
+    
+    Supports If-None-Match; unchanged lists return 304 without being loaded.
     """
-    boards = BoardService.list_boards_by_project(db, project_id, tenant_id)
-    return boards
+    def build():
+        etag = make_etag(
+            "boards", tenant_id, project_id,
+            BoardService.get_project_boards_version(db, project_id, tenant_id)
+        )
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        boards = BoardService.list_boards_by_project(db, project_id, tenant_id)
+        return json_list_response(BoardResponse, boards, headers=etag_headers(etag))
+    
+    return await response_cache.serve(request, "boards", tenant_id, current_user.get("role"), build)
 
 
 @router.get("/{board_id}", response_model=BoardResponse)
 async def get_board(
+    request: Request,
     board_id: int,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Get board by ID.
+    
+    Supports If-None-Match.
     """
-    board = BoardService.get_board(db, board_id, tenant_id)
-    return board
+    def build():
+        version = BoardService.get_board_version(db, board_id, tenant_id)
+        if version is not None and is_not_modified(request, entity_etag(version)):
+            return not_modified_response(entity_etag(version))
+        
+        board = BoardService.get_board(db, board_id, tenant_id)
+        return json_response(BoardResponse, board, headers=etag_headers(entity_etag(board.version)))
+    
+    return await response_cache.serve(request, "boards", tenant_id, current_user.get("role"), build)
 
 
 @router.put("/{board_id}", response_model=BoardResponse)
 async def update_board(
     board_id: int,
     data: BoardUpdate,
-    db: Session = Depends(get_db),
+    versions: Optional[Tuple[int, ...]] = Depends(if_match_versions),
     current_user: dict = Depends(require_manager_or_admin),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Update board.
     
     Requires PROJECT_MANAGER or ORG_ADMIN role.
+    With If-Match (the board's ETag), the update only applies if the board
+    has not changed since; otherwise 412 Precondition Failed.
     """
-    board = BoardService.update_board(db, board_id, data, tenant_id)
-    return board
+    board = BoardService.update_board(db, board_id, data, tenant_id, versions)
+    return json_response(BoardResponse, board, headers=etag_headers(entity_etag(board.version)))
 
 
 @router.delete("/{board_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_board(
     board_id: int,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(require_manager_or_admin),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Delete (deactivate) board.
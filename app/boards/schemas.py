@@ -31,6 +31,7 @@ class BoardResponse(BoardBase):
     is_active: bool
     created_at: datetime
     updated_at: datetime
+    version: int
     
     class Config:
         from_attributes = True
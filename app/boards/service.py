@@ -1,11 +1,20 @@
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.invalidation import invalidation_bus
+from app.core.entity_cache import entity_cache
+from app.core.tracing import traced_service
+from app.realtime.events import change_event, topic_name
 from app.boards.models import Board
 from app.projects.models import Project
-from app.boards.schemas import BoardCreate, BoardUpdate
-from typing import List
+from app.boards.schemas import BoardCreate, BoardUpdate, BoardResponse
+from app.utils.projection import response_columns
+from app.utils.etag import collection_version
+from app.utils.versioning import versioned_update
+from typing import List, Optional, Tuple, Any
 
 
+@traced_service
 class BoardService:
     """
     Service layer for board operations.
@@ -30,12 +39,7 @@ class BoardService:
         Raises:
             HTTPException: If project not found or belongs to different tenant
         """
-        project = db.query(Project).filter(
-            Project.id == data.project_id,
-            Project.organization_id == organization_id
-        ).first()
-        
-        if not project:
+        if entity_cache.owner_of(db, Project, data.project_id) != organization_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found"
@@ -48,6 +52,12 @@ class BoardService:
         db.add(board)
         db.commit()
         db.refresh(board)
+        invalidation_bus.publish(organization_id, "boards", events=[
+            change_event(
+                topic_name("project", board.project_id), "board", "created", board.id,
+                BoardResponse.model_validate(board).model_dump(mode="json")
+            )
+        ])
         return board
     
     @staticmethod
@@ -79,7 +89,7 @@ class BoardService:
         return board
     
     @staticmethod
-    def list_boards_by_project(db: Session, project_id: int, organization_id: int) -> List[Board]:
+    def list_boards_by_project(db: Session, project_id: int, organization_id: int) -> List[Row]:
         """
         List all boards for a specific project.
         
@@ -89,35 +99,96 @@ class BoardService:
             organization_id: Current tenant ID
             
         Returns:
-            List of boards
+            List of board rows (BoardResponse columns only)
         """
-        return db.query(Board).filter(
+        return db.query(*response_columns(Board, BoardResponse)).filter(
             Board.project_id == project_id,
             Board.organization_id == organization_id
         ).order_by(Board.position).all()
     
     @staticmethod
-    def update_board(db: Session, board_id: int, data: BoardUpdate, organization_id: int) -> Board:
+    def get_board_version(db: Session, board_id: int, organization_id: int) -> Optional[int]:
+        """
+        Version of a single board, used to build its ETag.
+        
+        Args:
+            db: Database session
+            board_id: Board ID
+            organization_id: Current tenant ID
+            
+        Returns:
+            Board version, or None if not found
+        """
+        return db.query(Board.version).filter(Board.id == board_id, Board.organization_id == organization_id).scalar()
+    
+    @staticmethod
+    def get_project_boards_version(db: Session, project_id: int, organization_id: int) -> Tuple[Any, ...]:
+        """
+        Change fingerprint for list_boards_by_project.
+        
+        Args:
+            db: Database session
+            project_id: Project ID
+            organization_id: Current tenant ID
+            
+        Returns:
+            (count, max updated_at, max id) of the project's boards
+        """
+        return collection_version(
+            db, Board, Board.project_id == project_id, Board.organization_id == organization_id
+        )
+    
+    @staticmethod
+    def update_board(
+        db: Session,
+        board_id: int,
+        data: BoardUpdate,
+        organization_id: int,
+        versions: Optional[Tuple[int, ...]] = None
+    ) -> Row:
         """
         Update board with tenant isolation.
         
+        A single conditional UPDATE ... RETURNING; the board is only read
+        again to tell a missing board from a failed precondition.
+        
         Args:
             db: Database session
             board_id: Board ID
             data: Update data
             organization_id: Current tenant ID
+            versions: Versions accepted by If-Match, None for any
             
         Returns:
-            Updated board
+            Updated board row (BoardResponse columns)
+            
+        Raises:
+            HTTPException: If board not found (404) or its version is not in versions (412)
         """
-        board = BoardService.get_board(db, board_id, organization_id)
-        
         update_data = data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(board, field, value)
+        board = versioned_update(
+            db, Board, board_id, organization_id, update_data,
+            response_columns(Board, BoardResponse), versions
+        )
+        if board is None:
+            db.rollback()
+            if BoardService.get_board_version(db, board_id, organization_id) is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Board not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Board was modified by another request"
+            )
         
         db.commit()
-        db.refresh(board)
+        response = BoardResponse.model_validate(board).model_dump(mode="json")
+        changed = {field: response[field] for field in (*update_data, "version", "updated_at")}
+        invalidation_bus.publish(
+            organization_id, "boards", entity=(Board, board_id), db=db,
+            events=[change_event(topic_name("project", board.project_id), "board", "updated", board_id, changed)]
+        )
         return board
     
     @staticmethod
@@ -129,7 +200,22 @@ class BoardService:
             db: Database session
             board_id: Board ID
             organization_id: Current tenant ID
+            
+        Raises:
+            HTTPException: If board not found
         """
-        board = BoardService.get_board(db, board_id, organization_id)
-        board.is_active = False
+        # A single conditional UPDATE; flushing a loaded instance would fail
+        # its version check (StaleDataError) after a concurrent update.
+        board = versioned_update(db, Board, board_id, organization_id, {"is_active": False}, (Board.project_id,))
+        if board is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Board not found"
+            )
+        project_id = board.project_id
         db.commit()
+        invalidation_bus.publish(
+            organization_id, "boards", entity=(Board, board_id), db=db,
+            events=[change_event(topic_name("project", project_id), "board", "deleted", board_id)]
+        )
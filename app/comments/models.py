@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey
-from app.database.base import Base, TimestampMixin, TenantMixin
+from sqlalchemy import Column, Integer, Text, ForeignKey, Index
+from app.database.base import Base, TimestampMixin, TenantMixin, tenant_index
 
 
 class Comment(Base, TimestampMixin, TenantMixin):
@@ -12,8 +12,13 @@ class Comment(Base, TimestampMixin, TenantMixin):
     - Ensures comments are only visible within tenant context
     """
     __tablename__ = "comments"
+    __table_args__ = (
+        tenant_index("comments"),
+        # A task's comments are listed oldest first
+        Index("ix_comments_task_id_created_at", "task_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
@@ -1,21 +1,28 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.database.session import get_db
 from app.core.dependencies import get_current_user, get_tenant_id
-from app.comments.schemas import CommentCreate, CommentUpdate, CommentResponse
+from app.comments.schemas import CommentCreate, CommentUpdate, CommentResponse, COMMENT_EXPANSIONS
 from app.comments.service import CommentService
+from app.users.loader import UserLoader
+from app.users.service import UserService
+from app.utils.serialization import json_response, json_list_response
+from app.core.cache import response_cache
+from app.core.tracing import TracedRoute
+from app.utils.etag import make_etag, etag_headers, is_not_modified, not_modified_response
+from app.utils.fieldsets import FieldSelection, field_selection
 
 
-router = APIRouter(prefix="/comments", tags=["Comments"])
+router = APIRouter(prefix="/comments", tags=["Comments"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 async def create_comment(
     data: CommentCreate,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Create a new comment on a task.
@@ -28,39 +35,74 @@ async def create_comment(
 
 @router.get("/task/{task_id}", response_model=List[CommentResponse])
 async def list_comments_by_task(
+    request: Request,
     task_id: int,
-    db: Session = Depends(get_db),
+    selection: FieldSelection = Depends(field_selection(CommentResponse, COMMENT_EXPANSIONS)),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     List all comments for a specific task.
+    
+    fields= trims the returned (and selected) fields; expand=author embeds
+    the comment authors, loaded with one query for the whole list.
+    
+    Supports If-None-Match; unchanged lists return 304 without being loaded.
     """
-    comments = CommentService.list_comments_by_task(db, task_id, tenant_id)
-    return comments
+    def build():
+        etag = make_etag(
+            "comments", tenant_id, task_id, selection.key(),
+            CommentService.get_task_comments_version(db, task_id, tenant_id),
+            UserService.get_users_version(db, tenant_id) if selection.expand else None
+        )
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        comments = CommentService.list_comments_by_task(db, task_id, tenant_id, selection.exclude())
+        if selection.is_default:
+            return json_list_response(CommentResponse, comments, headers=etag_headers(etag))
+        
+        loader = UserLoader.for_session(db, tenant_id)
+        loader.load_many(selection.related_ids(comments))
+        return selection.json_list_response(comments, loader.get, headers=etag_headers(etag))
+    
+    namespace = ("comments", "users") if selection.expand else "comments"
+    return await response_cache.serve(request, namespace, tenant_id, current_user.get("role"), build)
 
 
 @router.get("/{comment_id}", response_model=CommentResponse)
 async def get_comment(
+    request: Request,
     comment_id: int,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Get comment by ID.
+    
+    Supports If-None-Match.
     """
-    comment = CommentService.get_comment(db, comment_id, tenant_id)
-    return comment
+    def build():
+        version = CommentService.get_comment_version(db, comment_id, tenant_id)
+        etag = make_etag("comment", tenant_id, comment_id, version)
+        if version is not None and is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        comment = CommentService.get_comment(db, comment_id, tenant_id)
+        return json_response(CommentResponse, comment, headers=etag_headers(etag))
+    
+    return await response_cache.serve(request, "comments", tenant_id, current_user.get("role"), build)
 
 
 @router.put("/{comment_id}", response_model=CommentResponse)
 async def update_comment(
     comment_id: int,
     data: CommentUpdate,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Update comment.
@@ -74,9 +116,9 @@ async def update_comment(
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Delete comment.
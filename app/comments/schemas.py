@@ -3,6 +3,10 @@ from datetime import datetime
 from typing import Optional
 
 
+# expand= names and the CommentResponse user id field each one resolves.
+COMMENT_EXPANSIONS = {"author": "user_id"}
+
+
 class CommentBase(BaseModel):
     """Base schema for comment data."""
     content: str = Field(..., min_length=1)
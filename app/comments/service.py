@@ -1,11 +1,20 @@
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.invalidation import invalidation_bus
+from app.core.entity_cache import entity_cache
+from app.core.tracing import traced_service
+from app.realtime.events import change_event, topic_name
 from app.comments.models import Comment
 from app.tasks.models import Task
-from app.comments.schemas import CommentCreate, CommentUpdate
-from typing import List
+from app.comments.schemas import CommentCreate, CommentUpdate, CommentResponse
+from app.utils.projection import response_columns
+from app.utils.etag import collection_version, row_version
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple, Any
 
 
+@traced_service
 class CommentService:
     """
     Service layer for comment operations.
@@ -31,12 +40,7 @@ class CommentService:
         Raises:
             HTTPException: If task not found or belongs to different tenant
         """
-        task = db.query(Task).filter(
-            Task.id == data.task_id,
-            Task.organization_id == organization_id
-        ).first()
-        
-        if not task:
+        if entity_cache.owner_of(db, Task, data.task_id) != organization_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
@@ -51,6 +55,12 @@ class CommentService:
         db.add(comment)
         db.commit()
         db.refresh(comment)
+        invalidation_bus.publish(organization_id, "comments", events=[
+            change_event(
+                topic_name("task", comment.task_id), "comment", "created", comment.id,
+                CommentResponse.model_validate(comment).model_dump(mode="json")
+            )
+        ])
         return comment
     
     @staticmethod
@@ -82,7 +92,7 @@ class CommentService:
         return comment
     
     @staticmethod
-    def list_comments_by_task(db: Session, task_id: int, organization_id: int) -> List[Comment]:
+    def list_comments_by_task(db: Session, task_id: int, organization_id: int, exclude: Iterable[str] = ()) -> List[Row]:
         """
         List all comments for a specific task.
         
@@ -90,15 +100,48 @@ class CommentService:
             db: Database session
             task_id: Task ID
             organization_id: Current tenant ID
+            exclude: CommentResponse fields to leave out of the SELECT
             
         Returns:
-            List of comments ordered by creation time
+            List of comment rows (CommentResponse columns only) ordered by creation time
         """
-        return db.query(Comment).filter(
+        return db.query(*response_columns(Comment, CommentResponse, exclude)).filter(
             Comment.task_id == task_id,
             Comment.organization_id == organization_id
         ).order_by(Comment.created_at).all()
     
+    @staticmethod
+    def get_comment_version(db: Session, comment_id: int, organization_id: int) -> Optional[datetime]:
+        """
+        Change marker for a single comment, used to build its ETag.
+        
+        Args:
+            db: Database session
+            comment_id: Comment ID
+            organization_id: Current tenant ID
+            
+        Returns:
+            updated_at of the comment, or None if not found
+        """
+        return row_version(db, Comment, Comment.id == comment_id, Comment.organization_id == organization_id)
+    
+    @staticmethod
+    def get_task_comments_version(db: Session, task_id: int, organization_id: int) -> Tuple[Any, ...]:
+        """
+        Change fingerprint for list_comments_by_task.
+        
+        Args:
+            db: Database session
+            task_id: Task ID
+            organization_id: Current tenant ID
+            
+        Returns:
+            (count, max updated_at, max id) of the task's comments
+        """
+        return collection_version(
+            db, Comment, Comment.task_id == task_id, Comment.organization_id == organization_id
+        )
+    
     @staticmethod
     def update_comment(db: Session, comment_id: int, data: CommentUpdate, organization_id: int, user_id: int) -> Comment:
         """
@@ -129,7 +172,11 @@ class CommentService:
         for field, value in update_data.items():
             setattr(comment, field, value)
         
+        task_id = comment.task_id
         db.commit()
+        invalidation_bus.publish(organization_id, "comments", events=[
+            change_event(topic_name("task", task_id), "comment", "updated", comment_id, data.model_dump(mode="json", exclude_unset=True))
+        ])
         db.refresh(comment)
         return comment
     
@@ -155,5 +202,9 @@ class CommentService:
                 detail="You can only delete your own comments"
             )
         
+        task_id = comment.task_id
         db.delete(comment)
         db.commit()
+        invalidation_bus.publish(organization_id, "comments", events=[
+            change_event(topic_name("task", task_id), "comment", "deleted", comment_id)
+        ])
@@ -0,0 +1,426 @@
+import asyncio
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.metrics import format_labels, metrics
+from app.utils.etag import is_not_modified, not_modified_response
+from app.utils.serialization import PreEncodedJSONResponse, current_format
+
+
+logger = logging.getLogger(__name__)
+
+CACHED_HEADERS = ("etag", "cache-control", "content-type", "vary")
+
+
+class CachedResponse:
+    """
+    Body and selected headers of a 200 response stored in the cache.
+    """
+    __slots__ = ("body", "headers")
+    
+    def __init__(self, body: bytes, headers: Dict[str, str]):
+        self.body = body
+        self.headers = headers
+    
+    def to_bytes(self) -> bytes:
+        """Encode as a JSON header line followed by the raw body."""
+        return json.dumps(self.headers).encode("utf-8") + b"\n" + self.body
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CachedResponse":
+        header_line, body = data.split(b"\n", 1)
+        return cls(body=body, headers=json.loads(header_line))
+
+
+class CacheBackend:
+    """
+    Storage interface for the response cache.
+    
+    Entries expire after their TTL. Counters hold namespace generations
+    and must never be evicted, or stale entries could become reachable again.
+    
+    shared is True when all workers see the same storage, in which case
+    invalidations from other workers are already visible.
+    """
+    shared = False
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+    
+    def set(self, key: str, value: CachedResponse, ttl: int) -> None:
+        raise NotImplementedError
+    
+    def get_counter(self, key: str) -> int:
+        raise NotImplementedError
+    
+    def incr(self, key: str) -> int:
+        raise NotImplementedError
+    
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process LRU backend. Each worker holds its own entries.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: CachedResponse, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+    
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class LocalSharedClient:
+    """
+    In-process stand-in for a Redis-style client (bytes values, SET EX, INCR).
+    
+    Used for tests and single-process deployments; a redis.Redis instance
+    can be passed to SharedCacheBackend in its place.
+    """
+    
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+    
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ex if ex else None, value)
+    
+    def incr(self, key: str) -> int:
+        with self._lock:
+            _, value = self._data.get(key, (None, b"0"))
+            new_value = int(value) + 1
+            self._data[key] = (None, str(new_value).encode())
+            return new_value
+    
+    def flushdb(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SharedCacheBackend(CacheBackend):
+    """
+    Backend shared by all workers through a Redis-style client.
+    
+    With a LocalSharedClient the storage lives in this process only, so
+    the backend is not shared and relies on the invalidation bus like
+    the LRU backend.
+    """
+    
+    def __init__(self, client: Any, prefix: str = "saas:cache:"):
+        self.client = client
+        self.prefix = prefix
+        self.shared = not isinstance(client, LocalSharedClient)
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        data = self.client.get(self.prefix + key)
+        return CachedResponse.from_bytes(data) if data else None
+    
+    def set(self, key: str, value: CachedResponse, ttl: int) -> None:
+        self.client.set(self.prefix + key, value.to_bytes(), ex=ttl)
+    
+    def get_counter(self, key: str) -> int:
+        value = self.client.get(self.prefix + key)
+        return int(value) if value else 0
+    
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+    
+    def clear(self) -> None:
+        self.client.flushdb()
+
+
+class RouteCacheStats:
+    """Hit/miss counters for one route template."""
+    __slots__ = ("hits", "misses", "coalesced", "stores")
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stores = 0
+    
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+BuildResult = Union[Response, Awaitable[Response]]
+Namespaces = Union[str, Tuple[str, ...]]
+
+
+class ResponseCache:
+    """
+    Tenant-scoped cache for GET responses.
+    
+    Keys are (tenant, role, path, query, wire format) within a namespace
+    such as "tasks".
+    Each (tenant, namespace) has a generation counter that is part of the
+    key; service write methods bump it through invalidate(), which makes
+    every older entry for that tenant unreachable in O(1). Responses built
+    from several namespaces (e.g. tasks with embedded users) pass all of
+    them and are dropped when any one changes.
+    
+    Synchronous builds run in the threadpool, so the event loop keeps
+    serving other requests meanwhile. Concurrent misses for the same key
+    are coalesced: one request builds the response and the others wait
+    for it (singleflight).
+    """
+    
+    def __init__(self, backend: Optional[CacheBackend], default_ttl: int, max_ttl: int):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, RouteCacheStats] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+    
+    def _generation_key(self, tenant_id: int, namespace: str) -> str:
+        return f"gen:{tenant_id}:{namespace}"
+    
+    def _entry_key(self, request: Request, namespace: Namespaces, tenant_id: int, role: Optional[str]) -> str:
+        names = (namespace,) if isinstance(namespace, str) else namespace
+        generation = ".".join(
+            str(self.backend.get_counter(self._generation_key(tenant_id, name))) for name in names
+        )
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"resp:{tenant_id}:{'+'.join(names)}:{generation}:{role}:{current_format.get()}:{request.url.path}?{query}"
+    
+    def _route_stats(self, request: Request) -> RouteCacheStats:
+        route = request.scope.get("route")
+        template = getattr(route, "path", request.url.path)
+        stats = self._stats.get(template)
+        if stats is None:
+            stats = self._stats[template] = RouteCacheStats()
+        return stats
+    
+    def _clamp_ttl(self, ttl: Optional[int]) -> int:
+        return max(1, min(ttl or self.default_ttl, self.max_ttl))
+    
+    @staticmethod
+    def _to_response(request: Request, entry: CachedResponse, status: str) -> Response:
+        etag = entry.headers.get("etag")
+        if etag and is_not_modified(request, etag):
+            return not_modified_response(etag)
+        headers = {k: v for k, v in entry.headers.items() if k != "content-type"}
+        headers["X-Cache"] = status
+        return PreEncodedJSONResponse(
+            content=entry.body,
+            headers=headers,
+            media_type=entry.headers.get("content-type", PreEncodedJSONResponse.media_type)
+        )
+    
+    @staticmethod
+    async def _build(build: Callable[[], BuildResult]) -> Response:
+        if inspect.iscoroutinefunction(build):
+            return await build()
+        result = await run_in_threadpool(build)
+        return await result if inspect.isawaitable(result) else result
+    
+    async def serve(
+        self,
+        request: Request,
+        namespace: Namespaces,
+        tenant_id: int,
+        role: Optional[str],
+        build: Callable[[], BuildResult],
+        ttl: Optional[int] = None
+    ) -> Response:
+        """
+        Return a cached response or build, store and return a fresh one.
+        
+        Only 200 responses with a body are stored; anything else (304, errors)
+        passes through untouched. Requests that miss while another request
+        builds the same key wait for it, and build themselves only if it
+        produced nothing to store.
+        
+        Args:
+            request: Incoming request
+            namespace: Invalidation namespace (e.g. "tasks") or a tuple of them
+            tenant_id: Current tenant ID
+            role: Role of the current user
+            build: Callable producing the response on a miss; run in the
+                threadpool unless it is a coroutine function
+            ttl: Optional TTL in seconds, clamped to the configured maximum
+            
+        Returns:
+            Response
+        """
+        if not self.enabled:
+            return await self._build(build)
+        
+        stats = self._route_stats(request)
+        key = self._entry_key(request, namespace, tenant_id, role)
+        
+        entry = self.backend.get(key)
+        if entry is not None:
+            stats.hits += 1
+            return self._to_response(request, entry, "HIT")
+        
+        leader = self._inflight.get(key)
+        if leader is not None:
+            entry = await asyncio.shield(leader)
+            if entry is not None:
+                stats.coalesced += 1
+                return self._to_response(request, entry, "HIT")
+        
+        stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        entry = None
+        try:
+            response = await self._build(build)
+            body = getattr(response, "body", None)
+            if response.status_code == 200 and body:
+                headers = {k: v for k, v in response.headers.items() if k in CACHED_HEADERS}
+                entry = CachedResponse(body=bytes(body), headers=headers)
+                self.backend.set(key, entry, self._clamp_ttl(ttl))
+                stats.stores += 1
+                response.headers["X-Cache"] = "MISS"
+            return response
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if not future.done():
+                future.set_result(entry)
+    
+    def invalidate(self, tenant_id: int, *namespaces: str) -> None:
+        """
+        Drop every cached response of a tenant in the given namespaces.
+        
+        Args:
+            tenant_id: Tenant whose data changed
+            namespaces: Affected namespaces
+        """
+        if not self.enabled:
+            return
+        for namespace in namespaces:
+            self.backend.incr(self._generation_key(tenant_id, namespace))
+    
+    def clear(self) -> None:
+        """Drop every cached response, e.g. after missed invalidations."""
+        if self.enabled:
+            self.backend.clear()
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-route counters and hit ratio."""
+        return {
+            route: {
+                "hits": s.hits,
+                "misses": s.misses,
+                "coalesced": s.coalesced,
+                "stores": s.stores,
+                "hit_ratio": s.hit_ratio
+            }
+            for route, s in self._stats.items()
+        }
+
+
+def create_backend(name: str) -> Optional[CacheBackend]:
+    """
+    Build the configured cache backend.
+    
+    Both backends keep their entries in this process, so with several
+    workers only an invalidation bus keeps them from serving responses
+    up to the TTL stale after a write in another worker. "auto" therefore
+    caches only when a bus is configured.
+    
+    Args:
+        name: "auto", "memory", "shared" or "none"
+        
+    Returns:
+        Backend instance, or None when caching is disabled
+    """
+    if name == "auto":
+        name = "memory" if settings.INVALIDATION_BUS_BACKEND != "none" else "none"
+    elif name != "none" and settings.INVALIDATION_BUS_BACKEND == "none":
+        logger.warning(
+            "RESPONSE_CACHE_BACKEND=%s without INVALIDATION_BUS_BACKEND: safe with a single worker only", name
+        )
+    if name == "memory":
+        return LRUCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    if name == "shared":
+        return SharedCacheBackend(LocalSharedClient())
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {name}")
+
+
+response_cache = ResponseCache(
+    create_backend(settings.RESPONSE_CACHE_BACKEND),
+    default_ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_ttl=settings.RESPONSE_CACHE_MAX_TTL_SECONDS
+)
+
+
+def response_cache_metrics() -> List[str]:
+    """Per-route lookup counters and hit ratio of the response cache."""
+    lines = [
+        "# TYPE response_cache_lookups_total counter",
+        "# TYPE response_cache_hit_ratio gauge",
+    ]
+    for route, stats in sorted(response_cache.stats().items()):
+        for result in ("hits", "misses", "coalesced"):
+            labels = format_labels((("route", route), ("result", result)))
+            lines.append(f"response_cache_lookups_total{labels} {stats[result]}")
+        lines.append(f"response_cache_hit_ratio{format_labels((('route', route),))} {stats['hit_ratio']!r}")
+    return lines
+
+
+metrics.add_collector(response_cache_metrics)
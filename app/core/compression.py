@@ -0,0 +1,223 @@
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class CompressionPolicy:
+    """
+    Compression settings for a group of routes.
+    
+    Fields left as None fall back to the middleware defaults.
+    """
+    __slots__ = ("enabled", "minimum_size", "gzip_level", "brotli_quality")
+    
+    def __init__(
+        self,
+        enabled: bool = True,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None
+    ):
+        self.enabled = enabled
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+    
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick "br" or "gzip" from an Accept-Encoding header.
+    
+    Honours q-values; on a tie Brotli wins when it is installed.
+    
+    Args:
+        accept_encoding: Raw header value
+        
+    Returns:
+        Encoding name, or None if the client accepts neither
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    
+    wildcard = weights.get("*", 0.0)
+    candidates: List[Tuple[float, int, str]] = []
+    if brotli is not None:
+        candidates.append((weights.get("br", wildcard), 1, "br"))
+    candidates.append((weights.get("gzip", wildcard), 0, "gzip"))
+    q, _, name = max(candidates)
+    return name if q > 0 else None
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with Brotli or gzip, negotiated per request.
+    
+    - Bodies below the minimum size are sent as is; the encoding overhead
+      outweighs the savings and small responses are latency bound anyway.
+    - Streaming responses are compressed chunk by chunk and flushed after
+      each one, so the client receives data as it is produced.
+    - Only text-like content types are compressed; responses that already
+      carry a Content-Encoding are left alone.
+    - route_policies maps route path prefixes (matched against the route
+      template, e.g. "/api/v1/tasks/board/{board_id}") to a CompressionPolicy;
+      the longest matching prefix wins.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        route_policies: Optional[Dict[str, CompressionPolicy]] = None
+    ):
+        self.app = app
+        self.default = CompressionPolicy(True, minimum_size, gzip_level, brotli_quality)
+        self.route_policies: Sequence[Tuple[str, CompressionPolicy]] = sorted(
+            (route_policies or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+    
+    def policy_for(self, scope: Scope) -> CompressionPolicy:
+        """Resolve the policy for a request once routing has set scope["route"]."""
+        route = scope.get("route")
+        path = getattr(route, "path", None) or scope.get("path", "")
+        for prefix, policy in self.route_policies:
+            if path.startswith(prefix):
+                return CompressionPolicy(
+                    policy.enabled,
+                    self.default.minimum_size if policy.minimum_size is None else policy.minimum_size,
+                    policy.gzip_level or self.default.gzip_level,
+                    policy.brotli_quality or self.default.brotli_quality
+                )
+        return self.default
+
+
+class CompressionResponder:
+    """
+    Wraps send() for one response and decides on the first body chunk.
+    """
+    
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._compressor = None
+        self._passthrough = False
+    
+    def _should_compress(self, headers: MutableHeaders, body: bytes, more_body: bool, policy: CompressionPolicy) -> bool:
+        status = self._start["status"]
+        if not policy.enabled or status < 200 or status in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        headers.add_vary_header("Accept-Encoding")
+        return more_body or len(body) >= policy.minimum_size
+    
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self._start = message
+            return
+        if message_type != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if self._compressor is None:
+            headers = MutableHeaders(raw=self._start["headers"])
+            policy = self.middleware.policy_for(self.scope)
+            if not self._should_compress(headers, body, more_body, policy):
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+            
+            if self.encoding == "br":
+                self._compressor = BrotliCompressor(policy.brotli_quality)
+            else:
+                self._compressor = GzipCompressor(policy.gzip_level)
+            headers["Content-Encoding"] = self.encoding
+            del headers["content-length"]
+            # The encoded bytes differ from the identity representation, so a
+            # strong validator no longer applies to them byte for byte.
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            if not more_body:
+                body = self._compressor.compress(body, final=True)
+                headers["Content-Length"] = str(len(body))
+                await self._send(self._start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send(self._start)
+        
+        await self._send({
+            "type": "http.response.body",
+            "body": self._compressor.compress(body, final=not more_body),
+            "more_body": more_body
+        })
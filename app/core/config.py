@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
 from functools import lru_cache
 
 
@@ -20,8 +20,72 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 5.0
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    # Revocations committed this long after their created_at may be missed by other workers
+    TOKEN_REVOCATION_LOOKBACK_SECONDS: float = 300.0
+    
     ENVIRONMENT: str = "development"
     
+    # "auto": in-process cache only when INVALIDATION_BUS_BACKEND is set
+    RESPONSE_CACHE_BACKEND: str = "auto"
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    
+    ENTITY_CACHE_MAX_ENTRIES: int = 50000
+    
+    INVALIDATION_BUS_BACKEND: str = "none"
+    INVALIDATION_BUS_CHANNEL: str = "saas_cache_invalidation"
+    
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
+    # /metrics is served only when set, to scrapers sending it as a Bearer token
+    METRICS_TOKEN: Optional[str] = None
+    
+    PROFILER_ENABLED: bool = False
+    PROFILER_SAMPLE_INTERVAL_MS: float = 1.0
+    PROFILER_CONTINUOUS: bool = False
+    PROFILER_CONTINUOUS_INTERVAL_MS: float = 100.0
+    PROFILER_DUMP_SECONDS: float = 60.0
+    PROFILER_OUTPUT_DIR: str = "profiles"
+    
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 0.01
+    # Honour the sampled flag of incoming traceparent headers; only safe
+    # behind a proxy that strips or sets them, since clients could force sampling
+    TRACING_TRUST_PARENT: bool = False
+    TRACING_EXPORTER: str = "stdout"
+    TRACING_SERVICE_NAME: str = "saas-api"
+    
+    BATCH_MAX_REQUESTS: int = 20
+    
+    REALTIME_COALESCE_MS: int = 100
+    REALTIME_HEARTBEAT_SECONDS: int = 25
+    REALTIME_MAX_PENDING: int = 500
+    REALTIME_MAX_STREAM_SECONDS: int = 900
+    REALTIME_MAX_TOPICS: int = 100
+    
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    
+    # Test-only: slow down or fail the database and bcrypt for capacity tests
+    FAULT_INJECTION_ENABLED: bool = False
+    FAULT_DB_LATENCY_MS: float = 0.0
+    FAULT_DB_JITTER_MS: float = 0.0
+    FAULT_DB_ERROR_RATE: float = 0.0
+    FAULT_DB_CONNECT_LATENCY_MS: float = 0.0
+    FAULT_BCRYPT_LATENCY_MS: float = 0.0
+    FAULT_BCRYPT_JITTER_MS: float = 0.0
+    FAULT_SEED: Optional[int] = None
+    
+    EXPORT_BATCH_SIZE: int = 1000
+    IMPORT_BATCH_SIZE: int = 5000
+    
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
     
     model_config = SettingsConfigDict(
@@ -1,17 +1,20 @@
 from typing import Optional, Dict, Any
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from app.core.metrics import timed
 from app.core.security import decode_token, verify_token_type
-from app.database.session import get_db
+from app.core.tracing import traced
+from app.auth.revocation import ensure_not_revoked_async
+from app.batch.context import BATCH_SCOPE_KEY
 
 
 security = HTTPBearer()
 
 
+@traced()
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Dict[str, Any]:
     """
     Extract and validate current user from JWT token.
@@ -20,21 +23,32 @@ async def get_current_user(
     1. Extracts the JWT token from Authorization header
     2. Validates the token signature and expiration
     3. Verifies it's an access token (not refresh)
-    4. Returns user information including tenant context
+    4. Rejects revoked tokens (in-memory check, no I/O in the common case)
+    5. Returns user information including tenant context
+    
+    This is a pure token check and must not depend on get_db, so requests
+    rejected here never create a session or touch the connection pool.
+    Sub-requests of a /batch call reuse the user decoded for the batch.
     
     Args:
+        request: Current request
         credentials: HTTP Bearer token from request header
-        db: Database session
         
     Returns:
         Dictionary containing user_id, email, organization_id, role
         
     Raises:
-        HTTPException: If token is invalid, expired, or user not found
+        HTTPException: If token is invalid, expired, revoked, or user not found
     """
     token = credentials.credentials
-    payload = decode_token(token)
-    verify_token_type(payload, "access")
+    batch = request.scope.get(BATCH_SCOPE_KEY)
+    if batch is not None and batch.token == token:
+        return batch.user
+    
+    with timed("auth"):
+        payload = decode_token(token)
+        verify_token_type(payload, "access")
+        await ensure_not_revoked_async(payload)
     
     user_id: Optional[int] = payload.get("user_id")
     email: Optional[str] = payload.get("email")
@@ -72,6 +86,7 @@ async def get_current_active_user(
     return current_user
 
 
+@traced()
 async def get_tenant_id(
     current_user: Dict[str, Any] = Depends(get_current_user)
 ) -> int:
@@ -109,7 +124,7 @@ async def require_role(required_roles: list[str]):
         @router.get("/admin-only")
         async def admin_endpoint(user = Depends(require_role(["ORG_ADMIN"]))):
             ...
-    
+            
     Args:
         required_roles: List of allowed role names
         
@@ -0,0 +1,166 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+EntityKey = Tuple[str, int]
+
+SESSION_INFO_KEY = "entity_owner_cache"
+
+
+class EntityOwnerCache:
+    """
+    Two-level cache of parent entity -> organization_id mappings.
+    
+    Used for the tenant ownership checks done before creating children
+    (board -> task, task -> comment, project -> board). The owning
+    organization of a row never changes, so a hit needs no query at all.
+    
+    L1 lives in Session.info and is dropped with the request's session.
+    L2 is a process-wide LRU shared by all requests of a worker. It is only
+    used when an invalidation bus carries deletes from other workers
+    (l2_enabled); otherwise a row deleted elsewhere would stay "owned" and
+    creating a child under it would fail on the foreign key.
+    
+    Every key carries a version that invalidate() bumps. A lookup records
+    the version before querying and only fills L2 if it is unchanged, so a
+    load racing with an update or delete can never store a stale mapping.
+    Missing rows are not cached.
+    """
+    
+    def __init__(self, max_entries: int, l2_enabled: bool = True):
+        self.max_entries = max_entries
+        self.l2_enabled = l2_enabled
+        self._entries: "OrderedDict[EntityKey, int]" = OrderedDict()
+        self._versions: "OrderedDict[EntityKey, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _session_entries(db: Session) -> Dict[EntityKey, int]:
+        entries = db.info.get(SESSION_INFO_KEY)
+        if entries is None:
+            entries = db.info[SESSION_INFO_KEY] = {}
+        return entries
+    
+    def _store(self, key: EntityKey, organization_id: int, version: int) -> None:
+        with self._lock:
+            if self._versions.get(key, 0) != version:
+                return
+            self._entries[key] = organization_id
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def owner_of(self, db: Session, model: type, entity_id: int) -> Optional[int]:
+        """
+        Organization owning a row, or None if the row does not exist.
+        
+        Args:
+            db: Database session (holds the request-scoped level)
+            model: Model with id and organization_id columns
+            entity_id: Primary key of the row
+            
+        Returns:
+            organization_id of the row or None
+        """
+        key = (model.__tablename__, entity_id)
+        local = self._session_entries(db)
+        
+        organization_id = local.get(key)
+        if organization_id is not None:
+            self.l1_hits += 1
+            return organization_id
+        
+        version = None
+        if self.l2_enabled:
+            with self._lock:
+                organization_id = self._entries.get(key)
+                if organization_id is not None:
+                    self._entries.move_to_end(key)
+                version = self._versions.get(key, 0)
+            if organization_id is not None:
+                self.l2_hits += 1
+                local[key] = organization_id
+                return organization_id
+        
+        self.misses += 1
+        row = db.query(model.organization_id).filter(model.id == entity_id).first()
+        if row is None:
+            return None
+        organization_id = row[0]
+        local[key] = organization_id
+        if version is not None:
+            self._store(key, organization_id, version)
+        return organization_id
+    
+    def invalidate(self, model: type, entity_id: int, db: Optional[Session] = None) -> None:
+        """
+        Drop a row from both levels after it was updated or deleted.
+        
+        Args:
+            model: Model class of the row
+            entity_id: Primary key of the row
+            db: Session whose request-scoped level should be cleared too
+        """
+        self.evict(model.__tablename__, entity_id, db)
+    
+    def evict(self, table: str, entity_id: int, db: Optional[Session] = None) -> None:
+        """
+        Same as invalidate(), keyed by table name (used for bus messages).
+        
+        Args:
+            table: Table name of the row
+            entity_id: Primary key of the row
+            db: Session whose request-scoped level should be cleared too
+        """
+        key = (table, entity_id)
+        if db is not None:
+            self._session_entries(db).pop(key, None)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._versions.move_to_end(key)
+            while len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every L2 entry (L1 ends with its session)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters per level."""
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "entries": len(self._entries)
+        }
+
+
+entity_cache = EntityOwnerCache(
+    settings.ENTITY_CACHE_MAX_ENTRIES,
+    l2_enabled=settings.INVALIDATION_BUS_BACKEND != "none"
+)
+
+
+def entity_cache_metrics() -> List[str]:
+    """Lookups per cache level and L2 size."""
+    stats = entity_cache.stats()
+    return [
+        "# TYPE entity_cache_lookups_total counter",
+        f'entity_cache_lookups_total{{level="l1"}} {stats["l1_hits"]}',
+        f'entity_cache_lookups_total{{level="l2"}} {stats["l2_hits"]}',
+        f'entity_cache_lookups_total{{level="miss"}} {stats["misses"]}',
+        "# TYPE entity_cache_entries gauge",
+        f"entity_cache_entries {stats['entries']}",
+    ]
+
+
+metrics.add_collector(entity_cache_metrics)
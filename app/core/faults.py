@@ -0,0 +1,126 @@
+import logging
+import random
+import threading
+import time
+from typing import Iterable, Optional
+from app.core.config import settings
+from app.core.metrics import format_value, metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class FaultInjector:
+    """
+    Test-only latency and error injection for capacity testing.
+    
+    Adds a delay of latency +- jitter (uniform, never negative) before
+    every SQL statement, when a new database connection is opened and
+    around bcrypt hashing and verification; statements fail with the
+    driver's OperationalError at the given rate. Delays are blocking
+    sleeps in the calling thread, exactly where a slow database or CPU
+    would block, so pool waits, event-loop stalls and request metrics
+    respond as they would in production.
+    
+    Statement delays run after the query timer starts, so injected
+    latency shows up in the db phase of Server-Timing and in traces.
+    """
+    
+    def __init__(
+        self,
+        db_latency: float = 0.0,
+        db_jitter: float = 0.0,
+        db_error_rate: float = 0.0,
+        connect_latency: float = 0.0,
+        bcrypt_latency: float = 0.0,
+        bcrypt_jitter: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.db_latency = db_latency
+        self.db_jitter = db_jitter
+        self.db_error_rate = db_error_rate
+        self.connect_latency = connect_latency
+        self.bcrypt_latency = bcrypt_latency
+        self.bcrypt_jitter = bcrypt_jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.delays = {"db": 0, "connect": 0, "bcrypt": 0}
+        self.delay_seconds = {"db": 0.0, "connect": 0.0, "bcrypt": 0.0}
+        self.errors = 0
+    
+    def _sleep(self, kind: str, latency: float, jitter: float) -> None:
+        with self._lock:
+            seconds = max(0.0, latency + self._random.uniform(-jitter, jitter)) if jitter else latency
+            if seconds <= 0:
+                return
+            self.delays[kind] += 1
+            self.delay_seconds[kind] += seconds
+        time.sleep(seconds)
+    
+    def _should_fail(self) -> bool:
+        if self.db_error_rate <= 0:
+            return False
+        with self._lock:
+            if self._random.random() >= self.db_error_rate:
+                return False
+            self.errors += 1
+            return True
+    
+    def install(self, engine) -> None:
+        """Attach statement and connect faults to an engine."""
+        from sqlalchemy import event
+        
+        dbapi_error = engine.dialect.dbapi.OperationalError
+        
+        @event.listens_for(engine, "before_cursor_execute")
+        def _inject_statement_fault(conn, cursor, statement, parameters, context, executemany):
+            self._sleep("db", self.db_latency, self.db_jitter)
+            if self._should_fail():
+                # Raised as the driver's own error so SQLAlchemy wraps and
+                # reports it like a real failure (handle_error, DBAPIError).
+                raise dbapi_error("injected fault: database error")
+        
+        @event.listens_for(engine, "connect")
+        def _inject_connect_latency(dbapi_connection, connection_record):
+            self._sleep("connect", self.connect_latency, 0.0)
+    
+    def bcrypt(self) -> None:
+        """Delay a bcrypt hash or verification."""
+        self._sleep("bcrypt", self.bcrypt_latency, self.bcrypt_jitter)
+    
+    def collect(self) -> Iterable[str]:
+        """Counters of injected delays and errors."""
+        lines = [
+            "# HELP fault_injected_delays_total Delays added by fault injection.",
+            "# TYPE fault_injected_delays_total counter",
+        ]
+        lines.extend(f'fault_injected_delays_total{{kind="{kind}"}} {count}' for kind, count in self.delays.items())
+        lines.append("# TYPE fault_injected_delay_seconds_total counter")
+        lines.extend(
+            f'fault_injected_delay_seconds_total{{kind="{kind}"}} {format_value(seconds)}'
+            for kind, seconds in self.delay_seconds.items()
+        )
+        lines.append("# TYPE fault_injected_errors_total counter")
+        lines.append(f"fault_injected_errors_total {self.errors}")
+        return lines
+
+
+fault_injector: Optional[FaultInjector] = None
+if settings.FAULT_INJECTION_ENABLED:
+    if settings.ENVIRONMENT == "production":
+        raise RuntimeError("FAULT_INJECTION_ENABLED must not be set in production")
+    fault_injector = FaultInjector(
+        db_latency=settings.FAULT_DB_LATENCY_MS / 1000,
+        db_jitter=settings.FAULT_DB_JITTER_MS / 1000,
+        db_error_rate=settings.FAULT_DB_ERROR_RATE,
+        connect_latency=settings.FAULT_DB_CONNECT_LATENCY_MS / 1000,
+        bcrypt_latency=settings.FAULT_BCRYPT_LATENCY_MS / 1000,
+        bcrypt_jitter=settings.FAULT_BCRYPT_JITTER_MS / 1000,
+        seed=settings.FAULT_SEED
+    )
+    metrics.add_collector(fault_injector.collect)
+    logger.warning(
+        "Fault injection enabled: db %.1f+-%.1f ms, %.1f%% errors, connect %.1f ms, bcrypt %.1f+-%.1f ms",
+        settings.FAULT_DB_LATENCY_MS, settings.FAULT_DB_JITTER_MS, settings.FAULT_DB_ERROR_RATE * 100,
+        settings.FAULT_DB_CONNECT_LATENCY_MS, settings.FAULT_BCRYPT_LATENCY_MS, settings.FAULT_BCRYPT_JITTER_MS
+    )
@@ -0,0 +1,333 @@
+import json
+import logging
+import os
+import select
+import threading
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from app.core.cache import ResponseCache, response_cache
+from app.core.config import settings
+from app.core.entity_cache import EntityOwnerCache, entity_cache
+
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str], None]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD_BYTES = 7900
+
+
+class InvalidationTransport:
+    """
+    Delivery channel between workers.
+    
+    send() broadcasts a serialized message to every subscriber, including
+    the sender. start() begins delivering received messages to the handler;
+    on_reconnect is called when the transport may have dropped messages.
+    """
+    
+    def start(self, handler: Handler, on_reconnect: Callable[[], None]) -> None:
+        raise NotImplementedError
+    
+    def send(self, payload: str) -> None:
+        raise NotImplementedError
+    
+    def stop(self) -> None:
+        pass
+
+
+class LocalTransport(InvalidationTransport):
+    """
+    In-process broadcast; stand-in for tests and single-process deployments.
+    
+    Buses created with the same channel name see each other's messages,
+    which lets tests run several "workers" in one process.
+    """
+    _subscribers: Dict[str, List[Handler]] = defaultdict(list)
+    _lock = threading.Lock()
+    
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._handler: Optional[Handler] = None
+    
+    def start(self, handler: Handler, on_reconnect: Callable[[], None]) -> None:
+        self._handler = handler
+        with self._lock:
+            self._subscribers[self.channel].append(handler)
+    
+    def send(self, payload: str) -> None:
+        with self._lock:
+            handlers = list(self._subscribers[self.channel])
+        for handler in handlers:
+            handler(payload)
+    
+    def stop(self) -> None:
+        with self._lock:
+            if self._handler in self._subscribers[self.channel]:
+                self._subscribers[self.channel].remove(self._handler)
+        self._handler = None
+
+
+class PostgresTransport(InvalidationTransport):
+    """
+    Postgres LISTEN/NOTIFY transport.
+    
+    A background thread holds a dedicated autocommit connection that
+    LISTENs on the channel; publishing uses a second connection and
+    pg_notify(). Notifications are lost while the listener is disconnected,
+    so every reconnect reports a possible gap.
+    """
+    
+    def __init__(self, database_url: str, channel: str, poll_seconds: float = 5.0):
+        url = make_url(database_url)
+        self.dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self._send_conn = None
+        self._send_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _connect(self):
+        import psycopg2
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+    
+    def start(self, handler: Handler, on_reconnect: Callable[[], None]) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._listen, args=(handler, on_reconnect), name="invalidation-listener", daemon=True
+        )
+        self._thread.start()
+    
+    def _listen(self, handler: Handler, on_reconnect: Callable[[], None]) -> None:
+        first = True
+        while not self._stopping.is_set():
+            try:
+                conn = self._connect()
+            except Exception:
+                logger.exception("Invalidation listener could not connect")
+                self._stopping.wait(self.poll_seconds)
+                continue
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                if not first:
+                    on_reconnect()
+                first = False
+                while not self._stopping.is_set():
+                    if select.select([conn], [], [], self.poll_seconds) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        handler(conn.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Invalidation listener lost its connection")
+            finally:
+                conn.close()
+    
+    def send(self, payload: str) -> None:
+        with self._send_lock:
+            for attempt in range(2):
+                try:
+                    if self._send_conn is None or self._send_conn.closed:
+                        self._send_conn = self._connect()
+                    with self._send_conn.cursor() as cursor:
+                        cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+                    return
+                except Exception:
+                    self._send_conn = None
+                    if attempt:
+                        raise
+    
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+        if self._send_conn is not None:
+            self._send_conn.close()
+            self._send_conn = None
+
+
+class InvalidationBus:
+    """
+    Broadcasts cache invalidations from one worker to all others.
+    
+    Service write methods call publish() after commit. The change is
+    applied to this worker's caches immediately and sent to the other
+    workers, which evict the same response namespaces and entity keys.
+    
+    Every message carries the sender's origin ID and a per-origin sequence
+    number. A receiver that sees a sequence jump (or whose transport
+    reconnected) may have missed invalidations and flushes its local
+    caches rather than risk serving stale data.
+    
+    Messages can also carry change events for listeners such as the
+    realtime hub, which receive them in every worker through
+    publish(tenant_id, events) and are told to resync() after a gap.
+    """
+    
+    def __init__(
+        self,
+        transport: Optional[InvalidationTransport],
+        responses: ResponseCache,
+        entities: EntityOwnerCache
+    ):
+        self.transport = transport
+        self.responses = responses
+        self.entities = entities
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._seq = 0
+        self._seq_lock = threading.Lock()
+        self._last_seen: Dict[str, int] = {}
+        self._receive_lock = threading.Lock()
+        self._started = False
+        self._listeners: List[Any] = []
+        self.received = 0
+        self.gaps = 0
+        self.flushes = 0
+    
+    def start(self) -> None:
+        """Subscribe to the transport (called on application startup)."""
+        if self.transport is None or self._started:
+            return
+        self.transport.start(self._receive, self.flush)
+        self._started = True
+    
+    def add_listener(self, listener: Any) -> None:
+        """Register an object with publish(tenant_id, events) and resync() methods."""
+        self._listeners.append(listener)
+    
+    def stop(self) -> None:
+        """Unsubscribe (called on application shutdown)."""
+        if self.transport is not None and self._started:
+            self.transport.stop()
+            self._started = False
+    
+    def publish(
+        self,
+        tenant_id: int,
+        *namespaces: str,
+        entity: Optional[Tuple[type, int]] = None,
+        db: Optional[Session] = None,
+        events: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Invalidate cached data after a committed write, here and in every worker.
+        
+        Args:
+            tenant_id: Tenant whose data changed
+            namespaces: Response cache namespaces to invalidate
+            entity: Optional (model, id) of an updated or deleted row
+            db: Session of the write, whose request-scoped entries are dropped too
+            events: Optional JSON-serializable change events for the listeners
+        """
+        self.responses.invalidate(tenant_id, *namespaces)
+        table, entity_id = (entity[0].__tablename__, entity[1]) if entity else (None, None)
+        if table is not None:
+            self.entities.evict(table, entity_id, db)
+        if events:
+            for listener in self._listeners:
+                listener.publish(tenant_id, events)
+        
+        if not self._started:
+            return
+        # Sequence numbers are assigned and sent under one lock so that
+        # concurrent publishers cannot reorder them into a false gap.
+        with self._seq_lock:
+            self._seq += 1
+            message = {
+                "origin": self.origin,
+                "seq": self._seq,
+                "tenant_id": tenant_id,
+                "namespaces": list(namespaces),
+                "entity_type": table,
+                "entity_id": entity_id,
+                "events": events or []
+            }
+            payload = json.dumps(message)
+            if len(payload) > MAX_PAYLOAD_BYTES:
+                # Too large to send (e.g. a long description); listeners
+                # elsewhere reload the affected topics instead.
+                topics = sorted({event["topic"] for event in message["events"]})
+                message["events"] = [{"topic": topic, "op": "resync"} for topic in topics]
+                payload = json.dumps(message)
+            try:
+                self.transport.send(payload)
+            except Exception:
+                # Receivers will see the skipped sequence number and flush.
+                logger.exception("Failed to publish cache invalidation")
+    
+    def _receive(self, payload: str) -> None:
+        message = json.loads(payload)
+        origin = message["origin"]
+        if origin == self.origin:
+            return
+        self.received += 1
+        
+        with self._receive_lock:
+            last = self._last_seen.get(origin)
+            self._last_seen[origin] = message["seq"]
+        if last is not None and message["seq"] != last + 1:
+            self.gaps += 1
+            logger.warning("Missed invalidations from %s (seq %s -> %s)", origin, last, message["seq"])
+            self.flush()
+            return
+        
+        if not self.responses.backend or not self.responses.backend.shared:
+            self.responses.invalidate(message["tenant_id"], *message["namespaces"])
+        if message["entity_type"]:
+            self.entities.evict(message["entity_type"], message["entity_id"])
+        if message.get("events"):
+            for listener in self._listeners:
+                listener.publish(message["tenant_id"], message["events"])
+    
+    def flush(self) -> None:
+        """Drop all worker-local cached data and resync the listeners."""
+        self.flushes += 1
+        if self.responses.backend and not self.responses.backend.shared:
+            self.responses.clear()
+        self.entities.clear()
+        for listener in self._listeners:
+            listener.resync()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Message and gap counters."""
+        return {
+            "origin": self.origin,
+            "published": self._seq,
+            "received": self.received,
+            "gaps": self.gaps,
+            "flushes": self.flushes
+        }
+
+
+def create_transport(name: str) -> Optional[InvalidationTransport]:
+    """
+    Build the configured invalidation transport.
+    
+    Args:
+        name: "postgres", "local" or "none"
+        
+    Returns:
+        Transport instance, or None when invalidations stay in-process
+    """
+    if name == "postgres":
+        return PostgresTransport(settings.DATABASE_URL, settings.INVALIDATION_BUS_CHANNEL)
+    if name == "local":
+        return LocalTransport(settings.INVALIDATION_BUS_CHANNEL)
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown INVALIDATION_BUS_BACKEND: {name}")
+
+
+invalidation_bus = InvalidationBus(
+    create_transport(settings.INVALIDATION_BUS_BACKEND),
+    response_cache,
+    entity_cache
+)
@@ -0,0 +1,207 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+Collector = Callable[[], Iterable[str]]
+
+
+def format_labels(labels: Labels) -> str:
+    """Render a label set as {name="value",...} with exposition-format escaping."""
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; observe() is a bisect and two additions.
+    """
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def expose(self, name: str, labels: Labels = ()) -> List[str]:
+        """Exposition lines for the _bucket (cumulative), _sum and _count series."""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{format_labels(labels + (('le', format_value(bound)),))} {cumulative}")
+        lines.append(f"{name}_sum{format_labels(labels)} {self.sum!r}")
+        lines.append(f"{name}_count{format_labels(labels)} {self.count}")
+        return lines
+
+
+class RequestTimings:
+    """
+    Time spent per phase within one request, reported in Server-Timing.
+    
+    The middleware stores one instance in a context variable. Threadpool
+    workers run with a copy of the context, so they see the same object
+    and their additions are visible to the middleware.
+    """
+    __slots__ = ("auth", "db", "db_queries", "serialize")
+    
+    def __init__(self):
+        self.auth = 0.0
+        self.db = 0.0
+        self.db_queries = 0
+        self.serialize = 0.0
+    
+    def server_timing(self, total: float) -> str:
+        return (
+            f"auth;dur={self.auth * 1000:.2f}, "
+            f'db;dur={self.db * 1000:.2f};desc="{self.db_queries} queries", '
+            f"serialize;dur={self.serialize * 1000:.2f}, "
+            f"app;dur={total * 1000:.2f}"
+        )
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+class timed:
+    """
+    Add the duration of a block to a phase of the current request.
+    
+    Usage:
+        with timed("serialize"):
+            body = encode(models)
+    """
+    __slots__ = ("phase", "start")
+    
+    def __init__(self, phase: str):
+        self.phase = phase
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        timings = current_timings.get()
+        if timings is not None:
+            setattr(timings, self.phase, getattr(timings, self.phase) + time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics in Prometheus text exposition format.
+    
+    Request latency is recorded per (method, route template, status);
+    route templates keep label cardinality bounded. Other subsystems
+    (pool, caches) register collectors that render their own series at
+    scrape time, so they add no cost on the request path.
+    
+    Each worker process keeps its own registry; scrape every worker.
+    """
+    
+    def __init__(self):
+        self._requests: Dict[Tuple[str, str, str], Histogram] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+    
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, str(status))
+        histogram = self._requests.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._requests.setdefault(key, Histogram())
+        histogram.observe(seconds)
+    
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callable returning exposition lines at scrape time."""
+        self._collectors.append(collector)
+    
+    def render(self) -> str:
+        lines = [
+            "# HELP http_requests_total Requests handled, by route template and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        requests = sorted(self._requests.items())
+        for (method, route, status), histogram in requests:
+            labels = (("method", method), ("route", route), ("status", status))
+            lines.append(f"http_requests_total{format_labels(labels)} {histogram.count}")
+        lines.append("# HELP http_request_duration_seconds Request latency until the last body byte was sent.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (method, route, status), histogram in requests:
+            labels = (("method", method), ("route", route), ("status", status))
+            lines.extend(histogram.expose("http_request_duration_seconds", labels))
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    Record per-route latency and add a Server-Timing header.
+    
+    Server-Timing splits the time until response headers into auth, DB and
+    serialization phases plus the total ("app"). The histogram measures until
+    the final body chunk, so streaming responses are timed in full.
+    """
+    
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                header = timings.server_timing(time.perf_counter() - start)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", header.encode("latin-1"))
+                ]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timings.reset(token)
+            route = scope.get("route")
+            self.registry.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - start
+            )
@@ -0,0 +1,32 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.utils.serialization import current_format, negotiate_format
+
+
+class ContentNegotiationMiddleware:
+    """
+    Select the response wire format from the Accept header.
+    
+    The format is stored in the current_format context variable, which
+    the serialization helpers, ETags and the response cache key read.
+    Requests that do not mention msgpack skip Accept parsing entirely.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        accept = None
+        for name, value in scope["headers"]:
+            if name == b"accept":
+                accept = value.decode("latin-1")
+                break
+        
+        token = current_format.set(negotiate_format(accept))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_format.reset(token)
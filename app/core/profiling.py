@@ -0,0 +1,296 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.dependencies import get_current_user, require_admin
+
+
+logger = logging.getLogger(__name__)
+
+MAX_DEPTH = 128
+
+# Top frames of threads that are blocked rather than doing work.
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+}
+
+_labels: Dict[object, str] = {}
+
+
+def _frame_label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        marker = f"{os.sep}app{os.sep}"
+        short = filename[filename.rfind(marker) + 1:] if marker in filename else os.path.basename(filename)
+        label = _labels[code] = f"{code.co_name} ({short}:{code.co_firstlineno})"
+    return label
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+def fold_stack(frame, endpoints: Optional[Dict[object, str]] = None) -> Tuple[str, Optional[str]]:
+    """
+    Fold a thread's stack into "outer;...;inner" form.
+    
+    Args:
+        frame: Innermost frame of the thread
+        endpoints: Optional map of endpoint code objects to route templates
+        
+    Returns:
+        (folded stack, route template of the innermost endpoint frame or None)
+    """
+    labels = []
+    route = None
+    depth = 0
+    while frame is not None and depth < MAX_DEPTH:
+        code = frame.f_code
+        labels.append(_frame_label(code))
+        if route is None and endpoints:
+            route = endpoints.get(code)
+        frame = frame.f_back
+        depth += 1
+    labels.reverse()
+    return ";".join(labels), route
+
+
+def write_folded(path: str, counts: Iterable[Tuple[str, int]]) -> None:
+    """Write folded stacks atomically (flamegraph.pl / speedscope input)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for stack, count in counts:
+            f.write(f"{stack} {count}\n")
+    os.replace(tmp_path, path)
+
+
+class StackSampler:
+    """
+    Samples the stacks of all other threads at a fixed interval.
+    
+    Pure Python (sys._current_frames), so it runs anywhere the app runs.
+    The sampler thread needs the GIL to take a sample; while CPU-bound
+    Python code runs, samples arrive at most every sys.getswitchinterval().
+    """
+    
+    def __init__(self, interval: float, name: str):
+        self.interval = interval
+        self.name = name
+        self.samples: Counter = Counter()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stopping.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own or _is_idle(frame):
+                    continue
+                name = names.get(ident)
+                if name is None:
+                    thread = threading._active.get(ident)
+                    name = names[ident] = thread.name if thread else str(ident)
+                self.record(name, frame)
+    
+    def record(self, thread_name: str, frame) -> None:
+        stack, _ = fold_stack(frame)
+        self.samples[f"{thread_name};{stack}"] += 1
+
+
+class ContinuousProfiler(StackSampler):
+    """
+    Low-rate always-on sampler aggregating stacks per route.
+    
+    Stacks are attributed to the route whose endpoint function appears in
+    them (sync endpoints run in threadpool threads, async ones on the event
+    loop; both carry the endpoint frame). Everything else (middleware,
+    dependencies, background threads) is grouped under "other".
+    Cumulative counts are written to a folded-stack file every dump_seconds.
+    """
+    
+    def __init__(self, interval: float, dump_seconds: float, output_dir: str):
+        super().__init__(interval, "continuous-profiler")
+        self.dump_seconds = dump_seconds
+        self.path = os.path.join(output_dir, f"continuous-{os.getpid()}.folded")
+        self.endpoints: Dict[object, str] = {}
+        self._last_dump = time.monotonic()
+    
+    def register_routes(self, routes: Iterable) -> None:
+        """Map endpoint code objects to route templates."""
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None)
+            code = getattr(endpoint, "__code__", None)
+            if code is not None:
+                self.endpoints[code] = f"{','.join(sorted(getattr(route, 'methods', None) or []))} {route.path}"
+    
+    def record(self, thread_name: str, frame) -> None:
+        stack, route = fold_stack(frame, self.endpoints)
+        self.samples[f"{route or 'other'};{stack}"] += 1
+        now = time.monotonic()
+        if now - self._last_dump >= self.dump_seconds:
+            self._last_dump = now
+            self.dump()
+    
+    def dump(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_folded(self.path, sorted(self.samples.items()))
+        except OSError:
+            logger.exception("Could not write continuous profile to %s", self.path)
+    
+    def stop(self) -> None:
+        super().stop()
+        self.dump()
+
+
+class ProfilerMiddleware:
+    """
+    Profile a single request on demand.
+    
+    Triggered by an "X-Profile" header or a "profile" query parameter with
+    value "store" (write a folded-stack file and return its name in
+    X-Profile-File) or "inline" (replace the response body with the folded
+    stacks; the original status is in X-Profile-Status). The caller must
+    pass require_admin; other callers get the normal response with
+    "X-Profile: denied".
+    
+    Samples cover every busy thread of the worker, so concurrent requests
+    show up too; profile on a quiet worker for clean results. One request
+    is profiled at a time per worker. Only installed when PROFILER_ENABLED
+    is set; requests without the flag cost one header scan.
+    """
+    
+    def __init__(self, app: ASGIApp, interval: float, output_dir: str):
+        self.app = app
+        self.interval = interval
+        self.output_dir = output_dir
+        self._busy = asyncio.Lock()
+    
+    @staticmethod
+    def _requested_mode(scope: Scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return value.decode("latin-1").strip().lower() or "store"
+        query = scope.get("query_string", b"")
+        if b"profile=" in query:
+            for pair in query.decode("latin-1").split("&"):
+                key, _, value = pair.partition("=")
+                if key == "profile":
+                    return value.lower() or "store"
+        return None
+    
+    @staticmethod
+    async def _is_admin(scope: Scope) -> bool:
+        scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            user = await get_current_user(Request(scope), HTTPAuthorizationCredentials(scheme=scheme, credentials=token))
+            await require_admin(user)
+        except HTTPException:
+            return False
+        return True
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        mode = self._requested_mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        
+        if mode not in ("store", "inline") or not await self._is_admin(scope):
+            await self.app(scope, receive, _with_header(send, b"x-profile", b"denied"))
+            return
+        if self._busy.locked():
+            await self.app(scope, receive, _with_header(send, b"x-profile", b"busy"))
+            return
+        
+        async with self._busy:
+            sampler = StackSampler(self.interval, "request-profiler")
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(switch_interval, self.interval))
+            sampler.start()
+            try:
+                if mode == "inline":
+                    await self._run_inline(scope, receive, send, sampler)
+                else:
+                    await self._run_stored(scope, receive, send, sampler)
+            finally:
+                sys.setswitchinterval(switch_interval)
+    
+    async def _run_stored(self, scope: Scope, receive: Receive, send: Send, sampler: StackSampler) -> None:
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.folded"
+        try:
+            await self.app(scope, receive, _with_header(send, b"x-profile-file", name.encode()))
+        finally:
+            sampler.stop()
+            os.makedirs(self.output_dir, exist_ok=True)
+            write_folded(os.path.join(self.output_dir, name), sampler.samples.most_common())
+    
+    async def _run_inline(self, scope: Scope, receive: Receive, send: Send, sampler: StackSampler) -> None:
+        status_code = 500
+        
+        async def discard(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+        
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            sampler.stop()
+        body = "".join(f"{stack} {count}\n" for stack, count in sampler.samples.most_common()).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profile-status", str(status_code).encode()),
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _with_header(send: Send, name: bytes, value: bytes) -> Send:
+    async def wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            message["headers"] = list(message.get("headers", [])) + [(name, value)]
+        await send(message)
+    return wrapper
+
+
+continuous_profiler: Optional[ContinuousProfiler] = None
+if settings.PROFILER_CONTINUOUS:
+    continuous_profiler = ContinuousProfiler(
+        settings.PROFILER_CONTINUOUS_INTERVAL_MS / 1000,
+        settings.PROFILER_DUMP_SECONDS,
+        settings.PROFILER_OUTPUT_DIR
+    )
@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta
+from uuid import uuid4
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.faults import fault_injector
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -20,6 +22,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    if fault_injector is not None:
+        fault_injector.bcrypt()
     return pwd_context.verify(plain_password, hashed_password)
 
 
@@ -35,6 +39,8 @@ def get_password_hash(password: str) -> str:
     """
     if len(password.encode('utf-8')) > 72:
         password = password[:72]
+    if fault_injector is not None:
+        fault_injector.bcrypt()
     return pwd_context.hash(password)
 
 
@@ -59,6 +65,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     to_encode.update({
         "exp": expire,
         "iat": datetime.utcnow(),
+        "jti": uuid4().hex,
         "type": "access"
     })
     
@@ -82,6 +89,7 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     to_encode.update({
         "exp": expire,
         "iat": datetime.utcnow(),
+        "jti": uuid4().hex,
         "type": "refresh"
     })
     
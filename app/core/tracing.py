@@ -0,0 +1,329 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+MAX_STATEMENT_LENGTH = 1000
+
+
+class Trace:
+    """Spans collected for one sampled request."""
+    __slots__ = ("trace_id", "spans")
+    
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+
+
+class Span:
+    """
+    One timed operation, exported in Zipkin v2 JSON format.
+    """
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "tags", "timestamp", "start", "duration")
+    
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], kind: Optional[str] = None):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.tags: Dict[str, str] = {}
+        self.timestamp = int(time.time() * 1_000_000)
+        self.start = time.perf_counter()
+        self.duration = 0
+    
+    def finish(self) -> None:
+        self.duration = max(int((time.perf_counter() - self.start) * 1_000_000), 1)
+        self.trace.spans.append(self)
+    
+    def to_zipkin(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace.trace_id,
+            "id": self.span_id,
+            "name": self.name,
+            "timestamp": self.timestamp,
+            "duration": self.duration,
+            "localEndpoint": {"serviceName": settings.TRACING_SERVICE_NAME},
+            "tags": self.tags
+        }
+        if self.parent_id:
+            span["parentId"] = self.parent_id
+        if self.kind:
+            span["kind"] = self.kind
+        return span
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class span:
+    """
+    Child span of the current span; does nothing when the request is not sampled.
+    
+    Usage:
+        with span("TaskService.create_task"):
+            ...
+    """
+    __slots__ = ("name", "kind", "tags", "_span", "_token")
+    
+    def __init__(self, name: str, kind: Optional[str] = None, **tags: str):
+        self.name = name
+        self.kind = kind
+        self.tags = tags
+        self._span = None
+    
+    def __enter__(self) -> Optional[Span]:
+        parent = current_span.get()
+        if parent is None:
+            return None
+        self._span = Span(parent.trace, self.name, parent.span_id, self.kind)
+        self._span.tags.update(self.tags)
+        self._token = current_span.set(self._span)
+        return self._span
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self._span is not None:
+            if exc_type is not None:
+                self._span.tags["error"] = exc_type.__name__
+            current_span.reset(self._token)
+            self._span.finish()
+        return False
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator wrapping a sync or async function in a span.
+    
+    The wrapper keeps the function's signature (functools.wraps), so it can
+    decorate FastAPI dependencies and endpoints.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            async_wrapper.__traced__ = True
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+def traced_service(cls: type) -> type:
+    """
+    Class decorator tracing every public static method of a service class.
+    
+    Spans are named "<Class>.<method>".
+    """
+    for attr, value in list(vars(cls).items()):
+        if isinstance(value, staticmethod) and not attr.startswith("_"):
+            setattr(cls, attr, staticmethod(traced(f"{cls.__name__}.{attr}")(value.__func__)))
+    return cls
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute whose endpoint function runs in a "handler <name>" span.
+    
+    Dependency resolution (traced separately) happens before the endpoint
+    is called, so both appear as siblings under the request span.
+    include_router() rebuilds routes from the already wrapped endpoint,
+    which is therefore not wrapped again.
+    """
+    
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if not getattr(endpoint, "__traced__", False):
+            endpoint = traced(f"handler {endpoint.__name__}")(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class SpanExporter:
+    """
+    Writes finished traces as JSON lines (one Zipkin v2 span list per line).
+    
+    Encoding and I/O happen on a background thread; the request path only
+    enqueues. When the queue is full, traces are dropped rather than
+    slowing requests down.
+    """
+    
+    def __init__(self, target: str, max_queue: int = 1000):
+        self.target = target
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Trace]]" = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+    
+    def export(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+    
+    def _run(self) -> None:
+        while True:
+            trace = self._queue.get()
+            if trace is None:
+                return
+            line = json.dumps([s.to_zipkin() for s in trace.spans])
+            try:
+                if self.target == "stdout":
+                    sys.stdout.write(line + "\n")
+                    sys.stdout.flush()
+                else:
+                    with open(self.target, "a", encoding="utf-8") as f:
+                        f.write(line + "\n")
+            except OSError:
+                logger.exception("Could not export trace %s", trace.trace_id)
+    
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    Parse a W3C traceparent header.
+    
+    Returns:
+        (trace_id, parent span id, sampled) or None if absent or malformed
+    """
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or parts[1] == "0" * 32:
+        return None
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+class TracingMiddleware:
+    """
+    Start a server span per request and propagate the trace ID.
+    
+    An incoming traceparent header is continued. Its sampled flag is
+    honoured only with trust_parent, since any client can set it and so
+    force every request it sends to be recorded; otherwise continued
+    and new traces alike are sampled at sample_rate. Every response
+    carries traceparent and X-Trace-Id, sampled or not, so a client-side
+    trace ID can always be matched against exported traces.
+    """
+    
+    def __init__(self, app: ASGIApp, exporter: SpanExporter, sample_rate: float, trust_parent: bool = False):
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.trust_parent = trust_parent
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        incoming = parse_traceparent(Headers(scope=scope).get("traceparent"))
+        if incoming:
+            trace_id, parent_id, parent_sampled = incoming
+        else:
+            trace_id, parent_id, parent_sampled = os.urandom(16).hex(), None, None
+        if parent_sampled is not None and self.trust_parent:
+            sampled = parent_sampled
+        else:
+            sampled = random.random() < self.sample_rate
+        
+        trace = Trace(trace_id)
+        root = Span(trace, f"{scope['method']} {scope['path']}", parent_id, "SERVER")
+        token = current_span.set(root) if sampled else None
+        status_code = 500
+        headers = [
+            (b"traceparent", f"00-{trace_id}-{root.span_id}-{'01' if sampled else '00'}".encode()),
+            (b"x-trace-id", trace_id.encode()),
+        ]
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if sampled:
+                current_span.reset(token)
+                route = scope.get("route")
+                if route is not None:
+                    root.name = f"{scope['method']} {route.path}"
+                    root.tags["http.route"] = route.path
+                root.tags["http.method"] = scope["method"]
+                root.tags["http.path"] = scope["path"]
+                root.tags["http.status_code"] = str(status_code)
+                root.finish()
+                self.exporter.export(trace)
+
+
+def instrument_engine(engine) -> None:
+    """Record a CLIENT span per SQL statement on the given engine."""
+    from sqlalchemy import event
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_sql_span(conn, cursor, statement, parameters, context, executemany):
+        parent = current_span.get()
+        if parent is None:
+            return
+        sql_span = Span(parent.trace, f"SQL {statement.split(None, 1)[0].upper()}", parent.span_id, "CLIENT")
+        sql_span.tags["db.statement"] = statement[:MAX_STATEMENT_LENGTH]
+        if executemany:
+            sql_span.tags["db.executemany"] = "true"
+        conn.info.setdefault("trace_spans", []).append(sql_span)
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish_sql_span(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            spans.pop().finish()
+    
+    @event.listens_for(engine, "handle_error")
+    def _fail_sql_span(exception_context):
+        connection = exception_context.connection
+        spans = connection.info.get("trace_spans") if connection is not None else None
+        if spans:
+            sql_span = spans.pop()
+            sql_span.tags["error"] = type(exception_context.original_exception).__name__
+            sql_span.finish()
+
+
+span_exporter: Optional[SpanExporter] = None
+if settings.TRACING_ENABLED:
+    span_exporter = SpanExporter(settings.TRACING_EXPORTER)
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.orm import declared_attr
+from sqlalchemy import Column, Index, Integer, DateTime
 from datetime import datetime
 
 
@@ -15,6 +16,16 @@ class TimestampMixin:
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
+def tenant_index(tablename: str) -> Index:
+    """
+    Index on (organization_id, id) for a tenant-scoped table.
+    
+    Serves every tenant filter and returns a tenant's rows in id order
+    (pagination, exports) without a sort.
+    """
+    return Index(f"ix_{tablename}_organization_id_id", "organization_id", "id")
+
+
 class TenantMixin:
     """
     Mixin to add organization_id (tenant_id) to models.
@@ -23,5 +34,28 @@ class TenantMixin:
     - Every tenant-scoped table must include this mixin
     - All queries must filter by organization_id
     - Prevents cross-tenant data access
+    
+    Models that declare their own __table_args__ must include
+    tenant_index(__tablename__) in them.
     """
-    organization_id = Column(Integer, nullable=False, index=True)
+    organization_id = Column(Integer, nullable=False)
+    
+    @declared_attr
+    def __table_args__(cls):
+        return (tenant_index(cls.__tablename__),)
+
+
+class VersionMixin:
+    """
+    Mixin to add a version counter for optimistic concurrency control.
+    
+    Every write increments version: ORM flushes through the mapper's
+    version_id_col (which also adds WHERE version = :old to the UPDATE),
+    and single-statement updates by setting version = version + 1.
+    Clients send it back in If-Match to make an update conditional.
+    """
+    version = Column(Integer, nullable=False, server_default="1")
+    
+    @declared_attr
+    def __mapper_args__(cls):
+        return {"version_id_col": cls.version}
@@ -1,36 +1,213 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import QueuePool
+from fastapi import Request
+from typing import Any, Callable, Generator, Dict, Iterable, Optional
 from app.core.config import settings
+from app.batch.context import BATCH_SCOPE_KEY
+from app.core.metrics import Histogram, current_timings, metrics
+from app.core.tracing import instrument_engine
+from app.core.faults import fault_injector
+
+
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long checkouts wait for a connection.
+    
+    The measured time covers waiting for a free slot and, for new
+    connections, connecting. Pool events only fire after a connection
+    is obtained, so the wait itself can only be measured here.
+    """
+    
+    def _do_get(self):
+        with pool_counters.lock:
+            pool_counters.waiting += 1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            with pool_counters.lock:
+                pool_counters.waiting -= 1
+                pool_counters.wait_seconds.observe(elapsed)
 
 
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
     echo=settings.ENVIRONMENT == "development"
 )
 
+if settings.TRACING_ENABLED:
+    instrument_engine(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def get_db() -> Generator[Session, None, None]:
+class PoolCounters:
+    """
+    Process-wide counters for connection pool activity.
+    
+    Updated from pool events, so they reflect real checkouts rather than
+    session objects. Used to verify that rejected requests never reach the pool.
+    Events fire on whichever thread uses the pool, so every update and read
+    holds lock.
+    """
+    
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.waiting = 0
+        self.wait_seconds = Histogram(POOL_WAIT_BUCKETS)
+        self.lock = threading.Lock()
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Return the current counter values."""
+        with self.lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects
+            }
+
+
+pool_counters = PoolCounters()
+
+
+@event.listens_for(engine, "connect")
+def _count_connect(dbapi_connection, connection_record):
+    with pool_counters.lock:
+        pool_counters.connects += 1
+
+
+@event.listens_for(engine, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    with pool_counters.lock:
+        pool_counters.checkouts += 1
+
+
+@event.listens_for(engine, "checkin")
+def _count_checkin(dbapi_connection, connection_record):
+    with pool_counters.lock:
+        pool_counters.checkins += 1
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    timings = current_timings.get()
+    if timings is not None:
+        timings.db += time.perf_counter() - conn.info.pop("query_start", time.perf_counter())
+        timings.db_queries += 1
+
+
+if fault_injector is not None:
+    # Registered after the query timer, so injected latency counts as database time.
+    fault_injector.install(engine)
+
+
+def pool_metrics() -> Iterable[str]:
+    """Connection pool gauges and checkout wait histogram."""
+    pool = engine.pool
+    counters = pool_counters.snapshot()
+    with pool_counters.lock:
+        waiting = pool_counters.waiting
+    lines = [
+        "# TYPE db_pool_size gauge",
+        f"db_pool_size {pool.size()}",
+        "# TYPE db_pool_checked_out gauge",
+        f"db_pool_checked_out {pool.checkedout()}",
+        "# TYPE db_pool_overflow gauge",
+        f"db_pool_overflow {max(pool.overflow(), 0)}",
+        "# TYPE db_pool_waiting gauge",
+        f"db_pool_waiting {waiting}",
+        "# TYPE db_pool_checkouts_total counter",
+        f"db_pool_checkouts_total {counters['checkouts']}",
+        "# TYPE db_pool_connects_total counter",
+        f"db_pool_connects_total {counters['connects']}",
+        "# HELP db_pool_wait_seconds Time spent waiting for a pooled connection.",
+        "# TYPE db_pool_wait_seconds histogram",
+    ]
+    with pool_counters.lock:
+        lines.extend(pool_counters.wait_seconds.expose("db_pool_wait_seconds"))
+    return lines
+
+
+metrics.add_collector(pool_metrics)
+
+
+class LazySession:
+    """
+    Proxy that creates its Session on first use.
+    
+    Attribute access is forwarded to the session, which is only created
+    then; closing a proxy whose session was never created does nothing.
+    Routes that answer from the response cache therefore never build a
+    session at all.
+    """
+    __slots__ = ("_factory", "_session")
+    
+    def __init__(self, factory: Callable[[], Session]):
+        self._factory = factory
+        self._session: Optional[Session] = None
+    
+    @property
+    def created(self) -> bool:
+        return self._session is not None
+    
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+    
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+def get_db(request: Request) -> Generator[Session, None, None]:
     """
     Dependency that provides a database session.
     
     Yields a SQLAlchemy session and ensures it's closed after use.
     This is the primary way to access the database in route handlers.
     
+    The session is lazy: it is only created when the route first uses it
+    (see LazySession), so cache hits never build one, and no connection is
+    checked out of the pool until the first statement is executed.
+    Routes declare this dependency after the auth dependencies so that
+    401/403 responses are returned before it is resolved.
+    Sub-requests of a /batch call share the batch's session, which the
+    batch request closes.
+    
     Usage:
         @router.get("/items")
         def get_items(db: Session = Depends(get_db)):
             return db.query(Item).all()
-    
+            
     Yields:
         Database session
     """
-    db = SessionLocal()
+    batch = request.scope.get(BATCH_SCOPE_KEY)
+    if batch is not None:
+        yield batch.db
+        return
+    
+    db = LazySession(SessionLocal)
     try:
         yield db
     finally:
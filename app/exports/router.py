@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.core.dependencies import get_tenant_id, require_admin
+from app.core.tracing import TracedRoute
+from app.exports.schemas import MEDIA_TYPES, ExportEntity, ExportFormat
+from app.exports.service import ExportService
+
+
+router = APIRouter(prefix="/exports", tags=["Exports"], route_class=TracedRoute)
+
+
+@router.get("/{entity}")
+async def export_entity(
+    entity: ExportEntity,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    current_user: dict = Depends(require_admin),
+    tenant_id: int = Depends(get_tenant_id)
+):
+    """
+    Stream every task, comment, project or membership of the organization.
+    
+    - format: "ndjson" (one JSON object per line) or "csv" (with header row)
+    
+    Rows are sent in ID order as they are read, so exports of any size
+    start immediately and use constant server memory. Requires ORG_ADMIN.
+    """
+    filename = f"{entity.value}-{tenant_id}.{export_format.value}"
+    return StreamingResponse(
+        ExportService.stream(entity, tenant_id, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,21 @@
+import enum
+
+
+class ExportEntity(str, enum.Enum):
+    """Tenant-wide collections that can be exported."""
+    TASKS = "tasks"
+    COMMENTS = "comments"
+    PROJECTS = "projects"
+    MEMBERSHIPS = "memberships"
+
+
+class ExportFormat(str, enum.Enum):
+    """Export file formats."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
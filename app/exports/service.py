@@ -0,0 +1,186 @@
+import csv
+import io
+from typing import Any, Callable, Iterator, Optional, Sequence
+from pydantic_core import to_json
+from sqlalchemy import DateTime, Enum as SQLEnum, Select, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.tracing import traced_service
+from app.database.session import SessionLocal
+from app.exports.schemas import ExportEntity, ExportFormat
+from app.projects.models import Project
+from app.projects.schemas import ProjectResponse
+from app.roles.models import Role
+from app.tasks.models import Task
+from app.tasks.schemas import TaskResponse
+from app.comments.models import Comment
+from app.comments.schemas import CommentResponse
+from app.users.models import User, UserOrganization
+from app.utils.projection import response_columns
+
+
+# Leading characters that make spreadsheet applications evaluate a cell.
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_text(value: Optional[str]) -> Optional[str]:
+    if value and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_converter(column_type: Any) -> Optional[Callable[[Any], Any]]:
+    """Per-column conversion to the value written in a CSV cell, decided once per export."""
+    if isinstance(column_type, SQLEnum):
+        return lambda value: None if value is None else value.value
+    if isinstance(column_type, DateTime):
+        return lambda value: None if value is None else value.isoformat()
+    if column_type.python_type is str:
+        return _csv_text
+    return None
+
+
+class _CSVEncoder:
+    """Encodes batches of rows as CSV lines, preceded by a header line."""
+    
+    def __init__(self, stmt: Select):
+        self.names = [column.key for column in stmt.selected_columns]
+        self.converters = []
+        for index, column in enumerate(stmt.selected_columns):
+            converter = _csv_converter(column.type)
+            if converter is not None:
+                self.converters.append((index, converter))
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator="\n")
+    
+    def _flush(self) -> bytes:
+        data = self.buffer.getvalue().encode("utf-8")
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+    
+    def header(self) -> bytes:
+        self.writer.writerow(self.names)
+        return self._flush()
+    
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        for row in rows:
+            values = list(row)
+            for index, converter in self.converters:
+                values[index] = converter(values[index])
+            self.writer.writerow(values)
+        return self._flush()
+
+
+class _NDJSONEncoder:
+    """Encodes batches of rows as one JSON object per line."""
+    
+    def __init__(self, stmt: Select):
+        self.names = tuple(column.key for column in stmt.selected_columns)
+    
+    def header(self) -> bytes:
+        return b""
+    
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        names = self.names
+        return b"".join(to_json(dict(zip(names, row))) + b"\n" for row in rows)
+
+
+@traced_service
+class ExportService:
+    """
+    Service layer for streaming tenant-wide exports.
+    """
+    
+    @staticmethod
+    def build_query(entity: ExportEntity, organization_id: int) -> Select:
+        """
+        Column projection of one tenant's rows for an export, in ID order.
+        
+        Tasks, comments and projects export the fields of their response
+        schemas; memberships export the member's profile and role name.
+        
+        Args:
+            entity: Collection to export
+            organization_id: Tenant ID
+            
+        Returns:
+            SELECT statement
+        """
+        if entity == ExportEntity.TASKS:
+            return select(*response_columns(Task, TaskResponse)).where(
+                Task.organization_id == organization_id
+            ).order_by(Task.id)
+        if entity == ExportEntity.COMMENTS:
+            return select(*response_columns(Comment, CommentResponse)).where(
+                Comment.organization_id == organization_id
+            ).order_by(Comment.id)
+        if entity == ExportEntity.PROJECTS:
+            return select(*response_columns(Project, ProjectResponse)).where(
+                Project.organization_id == organization_id
+            ).order_by(Project.id)
+        return select(
+            UserOrganization.id,
+            UserOrganization.user_id,
+            User.email,
+            User.first_name,
+            User.last_name,
+            Role.name.label("role"),
+            UserOrganization.is_active,
+            UserOrganization.created_at
+        ).join(
+            User, User.id == UserOrganization.user_id
+        ).join(
+            Role, Role.id == UserOrganization.role_id
+        ).where(
+            UserOrganization.organization_id == organization_id
+        ).order_by(UserOrganization.id)
+    
+    @staticmethod
+    def stream(
+        entity: ExportEntity,
+        organization_id: int,
+        export_format: ExportFormat,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        Encoded export, one chunk per batch of rows.
+        
+        Rows are fetched batch_size at a time through a server-side cursor
+        (yield_per), encoded and handed to the response before the next
+        batch is fetched, so memory use depends on the batch size and not
+        on the size of the tenant. The generator opens its own session:
+        request-scoped sessions are closed before a streamed body is sent.
+        The session, and its pooled connection, is held until the last
+        chunk is sent or the client disconnects.
+        
+        CSV text cells starting with a formula character (=, +, -, @) are
+        prefixed with a quote so spreadsheets show them as text.
+        
+        Args:
+            entity: Collection to export
+            organization_id: Tenant ID
+            export_format: NDJSON or CSV
+            session_factory: Creates the session used for the export
+            batch_size: Rows per fetch and per chunk (default EXPORT_BATCH_SIZE)
+            
+        Returns:
+            Iterator of encoded chunks
+        """
+        stmt = ExportService.build_query(entity, organization_id)
+        encoder = _CSVEncoder(stmt) if export_format == ExportFormat.CSV else _NDJSONEncoder(stmt)
+        return _generate(stmt, encoder, session_factory, batch_size or settings.EXPORT_BATCH_SIZE)
+
+
+def _generate(stmt: Select, encoder: Any, session_factory: Callable[[], Session], batch_size: int) -> Iterator[bytes]:
+    db = session_factory()
+    try:
+        header = encoder.header()
+        if header:
+            yield header
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            yield encoder.encode(rows)
+    finally:
+        db.close()
@@ -1,6 +1,15 @@
-from fastapi import FastAPI
+import hmac
+from fastapi import FastAPI, Header, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware, CompressionPolicy
+from app.core.negotiation import ContentNegotiationMiddleware
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.profiling import ProfilerMiddleware, continuous_profiler
+from app.core.tracing import TracingMiddleware, span_exporter
+from app.core.invalidation import invalidation_bus
+from app.auth.revocation import revocation_registry
+from app.realtime.hub import realtime_hub
 from app.auth.router import router as auth_router
 from app.organizations.router import router as organizations_router
 from app.projects.router import router as projects_router
@@ -8,6 +17,9 @@ from app.boards.router import router as boards_router
 from app.tasks.router import router as tasks_router
 from app.comments.router import router as comments_router
 from app.users.router import router as users_router
+from app.batch.router import router as batch_router
+from app.realtime.router import router as realtime_router
+from app.exports.router import router as exports_router
 
 
 app = FastAPI(
@@ -19,14 +31,50 @@ app = FastAPI(
     openapi_url="/openapi.json"
 )
 
+app.add_middleware(ContentNegotiationMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets browser clients read ETags for If-None-Match and If-Match
+    expose_headers=["ETag"],
+)
+
+if settings.PROFILER_ENABLED:
+    app.add_middleware(
+        ProfilerMiddleware,
+        interval=settings.PROFILER_SAMPLE_INTERVAL_MS / 1000,
+        output_dir=settings.PROFILER_OUTPUT_DIR
+    )
+
+# Auth responses carry tokens next to request-controlled input; compressing
+# them would expose the tokens to BREACH-style length oracles. Realtime
+# streams are mostly idle and a compressor per open stream costs ~256 KB.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    route_policies={
+        f"{settings.API_V1_STR}/auth": CompressionPolicy(enabled=False),
+        f"{settings.API_V1_STR}/realtime": CompressionPolicy(enabled=False),
+    }
 )
 
+if span_exporter is not None:
+    app.add_middleware(
+        TracingMiddleware,
+        exporter=span_exporter,
+        sample_rate=settings.TRACING_SAMPLE_RATE,
+        trust_parent=settings.TRACING_TRUST_PARENT
+    )
+
+# Outermost, so request latency includes the other middleware.
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth_router, prefix=settings.API_V1_STR)
 app.include_router(organizations_router, prefix=settings.API_V1_STR)
 app.include_router(projects_router, prefix=settings.API_V1_STR)
@@ -34,6 +82,60 @@ app.include_router(boards_router, prefix=settings.API_V1_STR)
 app.include_router(tasks_router, prefix=settings.API_V1_STR)
 app.include_router(comments_router, prefix=settings.API_V1_STR)
 app.include_router(users_router, prefix=settings.API_V1_STR)
+app.include_router(batch_router, prefix=settings.API_V1_STR)
+app.include_router(realtime_router, prefix=settings.API_V1_STR)
+app.include_router(exports_router, prefix=settings.API_V1_STR)
+
+
+@app.on_event("startup")
+def start_invalidation_bus():
+    """Subscribe this worker to cache invalidations from the other workers."""
+    invalidation_bus.start()
+
+
+@app.on_event("startup")
+def start_revocation_refresh():
+    """Load revoked tokens and keep them current from a background thread."""
+    revocation_registry.start()
+
+
+@app.on_event("startup")
+async def start_realtime_hub():
+    await realtime_hub.start()
+
+
+@app.on_event("startup")
+def start_continuous_profiler():
+    if continuous_profiler is not None:
+        continuous_profiler.register_routes(app.routes)
+        continuous_profiler.start()
+
+
+@app.on_event("shutdown")
+def stop_invalidation_bus():
+    invalidation_bus.stop()
+
+
+@app.on_event("shutdown")
+def stop_revocation_refresh():
+    revocation_registry.stop()
+
+
+@app.on_event("shutdown")
+async def stop_realtime_hub():
+    await realtime_hub.stop()
+
+
+@app.on_event("shutdown")
+def stop_continuous_profiler():
+    if continuous_profiler is not None:
+        continuous_profiler.stop()
+
+
+@app.on_event("shutdown")
+def close_span_exporter():
+    if span_exporter is not None:
+        span_exporter.close()
 
 
 @app.get("/")
@@ -57,3 +159,23 @@ async def health_check():
         "status": "healthy",
         "environment": settings.ENVIRONMENT
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(authorization: str = Header(default="")):
+    """
+    Process metrics in Prometheus text exposition format.
+    
+    Exposes per-route and pool internals, so it is disabled (404) unless
+    METRICS_TOKEN is set, and then requires "Authorization: Bearer <token>".
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(authorization.encode("utf-8"), f"Bearer {settings.METRICS_TOKEN}".encode("utf-8")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # Starlette appends the charset itself
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
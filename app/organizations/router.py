@@ -3,11 +3,12 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.database.session import get_db
 from app.core.dependencies import get_current_user, require_admin
+from app.core.tracing import TracedRoute
 from app.organizations.schemas import OrganizationCreate, OrganizationUpdate, OrganizationResponse
 from app.organizations.service import OrganizationService
 
 
-router = APIRouter(prefix="/organizations", tags=["Organizations"])
+router = APIRouter(prefix="/organizations", tags=["Organizations"], route_class=TracedRoute)
 
 
 @router.get("/public", response_model=List[OrganizationResponse])
@@ -27,8 +28,8 @@ async def list_organizations_public(
 @router.post("/", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED)
 async def create_organization(
     data: OrganizationCreate,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Create a new organization.
@@ -43,8 +44,8 @@ async def create_organization(
 async def list_organizations(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     List all organizations.
@@ -58,8 +59,8 @@ async def list_organizations(
 @router.get("/{organization_id}", response_model=OrganizationResponse)
 async def get_organization(
     organization_id: int,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Get organization by ID.
@@ -72,8 +73,8 @@ async def get_organization(
 async def update_organization(
     organization_id: int,
     data: OrganizationUpdate,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(require_admin)
+    current_user: dict = Depends(require_admin),
+    db: Session = Depends(get_db)
 ):
     """
     Update organization.
@@ -87,8 +88,8 @@ async def update_organization(
 @router.delete("/{organization_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_organization(
     organization_id: int,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(require_admin)
+    current_user: dict = Depends(require_admin),
+    db: Session = Depends(get_db)
 ):
     """
     Delete (deactivate) organization.
@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.tracing import traced_service
 from app.organizations.models import Organization
 from app.organizations.schemas import OrganizationCreate, OrganizationUpdate
 from typing import List, Optional
 
 
+@traced_service
 class OrganizationService:
     """
     Service layer for organization operations.
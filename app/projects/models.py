@@ -1,8 +1,8 @@
 from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean
-from app.database.base import Base, TimestampMixin, TenantMixin
+from app.database.base import Base, TimestampMixin, TenantMixin, VersionMixin
 
 
-class Project(Base, TimestampMixin, TenantMixin):
+class Project(Base, TimestampMixin, TenantMixin, VersionMixin):
     """
     Project model - represents a project within an organization.
     
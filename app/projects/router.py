@@ -1,21 +1,26 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Request, status, Query
 from sqlalchemy.orm import Session
+from typing import Optional, Tuple
 from app.database.session import get_db
 from app.core.dependencies import get_current_user, get_tenant_id, require_manager_or_admin
 from app.projects.schemas import ProjectCreate, ProjectUpdate, ProjectResponse
 from app.projects.service import ProjectService
 from app.utils.pagination import PaginatedResponse, PaginationParams
+from app.utils.serialization import json_response, paginated_json_response
+from app.core.cache import response_cache
+from app.core.tracing import TracedRoute
+from app.utils.etag import make_etag, entity_etag, etag_headers, if_match_versions, is_not_modified, not_modified_response
 
 
-router = APIRouter(prefix="/projects", tags=["Projects"])
+router = APIRouter(prefix="/projects", tags=["Projects"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
     data: ProjectCreate,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(require_manager_or_admin),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Create a new project.
@@ -29,67 +34,97 @@ async def create_project(
 
 @router.get("/", response_model=PaginatedResponse[ProjectResponse])
 async def list_projects(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    include_description: bool = Query(True),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     List all projects for the current organization.
     
     Results are automatically filtered by tenant_id.
+    Set include_description=false to skip loading descriptions.
+    Supports If-None-Match; unchanged pages return 304 without being loaded.
     """
-    pagination = PaginationParams(page=page, page_size=page_size)
-    projects, total = ProjectService.list_projects(db, tenant_id, pagination.skip, pagination.limit)
+    def build():
+        etag = make_etag(
+            "projects", tenant_id, page, page_size, include_description,
+            ProjectService.get_projects_version(db, tenant_id)
+        )
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        pagination = PaginationParams(page=page, page_size=page_size)
+        projects, total = ProjectService.list_projects(
+            db, tenant_id, pagination.skip, pagination.limit, include_description
+        )
+        
+        return paginated_json_response(
+            ProjectResponse,
+            projects,
+            total=total,
+            page=page,
+            page_size=page_size,
+            headers=etag_headers(etag)
+        )
     
-    return PaginatedResponse.create(
-        items=projects,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    return await response_cache.serve(request, "projects", tenant_id, current_user.get("role"), build)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
+    request: Request,
     project_id: int,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Get project by ID.
     
     Tenant isolation ensures users can only access projects in their organization.
+    Supports If-None-Match.
     """
-    project = ProjectService.get_project(db, project_id, tenant_id)
-    return project
+    def build():
+        version = ProjectService.get_project_version(db, project_id, tenant_id)
+        if version is not None and is_not_modified(request, entity_etag(version)):
+            return not_modified_response(entity_etag(version))
+        
+        project = ProjectService.get_project(db, project_id, tenant_id)
+        return json_response(ProjectResponse, project, headers=etag_headers(entity_etag(project.version)))
+    
+    return await response_cache.serve(request, "projects", tenant_id, current_user.get("role"), build)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
     data: ProjectUpdate,
-    db: Session = Depends(get_db),
+    versions: Optional[Tuple[int, ...]] = Depends(if_match_versions),
     current_user: dict = Depends(require_manager_or_admin),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Update project.
     
     Requires PROJECT_MANAGER or ORG_ADMIN role.
+    With If-Match (the project's ETag), the update only applies if the
+    project has not changed since; otherwise 412 Precondition Failed.
     """
-    project = ProjectService.update_project(db, project_id, data, tenant_id)
-    return project
+    project = ProjectService.update_project(db, project_id, data, tenant_id, versions)
+    return json_response(ProjectResponse, project, headers=etag_headers(entity_etag(project.version)))
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(require_manager_or_admin),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Delete (deactivate) project.
@@ -31,6 +31,7 @@ class ProjectResponse(ProjectBase):
     created_by: int
     created_at: datetime
     updated_at: datetime
+    version: int
     
     class Config:
         from_attributes = True
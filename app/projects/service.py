@@ -1,10 +1,17 @@
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.invalidation import invalidation_bus
+from app.core.tracing import traced_service
 from app.projects.models import Project
-from app.projects.schemas import ProjectCreate, ProjectUpdate
-from typing import List
+from app.projects.schemas import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.utils.projection import response_columns
+from app.utils.etag import collection_version
+from app.utils.versioning import versioned_update
+from typing import List, Optional, Tuple, Any
 
 
+@traced_service
 class ProjectService:
     """
     Service layer for project operations.
@@ -46,6 +53,7 @@ class ProjectService:
         )
         db.add(project)
         db.commit()
+        invalidation_bus.publish(organization_id, "projects")
         db.refresh(project)
         return project
     
@@ -78,49 +86,103 @@ class ProjectService:
         return project
     
     @staticmethod
-    def list_projects(db: Session, organization_id: int, skip: int = 0, limit: int = 20) -> tuple[List[Project], int]:
+    def list_projects(
+        db: Session,
+        organization_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        include_description: bool = True
+    ) -> tuple[List[Row], int]:
         """
-        List projects for current tenant with pagination.
+        List projects for current tenant with pagination, in id order.
+        
+        Selects only the ProjectResponse columns as plain rows (no ORM entities).
         
         Args:
             db: Database session
             organization_id: Current tenant ID
             skip: Number of records to skip
             limit: Maximum number of records to return
+            include_description: Whether to select the description column
             
         Returns:
-            Tuple of (projects list, total count)
+            Tuple of (project rows, total count)
         """
-        query = db.query(Project).filter(
+        total = db.query(Project.id).filter(
             Project.organization_id == organization_id
-        )
-        total = query.count()
+        ).count()
+        
+        exclude = () if include_description else ("description",)
+        query = db.query(*response_columns(Project, ProjectResponse, exclude)).filter(
+            Project.organization_id == organization_id
+        ).order_by(Project.id)
         projects = query.offset(skip).limit(limit).all()
         return projects, total
     
     @staticmethod
-    def update_project(db: Session, project_id: int, data: ProjectUpdate, organization_id: int) -> Project:
+    def get_project_version(db: Session, project_id: int, organization_id: int) -> Optional[int]:
+        """
+        Version of a single project, used to build its ETag.
+        
+        Args:
+            db: Database session
+            project_id: Project ID
+            organization_id: Current tenant ID
+            
+        Returns:
+            Project version, or None if not found
+        """
+        return db.query(Project.version).filter(
+            Project.id == project_id,
+            Project.organization_id == organization_id
+        ).scalar()
+    
+    @staticmethod
+    def get_projects_version(db: Session, organization_id: int) -> Tuple[Any, ...]:
+        """
+        Change fingerprint for list_projects.
+        
+        Args:
+            db: Database session
+            organization_id: Current tenant ID
+            
+        Returns:
+            (count, max updated_at, max id) of the tenant's projects
+        """
+        return collection_version(db, Project, Project.organization_id == organization_id)
+    
+    @staticmethod
+    def update_project(
+        db: Session,
+        project_id: int,
+        data: ProjectUpdate,
+        organization_id: int,
+        versions: Optional[Tuple[int, ...]] = None
+    ) -> Row:
         """
         Update project with tenant isolation.
         
+        A single conditional UPDATE ... RETURNING; the project is only read
+        again to tell a missing project from a failed precondition.
+        
         Args:
             db: Database session
             project_id: Project ID
             data: Update data
             organization_id: Current tenant ID
+            versions: Versions accepted by If-Match, None for any
             
         Returns:
-            Updated project
+            Updated project row (ProjectResponse columns)
             
         Raises:
-            HTTPException: If project not found or slug conflict
+            HTTPException: If project not found (404), slug conflict (400)
+                or its version is not in versions (412)
         """
-        project = ProjectService.get_project(db, project_id, organization_id)
-        
         update_data = data.model_dump(exclude_unset=True)
         
         if "slug" in update_data:
-            existing = db.query(Project).filter(
+            existing = db.query(Project.id).filter(
                 Project.organization_id == organization_id,
                 Project.slug == update_data["slug"],
                 Project.id != project_id
@@ -131,11 +193,24 @@ class ProjectService:
                     detail="Project slug already exists in this organization"
                 )
         
-        for field, value in update_data.items():
-            setattr(project, field, value)
+        project = versioned_update(
+            db, Project, project_id, organization_id, update_data,
+            response_columns(Project, ProjectResponse), versions
+        )
+        if project is None:
+            db.rollback()
+            if ProjectService.get_project_version(db, project_id, organization_id) is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Project not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Project was modified by another request"
+            )
         
         db.commit()
-        db.refresh(project)
+        invalidation_bus.publish(organization_id, "projects", entity=(Project, project_id), db=db)
         return project
     
     @staticmethod
@@ -151,6 +226,14 @@ class ProjectService:
         Raises:
             HTTPException: If project not found
         """
-        project = ProjectService.get_project(db, project_id, organization_id)
-        project.is_active = False
+        # A single conditional UPDATE; flushing a loaded instance would fail
+        # its version check (StaleDataError) after a concurrent update.
+        project = versioned_update(db, Project, project_id, organization_id, {"is_active": False}, (Project.id,))
+        if project is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
         db.commit()
+        invalidation_bus.publish(organization_id, "projects", entity=(Project, project_id), db=db)
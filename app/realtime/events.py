@@ -0,0 +1,41 @@
+from typing import Any, Dict, Optional
+
+
+def topic_name(kind: str, entity_id: int) -> str:
+    """Topic of a project, board or task, e.g. "board:12"."""
+    return f"{kind}:{entity_id}"
+
+
+def change_event(topic: str, entity: str, op: str, entity_id: int, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build a change event.
+    
+    Args:
+        topic: Topic the event is delivered to (see topic_name)
+        entity: "task", "board" or "comment"
+        op: "created", "updated" or "deleted"
+        entity_id: ID of the changed row
+        data: Full representation for "created", changed fields for "updated"
+        
+    Returns:
+        Event dict, JSON-serializable
+    """
+    return {"topic": topic, "entity": entity, "op": op, "id": entity_id, "data": data or {}}
+
+
+def merge_events(previous: Dict[str, Any], event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Combine two pending events for the same entity into one.
+    
+    created + updated stays a create with the new values, updates merge
+    their changed fields, and a delete replaces anything before it (a
+    create followed by a delete cancels out).
+    
+    Returns:
+        The combined event, or None if nothing needs to be sent
+    """
+    if event["op"] == "deleted":
+        return None if previous["op"] == "created" else event
+    if event["op"] == "updated" and previous["op"] in ("created", "updated"):
+        return {**previous, "data": {**previous["data"], **event["data"]}}
+    return event
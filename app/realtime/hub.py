@@ -0,0 +1,230 @@
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.metrics import metrics
+from app.realtime.events import merge_events
+
+
+Topic = Tuple[int, str]
+
+CONNECTED = b": connected\n\n"
+HEARTBEAT = b": ping\n\n"
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+class Subscriber:
+    """
+    One open stream: its topics and the changes not yet sent.
+    
+    Pending changes are keyed by entity, so a burst of updates to the same
+    task is sent as one merged diff. Past max_pending entities the
+    subscriber is marked for a resync instead of buffering further; a
+    "resync" event (sent when a change was too large for the bus) does
+    the same.
+    """
+    __slots__ = ("tenant_id", "topics", "pending", "resync", "wake")
+    
+    def __init__(self, tenant_id: int, topics: Iterable[str]):
+        self.tenant_id = tenant_id
+        self.topics = tuple(topics)
+        self.pending: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self.resync = False
+        self.wake = asyncio.Event()
+    
+    def add(self, event: Dict[str, Any], max_pending: int) -> None:
+        if self.resync:
+            return
+        if event["op"] == "resync":
+            self.pending.clear()
+            self.resync = True
+            self.wake.set()
+            return
+        key = (event["entity"], event["id"])
+        previous = self.pending.pop(key, None)
+        merged = event if previous is None else merge_events(previous, event)
+        if merged is not None:
+            self.pending[key] = merged
+        if len(self.pending) > max_pending:
+            self.pending.clear()
+            self.resync = True
+        self.wake.set()
+    
+    def drain(self) -> bytes:
+        if self.resync:
+            self.resync = False
+            self.pending.clear()
+            return RESYNC
+        if not self.pending:
+            return b""
+        events = list(self.pending.values())
+        self.pending.clear()
+        return b"event: changes\ndata: " + json.dumps(events, default=str).encode("utf-8") + b"\n\n"
+
+
+class RealtimeHub:
+    """
+    Per-worker fan-out of change events to Server-Sent Events streams.
+    
+    Subscribers are indexed by (tenant, topic). Publishing appends the
+    event to each matching subscriber's pending set and sets its wake
+    event; no task is created per message. Each stream coroutine waits
+    for its wake event, sleeps the coalescing window so bursts collapse
+    into one message, then drains its pending set.
+    
+    Idle streams cost a suspended coroutine and an Event: a single hub
+    task wakes every stream at the heartbeat interval, instead of each
+    stream keeping its own timer.
+    
+    publish() may be called from any thread (e.g. the invalidation bus
+    listener); events are handed to the event loop.
+    """
+    
+    def __init__(self, coalesce_seconds: float, heartbeat_seconds: float, max_pending: int):
+        self.coalesce_seconds = coalesce_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_pending = max_pending
+        self._topics: Dict[Topic, Set[Subscriber]] = defaultdict(set)
+        self._subscribers: Set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._beat = 0
+        self._closing = False
+        self.published = 0
+        self.delivered = 0
+    
+    async def start(self) -> None:
+        """Bind to the running event loop and start the heartbeat (application startup)."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+    
+    async def stop(self) -> None:
+        """Stop the heartbeat and end all streams (application shutdown)."""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        self._closing = True
+        for subscriber in self._subscribers:
+            subscriber.wake.set()
+    
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            self._beat += 1
+            for subscriber in self._subscribers:
+                subscriber.wake.set()
+    
+    def subscribe(self, tenant_id: int, topics: Iterable[str]) -> Subscriber:
+        subscriber = Subscriber(tenant_id, topics)
+        for topic in subscriber.topics:
+            self._topics[(tenant_id, topic)].add(subscriber)
+        self._subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        for topic in subscriber.topics:
+            key = (subscriber.tenant_id, topic)
+            subscribers = self._topics.get(key)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._topics[key]
+        self._subscribers.discard(subscriber)
+    
+    def publish(self, tenant_id: int, events: List[Dict[str, Any]]) -> None:
+        """
+        Deliver committed changes to this worker's subscribers.
+        
+        Args:
+            tenant_id: Tenant the changes belong to
+            events: Change events (see change_event)
+        """
+        if not events or not self._subscribers:
+            return
+        if self._loop is None or threading.get_ident() == self._loop_thread:
+            self._dispatch(tenant_id, events)
+        else:
+            self._loop.call_soon_threadsafe(self._dispatch, tenant_id, events)
+    
+    def _dispatch(self, tenant_id: int, events: List[Dict[str, Any]]) -> None:
+        for event in events:
+            self.published += 1
+            for subscriber in self._topics.get((tenant_id, event["topic"]), ()):
+                subscriber.add(event, self.max_pending)
+                self.delivered += 1
+    
+    def resync(self) -> None:
+        """Tell every subscriber to reload, e.g. after missed bus messages."""
+        if self._loop is not None and threading.get_ident() != self._loop_thread:
+            self._loop.call_soon_threadsafe(self.resync)
+            return
+        for subscriber in self._subscribers:
+            subscriber.pending.clear()
+            subscriber.resync = True
+            subscriber.wake.set()
+    
+    async def stream(self, tenant_id: int, topics: Iterable[str], max_seconds: float) -> AsyncIterator[bytes]:
+        """
+        SSE byte stream of a tenant's topics.
+        
+        Subscribes when iteration starts and unsubscribes when the client
+        goes away. The stream ends after max_seconds so clients reconnect
+        with a fresh token.
+        """
+        subscriber = self.subscribe(tenant_id, topics)
+        deadline = time.monotonic() + max_seconds
+        beat = self._beat
+        try:
+            yield CONNECTED
+            while time.monotonic() < deadline and not self._closing:
+                await subscriber.wake.wait()
+                subscriber.wake.clear()
+                if subscriber.pending and not subscriber.resync:
+                    await asyncio.sleep(self.coalesce_seconds)
+                chunk = subscriber.drain()
+                if chunk:
+                    yield chunk
+                elif beat != self._beat:
+                    yield HEARTBEAT
+                beat = self._beat
+        finally:
+            self.unsubscribe(subscriber)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "topics": len(self._topics),
+            "published": self.published,
+            "delivered": self.delivered
+        }
+
+
+realtime_hub = RealtimeHub(
+    settings.REALTIME_COALESCE_MS / 1000,
+    settings.REALTIME_HEARTBEAT_SECONDS,
+    settings.REALTIME_MAX_PENDING
+)
+
+
+def realtime_metrics() -> List[str]:
+    """Open streams and event fan-out counters."""
+    stats = realtime_hub.stats()
+    return [
+        "# TYPE realtime_subscribers gauge",
+        f"realtime_subscribers {stats['subscribers']}",
+        "# TYPE realtime_events_published_total counter",
+        f"realtime_events_published_total {stats['published']}",
+        "# TYPE realtime_events_delivered_total counter",
+        f"realtime_events_delivered_total {stats['delivered']}",
+    ]
+
+
+invalidation_bus.add_listener(realtime_hub)
+metrics.add_collector(realtime_metrics)
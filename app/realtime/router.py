@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List
+from app.database.session import get_db
+from app.core.config import settings
+from app.core.dependencies import get_current_user, get_tenant_id
+from app.core.tracing import TracedRoute
+from app.realtime.hub import realtime_hub
+from app.realtime.service import RealtimeService
+
+
+router = APIRouter(prefix="/realtime", tags=["Realtime"], route_class=TracedRoute)
+
+
+@router.get("/stream")
+async def stream_changes(
+    project_id: List[int] = Query([]),
+    board_id: List[int] = Query([]),
+    task_id: List[int] = Query([]),
+    current_user: dict = Depends(get_current_user),
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-Sent Events stream of committed changes.
+    
+    - project_id: board created/updated/deleted in the project
+    - board_id: task created/updated/deleted on the board
+    - task_id: comment created/updated/deleted on the task
+    
+    Each "changes" event carries a JSON list of
+    {"topic", "entity", "op", "id", "data"}; "data" is the full object for
+    creates and only the changed fields for updates. Changes within the
+    coalescing window arrive together, merged per entity. A "resync" event
+    means changes may have been missed and the client should reload.
+    The stream closes after REALTIME_MAX_STREAM_SECONDS; reconnect with a
+    current token.
+    """
+    topics = RealtimeService.authorize_topics(db, tenant_id, project_id, board_id, task_id)
+    # Return the connection to the pool; the stream itself needs no database.
+    db.close()
+    
+    return StreamingResponse(
+        realtime_hub.stream(tenant_id, topics, settings.REALTIME_MAX_STREAM_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,66 @@
+from typing import List, Sequence
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.entity_cache import entity_cache
+from app.core.tracing import traced_service
+from app.projects.models import Project
+from app.boards.models import Board
+from app.tasks.models import Task
+from app.realtime.events import topic_name
+
+
+@traced_service
+class RealtimeService:
+    """
+    Service layer for realtime subscriptions.
+    """
+    
+    @staticmethod
+    def authorize_topics(
+        db: Session,
+        organization_id: int,
+        project_ids: Sequence[int],
+        board_ids: Sequence[int],
+        task_ids: Sequence[int]
+    ) -> List[str]:
+        """
+        Validate requested subscriptions and return their topics.
+        
+        Each project, board and task must belong to the current tenant.
+        
+        Args:
+            db: Database session
+            organization_id: Current tenant ID
+            project_ids: Projects whose boards to follow
+            board_ids: Boards whose tasks to follow
+            task_ids: Tasks whose comments to follow
+            
+        Returns:
+            Topic names
+            
+        Raises:
+            HTTPException: If nothing or too much is requested, or an entity is not found
+        """
+        requested = [
+            ("project", Project, set(project_ids)),
+            ("board", Board, set(board_ids)),
+            ("task", Task, set(task_ids)),
+        ]
+        count = sum(len(ids) for _, _, ids in requested)
+        if count == 0 or count > settings.REALTIME_MAX_TOPICS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Subscribe to between 1 and {settings.REALTIME_MAX_TOPICS} projects, boards and tasks"
+            )
+        
+        topics = []
+        for kind, model, ids in requested:
+            for entity_id in sorted(ids):
+                if entity_cache.owner_of(db, model, entity_id) != organization_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"{kind.capitalize()} not found"
+                    )
+                topics.append(topic_name(kind, entity_id))
+        return topics
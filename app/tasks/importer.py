@@ -0,0 +1,361 @@
+import csv
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.boards.models import Board
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.realtime.events import topic_name
+from app.tasks.models import Task
+from app.tasks.schemas import TaskCreate
+from app.users.models import User, UserOrganization
+from app.utils.bulk import BulkInserter
+
+
+# (record number, raw fields or None, parse error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+# Columns taken from each record, then those shared by a whole batch.
+ROW_COLUMNS = ("board_id", "title", "description", "status", "priority", "assigned_to", "due_date", "position")
+BATCH_COLUMNS = ("organization_id", "created_by", "created_at", "updated_at")
+
+_batch_adapter = TypeAdapter(List[TaskCreate])
+
+
+def read_records(stream: TextIO, import_format: str) -> Iterator[Record]:
+    """
+    Parse an upload incrementally into raw records.
+    
+    CSV needs a header row naming TaskCreate fields; empty cells are left
+    out so optional fields take their defaults. NDJSON has one object per
+    non-empty line. Either format may name the assignee by e-mail in an
+    "assignee_email" field instead of "assigned_to".
+    
+    Args:
+        stream: Text stream positioned at the start of the file
+        import_format: "csv" or "ndjson"
+        
+    Yields:
+        (record number starting at 1, fields or None, parse error or None)
+    """
+    if import_format == "csv":
+        for number, row in enumerate(csv.DictReader(stream), 1):
+            yield number, {k: v for k, v in row.items() if k is not None and v not in ("", None)}, None
+        return
+    
+    number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            fields = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if isinstance(fields, dict):
+            yield number, fields, None
+        else:
+            yield number, None, "Expected a JSON object"
+
+
+class ImportProgress:
+    """Counters of one import run, including batches from earlier runs."""
+    __slots__ = ("records", "inserted", "rejected", "started")
+    
+    def __init__(self, records: int = 0, inserted: int = 0, rejected: int = 0):
+        self.records = records
+        self.inserted = inserted
+        self.rejected = rejected
+        self.started = time.perf_counter()
+    
+    def as_dict(self) -> Dict[str, int]:
+        return {"records": self.records, "inserted": self.inserted, "rejected": self.rejected}
+
+
+class ImportCheckpoint:
+    """
+    Resume state of one import file, written atomically next to it.
+    
+    Before a batch is committed its end state is saved as "pending" with
+    the batch's created_at timestamp; after the commit it becomes the
+    checkpoint. If the process dies in between, resume() looks for tasks
+    with that timestamp to tell whether the commit happened, so no batch
+    is imported twice or skipped.
+    """
+    
+    def __init__(self, path: str, source: str):
+        self.path = path
+        stat = os.stat(source)
+        self.source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        self.state: Dict[str, Any] = {"records": 0, "inserted": 0, "rejected": 0, "rejects_bytes": 0, "pending": None}
+    
+    def load(self) -> bool:
+        """Load saved state; False if there is none. Raises ValueError if the file changed."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("source") != self.source:
+            raise ValueError(f"{self.path} belongs to a different version of the import file")
+        self.state = saved["state"]
+        return True
+    
+    def save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"source": self.source, "state": self.state}, f)
+        os.replace(tmp_path, self.path)
+    
+    def begin(self, progress: ImportProgress, rejects_bytes: int, created_at: datetime) -> None:
+        self.state["pending"] = {
+            **progress.as_dict(),
+            "rejects_bytes": rejects_bytes,
+            "created_at": created_at.isoformat()
+        }
+        self.save()
+    
+    def commit(self) -> None:
+        pending = self.state.pop("pending")
+        pending.pop("created_at")
+        self.state = {**pending, "pending": None}
+        self.save()
+    
+    def rollback(self) -> None:
+        self.state["pending"] = None
+        self.save()
+
+
+class TaskImporter:
+    """
+    Bulk task import for one organization.
+    
+    Records are validated against TaskCreate a batch at a time; board and
+    assignee references are checked with one query per batch for the IDs
+    and e-mails not seen before. Valid rows are inserted with COPY on
+    PostgreSQL and a single executemany INSERT elsewhere, one transaction
+    per batch. Invalid records are appended to the reject file as
+    {"record", "errors", "data"} lines and do not stop the import.
+    
+    Caches are invalidated once at the end (boards get a realtime resync)
+    rather than per row.
+    """
+    
+    def __init__(self, db: Session, organization_id: int, user_id: int, batch_size: Optional[int] = None):
+        self.db = db
+        self.organization_id = organization_id
+        self.user_id = user_id
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.inserter = BulkInserter(Task.__table__, ROW_COLUMNS, BATCH_COLUMNS, db.get_bind().dialect)
+        self._boards: Dict[int, bool] = {}
+        self._members: Dict[int, bool] = {}
+        self._emails: Dict[str, Optional[int]] = {}
+        self._touched_boards: Set[int] = set()
+        self._last_created_at: Optional[datetime] = None
+    
+    def run(
+        self,
+        records: Iterable[Record],
+        rejects_path: str,
+        checkpoint: Optional[ImportCheckpoint] = None,
+        on_progress: Optional[Callable[[ImportProgress], None]] = None
+    ) -> ImportProgress:
+        """
+        Import records, resuming after the checkpoint if one is given.
+        
+        Args:
+            records: Output of read_records()
+            rejects_path: NDJSON file receiving rejected records
+            checkpoint: Resume state; saved after every batch
+            on_progress: Called after every committed batch
+            
+        Returns:
+            Final counters
+        """
+        if checkpoint is not None:
+            self._resume(checkpoint)
+            state = checkpoint.state
+            progress = ImportProgress(state["records"], state["inserted"], state["rejected"])
+            rejects_bytes = state["rejects_bytes"]
+        else:
+            progress = ImportProgress()
+            rejects_bytes = 0
+        
+        mode = "r+" if rejects_bytes and os.path.exists(rejects_path) else "w"
+        try:
+            with open(rejects_path, mode, encoding="utf-8") as rejects:
+                rejects.truncate(rejects_bytes)
+                rejects.seek(rejects_bytes)
+                for batch in self._batches(records, progress.records):
+                    self._import_batch(batch, progress, rejects, checkpoint)
+                    if on_progress is not None:
+                        on_progress(progress)
+        finally:
+            self._invalidate()
+        return progress
+    
+    def _batches(self, records: Iterable[Record], skip: int) -> Iterator[List[Record]]:
+        batch: List[Record] = []
+        for record in records:
+            if record[0] <= skip:
+                continue
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _resume(self, checkpoint: ImportCheckpoint) -> None:
+        pending = checkpoint.state["pending"]
+        if pending is None:
+            return
+        committed = self.db.execute(
+            select(Task.id).where(
+                Task.organization_id == self.organization_id,
+                Task.created_by == self.user_id,
+                Task.created_at == datetime.fromisoformat(pending["created_at"])
+            ).limit(1)
+        ).first()
+        self.db.rollback()
+        if committed is not None:
+            checkpoint.commit()
+        else:
+            checkpoint.rollback()
+    
+    def _import_batch(
+        self,
+        batch: List[Record],
+        progress: ImportProgress,
+        rejects: TextIO,
+        checkpoint: Optional[ImportCheckpoint]
+    ) -> None:
+        created_at = self._batch_timestamp()
+        rows, rejected = self._prepare(batch)
+        for number, errors, data in rejected:
+            rejects.write(json.dumps({"record": number, "errors": errors, "data": data}, default=str) + "\n")
+        rejects.flush()
+        
+        progress.records = batch[-1][0]
+        progress.inserted += len(rows)
+        progress.rejected += len(rejected)
+        if checkpoint is not None:
+            checkpoint.begin(progress, rejects.tell(), created_at)
+        try:
+            if rows:
+                self.inserter.insert(self.db.connection(), rows, (self.organization_id, self.user_id, created_at, created_at))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            if checkpoint is not None:
+                checkpoint.rollback()
+            raise
+        if checkpoint is not None:
+            checkpoint.commit()
+    
+    def _batch_timestamp(self) -> datetime:
+        """created_at of a batch; unique per batch so resume can find it."""
+        now = datetime.utcnow()
+        if self._last_created_at is not None and now <= self._last_created_at:
+            now = self._last_created_at + timedelta(microseconds=1)
+        self._last_created_at = now
+        return now
+    
+    def _prepare(self, batch: List[Record]) -> Tuple[List[Tuple], List[Tuple]]:
+        """Validate a batch: (ROW_COLUMNS values, [(record number, errors, data)])."""
+        rejected = []
+        candidates = []
+        for number, fields, error in batch:
+            if error is not None:
+                rejected.append((number, [{"field": None, "message": error}], None))
+            else:
+                candidates.append((number, fields))
+        
+        # TaskCreate ignores unknown keys such as assignee_email.
+        payloads = [fields for _, fields in candidates]
+        try:
+            tasks = _batch_adapter.validate_python(payloads)
+        except ValidationError as e:
+            invalid: Dict[int, List[Dict[str, Any]]] = {}
+            for err in e.errors(include_url=False):
+                invalid.setdefault(err["loc"][0], []).append({
+                    "field": ".".join(str(part) for part in err["loc"][1:]) or None,
+                    "message": err["msg"]
+                })
+            for index in sorted(invalid):
+                rejected.append((candidates[index][0], invalid[index], candidates[index][1]))
+            candidates = [c for i, c in enumerate(candidates) if i not in invalid]
+            tasks = _batch_adapter.validate_python([p for i, p in enumerate(payloads) if i not in invalid])
+        
+        self._resolve(tasks, candidates)
+        rows = []
+        for (number, fields), task in zip(candidates, tasks):
+            errors = []
+            if not self._boards[task.board_id]:
+                errors.append({"field": "board_id", "message": "Board not found"})
+            assigned_to = task.assigned_to
+            email = fields.get("assignee_email")
+            if assigned_to is None and email:
+                assigned_to = self._emails[str(email).lower()]
+                if assigned_to is None:
+                    errors.append({"field": "assignee_email", "message": "No active member with this e-mail"})
+            elif assigned_to is not None and not self._members[assigned_to]:
+                errors.append({"field": "assigned_to", "message": "Not an active member of the organization"})
+            if errors:
+                rejected.append((number, errors, fields))
+                continue
+            self._touched_boards.add(task.board_id)
+            rows.append((
+                task.board_id, task.title, task.description, task.status, task.priority,
+                assigned_to, task.due_date, task.position
+            ))
+        rejected.sort(key=lambda item: item[0])
+        return rows, rejected
+    
+    def _resolve(self, tasks: List[TaskCreate], candidates: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Look up boards, members and e-mails not resolved by earlier batches."""
+        board_ids = {task.board_id for task in tasks} - self._boards.keys()
+        if board_ids:
+            found = set(self.db.scalars(select(Board.id).where(
+                Board.id.in_(board_ids),
+                Board.organization_id == self.organization_id
+            )))
+            self._boards.update((board_id, board_id in found) for board_id in board_ids)
+        
+        user_ids = {task.assigned_to for task in tasks if task.assigned_to is not None} - self._members.keys()
+        if user_ids:
+            found = set(self.db.scalars(select(UserOrganization.user_id).where(
+                UserOrganization.user_id.in_(user_ids),
+                UserOrganization.organization_id == self.organization_id,
+                UserOrganization.is_active == True
+            )))
+            self._members.update((user_id, user_id in found) for user_id in user_ids)
+        
+        emails = {
+            str(fields["assignee_email"]).lower()
+            for (_, fields), task in zip(candidates, tasks)
+            if task.assigned_to is None and fields.get("assignee_email")
+        } - self._emails.keys()
+        if emails:
+            found = dict(self.db.execute(select(func.lower(User.email), User.id).join(
+                UserOrganization, UserOrganization.user_id == User.id
+            ).where(
+                func.lower(User.email).in_(emails),
+                UserOrganization.organization_id == self.organization_id,
+                UserOrganization.is_active == True
+            )).all())
+            self._emails.update((email, found.get(email)) for email in emails)
+    
+    def _invalidate(self) -> None:
+        if self._touched_boards:
+            invalidation_bus.publish(self.organization_id, "tasks", events=[
+                {"topic": topic_name("board", board_id), "op": "resync"}
+                for board_id in sorted(self._touched_boards)
+            ])
+            self._touched_boards.clear()
+
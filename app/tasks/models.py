@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum as SQLEnum
-from app.database.base import Base, TimestampMixin, TenantMixin
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index, Enum as SQLEnum
+from app.database.base import Base, TimestampMixin, TenantMixin, VersionMixin, tenant_index
 import enum
 
 
@@ -20,7 +20,7 @@ class TaskPriority(str, enum.Enum):
     URGENT = "URGENT"
 
 
-class Task(Base, TimestampMixin, TenantMixin):
+class Task(Base, TimestampMixin, TenantMixin, VersionMixin):
     """
     Task model - represents a task within a board.
     
@@ -30,9 +30,14 @@ class Task(Base, TimestampMixin, TenantMixin):
     - Triple isolation layer for security
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        tenant_index("tasks"),
+        # Board views read a board's tasks in this order
+        Index("ix_tasks_board_id_position_created_at", "board_id", "position", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    board_id = Column(Integer, ForeignKey("boards.id", ondelete="CASCADE"), nullable=False, index=True)
+    board_id = Column(Integer, ForeignKey("boards.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     status = Column(SQLEnum(TaskStatus), default=TaskStatus.TODO, nullable=False, index=True)
@@ -1,21 +1,28 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Request, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.database.session import get_db
 from app.core.dependencies import get_current_user, get_tenant_id
-from app.tasks.schemas import TaskCreate, TaskUpdate, TaskResponse
+from app.tasks.schemas import TaskCreate, TaskUpdate, TaskResponse, TASK_EXPANSIONS
 from app.tasks.service import TaskService
+from app.users.loader import UserLoader
+from app.users.service import UserService
+from app.utils.serialization import json_response, json_list_response
+from app.core.cache import response_cache
+from app.core.tracing import TracedRoute
+from app.utils.etag import make_etag, entity_etag, etag_headers, if_match_versions, is_not_modified, not_modified_response
+from app.utils.fieldsets import FieldSelection, field_selection
 
 
-router = APIRouter(prefix="/tasks", tags=["Tasks"])
+router = APIRouter(prefix="/tasks", tags=["Tasks"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     data: TaskCreate,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Create a new task within a board.
@@ -28,12 +35,15 @@ async def create_task(
 
 @router.get("/board/{board_id}", response_model=List[TaskResponse])
 async def list_tasks_by_board(
+    request: Request,
     board_id: int,
     status: Optional[str] = Query(None),
     assigned_to: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
+    include_description: bool = Query(True),
+    selection: FieldSelection = Depends(field_selection(TaskResponse, TASK_EXPANSIONS)),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     List all tasks for a specific board.
@@ -41,32 +51,85 @@ async def list_tasks_by_board(
     Optional filters:
     - status: Filter by task status
     - assigned_to: Filter by assignee user ID
+    
+    Set include_description=false for card views; the description column
+    is then not selected and comes back as null.
+    
+    fields=title,status returns (and selects) only those fields plus id.
+    expand=assignee,creator embeds the referenced users, loaded with one
+    query for the whole list.
+    
+    Supports If-None-Match; unchanged lists return 304 without being loaded.
     """
-    tasks = TaskService.list_tasks_by_board(db, board_id, tenant_id, status, assigned_to)
-    return tasks
+    def build():
+        etag = make_etag(
+            "tasks", tenant_id, board_id, status, assigned_to, include_description, selection.key(),
+            TaskService.get_board_tasks_version(db, board_id, tenant_id, status, assigned_to),
+            UserService.get_users_version(db, tenant_id) if selection.expand else None
+        )
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        exclude = selection.exclude(*(() if include_description else ("description",)))
+        tasks = TaskService.list_tasks_by_board(db, board_id, tenant_id, status, assigned_to, exclude)
+        if selection.is_default:
+            return json_list_response(TaskResponse, tasks, headers=etag_headers(etag))
+        
+        loader = UserLoader.for_session(db, tenant_id)
+        loader.load_many(selection.related_ids(tasks))
+        return selection.json_list_response(tasks, loader.get, headers=etag_headers(etag))
+    
+    namespace = ("tasks", "users") if selection.expand else "tasks"
+    return await response_cache.serve(request, namespace, tenant_id, current_user.get("role"), build)
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
+    request: Request,
     task_id: int,
-    db: Session = Depends(get_db),
+    selection: FieldSelection = Depends(field_selection(TaskResponse, TASK_EXPANSIONS)),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Get task by ID.
+    
+    Supports fields= and expand= (see list_tasks_by_board) and If-None-Match.
     """
-    task = TaskService.get_task(db, task_id, tenant_id)
-    return task
+    def build():
+        version = TaskService.get_task_version(db, task_id, tenant_id)
+        if selection.is_default:
+            etag = entity_etag(version)
+        else:
+            etag = entity_etag(
+                version, selection.key(),
+                UserService.get_users_version(db, tenant_id) if selection.expand else None
+            )
+        if version is not None and is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        if selection.is_default:
+            task = TaskService.get_task(db, task_id, tenant_id)
+            return json_response(TaskResponse, task, headers=etag_headers(entity_etag(task.version)))
+        
+        task = TaskService.get_task_row(db, task_id, tenant_id, selection.exclude())
+        loader = UserLoader.for_session(db, tenant_id)
+        loader.load_many(selection.related_ids([task]))
+        return selection.json_response(task, loader.get, headers=etag_headers(etag))
+    
+    namespace = ("tasks", "users") if selection.expand else "tasks"
+    return await response_cache.serve(request, namespace, tenant_id, current_user.get("role"), build)
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     data: TaskUpdate,
-    db: Session = Depends(get_db),
+    versions: Optional[Tuple[int, ...]] = Depends(if_match_versions),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Update task.
@@ -74,6 +137,10 @@ async def update_task(
     RBAC Rules:
     - ORG_ADMIN and PROJECT_MANAGER: Can update any task
     - MEMBER: Can only update tasks they created or are assigned to
+    
+    With If-Match (an ETag of the task, or its version in quotes), the
+    update only applies if the task has not changed since; otherwise
+    412 Precondition Failed.
     """
     task = TaskService.update_task(
         db, 
@@ -81,17 +148,18 @@ async def update_task(
         data, 
         tenant_id, 
         user_id=current_user["user_id"],
-        user_role=current_user.get("role")
+        user_role=current_user.get("role"),
+        versions=versions
     )
-    return task
+    return json_response(TaskResponse, task, headers=etag_headers(entity_etag(task.version)))
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     Delete task.
@@ -4,6 +4,10 @@ from typing import Optional
 from app.tasks.models import TaskStatus, TaskPriority
 
 
+# expand= names and the TaskResponse user id field each one resolves.
+TASK_EXPANSIONS = {"assignee": "assigned_to", "creator": "created_by"}
+
+
 class TaskBase(BaseModel):
     """Base schema for task data."""
     title: str = Field(..., min_length=1, max_length=255)
@@ -40,6 +44,7 @@ class TaskResponse(TaskBase):
     created_by: int
     created_at: datetime
     updated_at: datetime
+    version: int
     
     class Config:
         from_attributes = True
@@ -1,11 +1,21 @@
+from sqlalchemy import or_
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.invalidation import invalidation_bus
+from app.core.entity_cache import entity_cache
+from app.core.tracing import traced_service
+from app.realtime.events import change_event, topic_name
 from app.tasks.models import Task
 from app.boards.models import Board
-from app.tasks.schemas import TaskCreate, TaskUpdate
-from typing import List, Optional
+from app.tasks.schemas import TaskCreate, TaskUpdate, TaskResponse
+from app.utils.projection import response_columns
+from app.utils.etag import collection_version
+from app.utils.versioning import versioned_delete, versioned_update
+from typing import Iterable, List, Optional, Tuple, Any
 
 
+@traced_service
 class TaskService:
     """
     Service layer for task operations.
@@ -31,12 +41,7 @@ class TaskService:
         Raises:
             HTTPException: If board not found or belongs to different tenant
         """
-        board = db.query(Board).filter(
-            Board.id == data.board_id,
-            Board.organization_id == organization_id
-        ).first()
-        
-        if not board:
+        if entity_cache.owner_of(db, Board, data.board_id) != organization_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Board not found"
@@ -50,8 +55,15 @@ class TaskService:
         db.add(task)
         db.commit()
         db.refresh(task)
+        invalidation_bus.publish(organization_id, "tasks", events=[
+            change_event(topic_name("board", task.board_id), "task", "created", task.id, TaskService._event_data(task))
+        ])
         return task
     
+    @staticmethod
+    def _event_data(task: Any) -> dict:
+        return TaskResponse.model_validate(task).model_dump(mode="json")
+    
     @staticmethod
     def get_task(db: Session, task_id: int, organization_id: int) -> Task:
         """
@@ -80,28 +92,65 @@ class TaskService:
             )
         return task
     
+    @staticmethod
+    def get_task_row(db: Session, task_id: int, organization_id: int, exclude: Iterable[str] = ()) -> Row:
+        """
+        Get a task as a plain row of TaskResponse columns.
+        
+        Used for sparse fieldsets, where only the requested columns are selected.
+        
+        Args:
+            db: Database session
+            task_id: Task ID
+            organization_id: Current tenant ID
+            exclude: TaskResponse fields to leave out of the SELECT
+            
+        Returns:
+            Task row
+            
+        Raises:
+            HTTPException: If task not found or belongs to different tenant
+        """
+        task = db.query(*response_columns(Task, TaskResponse, exclude)).filter(
+            Task.id == task_id,
+            Task.organization_id == organization_id
+        ).first()
+        
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return task
+    
     @staticmethod
     def list_tasks_by_board(
         db: Session,
         board_id: int,
         organization_id: int,
         status: Optional[str] = None,
-        assigned_to: Optional[int] = None
-    ) -> List[Task]:
+        assigned_to: Optional[int] = None,
+        exclude: Iterable[str] = ()
+    ) -> List[Row]:
         """
         List tasks for a specific board with optional filters.
         
+        Selects only the TaskResponse columns as plain rows (no ORM entities).
+        Card views exclude the description Text column, sparse fieldsets
+        every column they do not need.
+        
         Args:
             db: Database session
             board_id: Board ID
             organization_id: Current tenant ID
             status: Optional status filter
             assigned_to: Optional assignee filter
+            exclude: TaskResponse fields to leave out of the SELECT
             
         Returns:
-            List of tasks
+            List of task rows
         """
-        query = db.query(Task).filter(
+        query = db.query(*response_columns(Task, TaskResponse, exclude)).filter(
             Task.board_id == board_id,
             Task.organization_id == organization_id
         )
@@ -115,7 +164,58 @@ class TaskService:
         return query.order_by(Task.position, Task.created_at).all()
     
     @staticmethod
-    def update_task(db: Session, task_id: int, data: TaskUpdate, organization_id: int, user_id: int = None, user_role: str = None) -> Task:
+    def get_task_version(db: Session, task_id: int, organization_id: int) -> Optional[int]:
+        """
+        Version of a single task, used to build its ETag.
+        
+        Args:
+            db: Database session
+            task_id: Task ID
+            organization_id: Current tenant ID
+            
+        Returns:
+            Task version, or None if not found
+        """
+        return db.query(Task.version).filter(Task.id == task_id, Task.organization_id == organization_id).scalar()
+    
+    @staticmethod
+    def get_board_tasks_version(
+        db: Session,
+        board_id: int,
+        organization_id: int,
+        status: Optional[str] = None,
+        assigned_to: Optional[int] = None
+    ) -> Tuple[Any, ...]:
+        """
+        Change fingerprint for list_tasks_by_board with the same filters.
+        
+        Args:
+            db: Database session
+            board_id: Board ID
+            organization_id: Current tenant ID
+            status: Optional status filter
+            assigned_to: Optional assignee filter
+            
+        Returns:
+            (count, max updated_at, max id) of the matching tasks
+        """
+        criteria = [Task.board_id == board_id, Task.organization_id == organization_id]
+        if status:
+            criteria.append(Task.status == status)
+        if assigned_to:
+            criteria.append(Task.assigned_to == assigned_to)
+        return collection_version(db, Task, *criteria)
+    
+    @staticmethod
+    def update_task(
+        db: Session,
+        task_id: int,
+        data: TaskUpdate,
+        organization_id: int,
+        user_id: int = None,
+        user_role: str = None,
+        versions: Optional[Tuple[int, ...]] = None
+    ) -> Row:
         """
         Update task with tenant isolation and ownership validation.
         
@@ -124,6 +224,11 @@ class TaskService:
         - PROJECT_MANAGER: Can update any task
         - MEMBER: Can only update tasks they created or are assigned to
         
+        Ownership and If-Match are conditions of a single UPDATE ... RETURNING.
+        The task is read first only when it moves to another board (to
+        announce the move on the old board) and again only when the update
+        matched nothing, to pick the error.
+        
         Args:
             db: Database session
             task_id: Task ID
@@ -131,45 +236,80 @@ class TaskService:
             organization_id: Current tenant ID
             user_id: ID of user making the update (for MEMBER validation)
             user_role: Role of user making the update
+            versions: Versions accepted by If-Match, None for any
             
         Returns:
-            Updated task
+            Updated task row (TaskResponse columns)
             
         Raises:
-            HTTPException: If MEMBER tries to update someone else's task
+            HTTPException: If task or new board not found (404), MEMBER tries
+                to update someone else's task (403) or the task's version is
+                not in versions (412)
         """
-        task = TaskService.get_task(db, task_id, organization_id)
+        update_data = data.model_dump(exclude_unset=True)
+        conditions = []
         
         # MEMBER role can only update their own tasks (created by them or assigned to them)
         if user_role == "MEMBER" and user_id:
-            if task.created_by != user_id and task.assigned_to != user_id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Members can only update tasks they created or are assigned to"
-                )
-        
-        update_data = data.model_dump(exclude_unset=True)
+            conditions.append(or_(Task.created_by == user_id, Task.assigned_to == user_id))
         
         # If board_id is being updated, validate the new board belongs to same organization
+        old_board_id = None
         if 'board_id' in update_data and update_data['board_id'] is not None:
-            board = db.query(Board).filter(
-                Board.id == update_data['board_id'],
-                Board.organization_id == organization_id
-            ).first()
-            
-            if not board:
+            if entity_cache.owner_of(db, Board, update_data['board_id']) != organization_id:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Board not found"
                 )
+            old_board_id = db.query(Task.board_id).filter(
+                Task.id == task_id,
+                Task.organization_id == organization_id
+            ).scalar()
+            # A concurrent move makes the update miss and fail with 412
+            conditions.append(Task.board_id == old_board_id)
         
-        for field, value in update_data.items():
-            setattr(task, field, value)
+        task = versioned_update(
+            db, Task, task_id, organization_id, update_data,
+            response_columns(Task, TaskResponse), versions, conditions
+        )
+        if task is None:
+            db.rollback()
+            TaskService._raise_update_error(db, task_id, organization_id, user_id, user_role)
         
         db.commit()
-        db.refresh(task)
+        response = TaskService._event_data(task)
+        if old_board_id is not None and task.board_id != old_board_id:
+            events = [
+                change_event(topic_name("board", old_board_id), "task", "deleted", task_id),
+                change_event(topic_name("board", task.board_id), "task", "created", task_id, response)
+            ]
+        else:
+            changed = {field: response[field] for field in (*update_data, "version", "updated_at")}
+            events = [change_event(topic_name("board", task.board_id), "task", "updated", task_id, changed)]
+        invalidation_bus.publish(organization_id, "tasks", entity=(Task, task_id), db=db, events=events)
         return task
     
+    @staticmethod
+    def _raise_update_error(db: Session, task_id: int, organization_id: int, user_id: int, user_role: str) -> None:
+        task = db.query(Task.created_by, Task.assigned_to).filter(
+            Task.id == task_id,
+            Task.organization_id == organization_id
+        ).first()
+        if task is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        if user_role == "MEMBER" and user_id and user_id not in (task.created_by, task.assigned_to):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Members can only update tasks they created or are assigned to"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Task was modified by another request"
+        )
+    
     @staticmethod
     def delete_task(db: Session, task_id: int, organization_id: int, user_id: int = None, user_role: str = None) -> None:
         """
@@ -188,16 +328,28 @@ class TaskService:
             user_role: Role of user making the deletion
             
         Raises:
-            HTTPException: If MEMBER tries to delete any task
+            HTTPException: If task not found or MEMBER tries to delete any task
         """
-        task = TaskService.get_task(db, task_id, organization_id)
-        
         # MEMBER role is NOT allowed to delete any tasks
         if user_role == "MEMBER":
+            TaskService.get_task(db, task_id, organization_id)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Members are not allowed to delete tasks"
             )
         
-        db.delete(task)
+        # One DELETE ... RETURNING, so a concurrent update cannot make the
+        # ORM's version check fail; the delete simply wins.
+        task = versioned_delete(db, Task, task_id, organization_id, (Task.board_id,))
+        if task is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        board_id = task.board_id
         db.commit()
+        invalidation_bus.publish(
+            organization_id, "tasks", "comments", entity=(Task, task_id), db=db,
+            events=[change_event(topic_name("board", board_id), "task", "deleted", task_id)]
+        )
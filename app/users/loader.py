@@ -0,0 +1,67 @@
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy.orm import Session
+from app.users.models import User, UserOrganization
+from app.users.schemas import UserSummary
+from app.utils.projection import response_columns
+
+
+class UserLoader:
+    """
+    Batched, per-request user lookups for expand= (DataLoader style).
+    
+    load_many() fetches every id not seen yet in one query; get() only
+    reads what was loaded. Only users who are or were members of the
+    tenant are returned, so ids from other tenants resolve to None.
+    One loader is kept per session and tenant, so all expansions of a
+    request (including /batch sub-requests) share it.
+    """
+    
+    def __init__(self, db: Session, organization_id: int):
+        self.db = db
+        self.organization_id = organization_id
+        self._users: Dict[int, Optional[Dict[str, Any]]] = {}
+    
+    @classmethod
+    def for_session(cls, db: Session, organization_id: int) -> "UserLoader":
+        """
+        Loader bound to the session's lifetime.
+        
+        Args:
+            db: Database session of the current request
+            organization_id: Current tenant ID
+            
+        Returns:
+            The session's loader for the tenant
+        """
+        key = ("user_loader", organization_id)
+        loader = db.info.get(key)
+        if loader is None:
+            loader = db.info[key] = cls(db, organization_id)
+        return loader
+    
+    def load_many(self, user_ids: Iterable[int]) -> None:
+        """
+        Load all given users not loaded yet with a single query.
+        
+        Args:
+            user_ids: User IDs referenced by the response
+        """
+        missing = {user_id for user_id in user_ids if user_id not in self._users}
+        if not missing:
+            return
+        
+        rows = self.db.query(*response_columns(User, UserSummary)).join(
+            UserOrganization, User.id == UserOrganization.user_id
+        ).filter(
+            UserOrganization.organization_id == self.organization_id,
+            User.id.in_(missing)
+        ).distinct().all()
+        
+        for row in rows:
+            self._users[row.id] = dict(row._mapping)
+        for user_id in missing:
+            self._users.setdefault(user_id, None)
+    
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Summary of a loaded user, or None if unknown to the tenant."""
+        return self._users.get(user_id)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database.base import Base, TimestampMixin
 
@@ -31,9 +31,14 @@ class UserOrganization(Base, TimestampMixin):
     - A user can be ADMIN in one org and MEMBER in another
     """
     __tablename__ = "user_organizations"
+    __table_args__ = (
+        Index("ix_user_organizations_user_id_organization_id", "user_id", "organization_id"),
+        # Member lists are paged in user id order
+        Index("ix_user_organizations_organization_id_user_id", "organization_id", "user_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.database.session import get_db
@@ -6,28 +6,44 @@ from app.core.dependencies import get_current_user, get_tenant_id
 from app.users.schemas import UserResponse
 from app.users.service import UserService
 from app.utils.pagination import PaginatedResponse, PaginationParams
+from app.utils.serialization import paginated_json_response
+from app.core.cache import response_cache
+from app.core.tracing import TracedRoute
+from app.utils.etag import make_etag, etag_headers, is_not_modified, not_modified_response
 
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=TracedRoute)
 
 
 @router.get("/", response_model=PaginatedResponse[UserResponse])
 async def list_users(
+    request: Request,
     page: int = 1,
     page_size: int = 100,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    tenant_id: int = Depends(get_tenant_id)
+    tenant_id: int = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
 ):
     """
     List all users in the current organization.
+    
+    Supports If-None-Match; unchanged pages return 304 without being loaded.
     """
-    pagination = PaginationParams(page=page, page_size=page_size)
-    users, total = UserService.list_users_by_organization(db, tenant_id, pagination.skip, pagination.limit)
+    def build():
+        etag = make_etag("users", tenant_id, page, page_size, UserService.get_users_version(db, tenant_id))
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        pagination = PaginationParams(page=page, page_size=page_size)
+        users, total = UserService.list_users_by_organization(db, tenant_id, pagination.skip, pagination.limit)
+        
+        return paginated_json_response(
+            UserResponse,
+            users,
+            total=total,
+            page=page,
+            page_size=page_size,
+            headers=etag_headers(etag)
+        )
     
-    return PaginatedResponse.create(
-        items=users,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    return await response_cache.serve(request, "users", tenant_id, current_user.get("role"), build)
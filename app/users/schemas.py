@@ -33,6 +33,17 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class UserSummary(BaseModel):
+    """Schema for a user embedded in another resource (expand=)."""
+    id: int
+    email: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
 class UserOrganizationResponse(BaseModel):
     """Schema for user-organization relationship."""
     id: int
@@ -1,17 +1,23 @@
+from sqlalchemy import func
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.users.models import User, UserOrganization
-from typing import List, Tuple
+from app.users.schemas import UserResponse
+from app.utils.projection import response_columns
+from typing import List, Tuple, Any
+from app.core.tracing import traced_service
 
 
+@traced_service
 class UserService:
     """
     Service layer for user operations.
     """
     
     @staticmethod
-    def list_users_by_organization(db: Session, organization_id: int, skip: int = 0, limit: int = 100) -> Tuple[List[User], int]:
+    def list_users_by_organization(db: Session, organization_id: int, skip: int = 0, limit: int = 100) -> Tuple[List[Row], int]:
         """
-        List all users in a specific organization.
+        List all users in a specific organization, in user id order.
         
         Args:
             db: Database session
@@ -20,9 +26,9 @@ class UserService:
             limit: Maximum number of records to return
             
         Returns:
-            Tuple of (users list, total count)
+            Tuple of (user rows with UserResponse columns only, total count)
         """
-        query = db.query(User).join(
+        query = db.query(*response_columns(User, UserResponse)).join(
             UserOrganization, User.id == UserOrganization.user_id
         ).filter(
             UserOrganization.organization_id == organization_id,
@@ -31,5 +37,32 @@ class UserService:
         )
         
         total = query.count()
-        users = query.offset(skip).limit(limit).all()
+        users = query.order_by(UserOrganization.user_id).offset(skip).limit(limit).all()
         return users, total
+    
+    @staticmethod
+    def get_users_version(db: Session, organization_id: int) -> Tuple[Any, ...]:
+        """
+        Change fingerprint for list_users_by_organization.
+        
+        Covers both membership changes and edits to the user rows.
+        
+        Args:
+            db: Database session
+            organization_id: Organization ID
+            
+        Returns:
+            (count, max membership updated_at, max user updated_at, max membership id)
+        """
+        return tuple(db.query(
+            func.count(UserOrganization.id),
+            func.max(UserOrganization.updated_at),
+            func.max(User.updated_at),
+            func.max(UserOrganization.id)
+        ).join(
+            User, User.id == UserOrganization.user_id
+        ).filter(
+            UserOrganization.organization_id == organization_id,
+            UserOrganization.is_active == True,
+            User.is_active == True
+        ).one())
@@ -0,0 +1,159 @@
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.utils.serialization import JSON, current_format
+
+
+def collection_version(db: Session, model: type, *criteria) -> Tuple[Any, ...]:
+    """
+    Cheap change fingerprint for the rows matching criteria.
+    
+    (row count, max updated_at, max id) changes on insert, update and delete
+    without reading or serializing the rows themselves.
+    
+    Args:
+        db: Database session
+        model: Model with id and updated_at columns
+        criteria: Filter expressions (must include the tenant filter)
+        
+    Returns:
+        Fingerprint tuple
+    """
+    return tuple(db.query(
+        func.count(model.id),
+        func.max(model.updated_at),
+        func.max(model.id)
+    ).filter(*criteria).one())
+
+
+def row_version(db: Session, model: type, *criteria) -> Optional[Any]:
+    """
+    updated_at of a single row, or None if it does not exist.
+    
+    Args:
+        db: Database session
+        model: Model with an updated_at column
+        criteria: Filter expressions identifying the row (including tenant)
+        
+    Returns:
+        updated_at value or None
+    """
+    row = db.query(model.updated_at).filter(*criteria).first()
+    return row[0] if row else None
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the tenant, request parameters and a version fingerprint.
+    
+    Non-JSON wire formats are part of the tag, so a representation is
+    never revalidated against another format's ETag.
+    
+    Returns:
+        Quoted weak entity tag
+    """
+    wire_format = current_format.get()
+    if wire_format != JSON:
+        parts += (wire_format,)
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def entity_etag(version: int, *parts: Any) -> str:
+    """
+    Build a strong ETag for a single versioned row.
+    
+    The tag starts with the row's version so If-Match can be checked with
+    a conditional UPDATE instead of a read: "<version>" for the default
+    JSON representation, "<version>-<digest>" when parts (field selection,
+    related versions) or a non-JSON wire format change the bytes.
+    
+    Args:
+        version: Row version (see VersionMixin)
+        parts: Anything else the representation depends on
+        
+    Returns:
+        Quoted strong entity tag
+    """
+    wire_format = current_format.get()
+    if wire_format != JSON:
+        parts += (wire_format,)
+    if not parts:
+        return f'"{version}"'
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def if_match_versions(request: Request) -> Optional[Tuple[int, ...]]:
+    """
+    Dependency parsing If-Match into the row versions it accepts.
+    
+    Only the version prefix of an entity_etag is compared: any
+    representation of the row at that version satisfies the precondition.
+    Weak tags are accepted too, because CompressionMiddleware weakens the
+    ETag of every compressed response; the version still identifies the
+    row state exactly, which is all a lost-update check needs.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Accepted versions, or None when the header is absent or "*"
+        
+    Raises:
+        HTTPException: 412 if no tag in the header can match
+    """
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return None
+    versions = []
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if len(candidate) < 2 or candidate[0] != '"' or candidate[-1] != '"':
+            continue
+        version = candidate[1:-1].split("-", 1)[0]
+        if version.isdigit():
+            versions.append(int(version))
+    if not versions:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Precondition failed")
+    return tuple(versions)
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """Headers for a response carrying an ETag; clients must revalidate before reuse."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check If-None-Match against an ETag using weak comparison.
+    
+    Args:
+        request: Incoming request
+        etag: Current entity tag
+        
+    Returns:
+        True if the client's cached representation is still current
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+def not_modified_response(etag: str) -> Response:
+    """Empty 304 response for a matching If-None-Match."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
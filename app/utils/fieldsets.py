@@ -0,0 +1,180 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from app.core.metrics import timed
+from app.utils.serialization import PreEncodedJSONResponse, encode_payload, list_payload, negotiated_response
+
+
+def _split(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+class FieldSelection:
+    """
+    Parsed fields= and expand= parameters for one response schema.
+    
+    fields trims the response to the listed schema fields (id is always
+    included) and, through exclude(), the SELECT to the columns they need.
+    expand embeds related objects, named in expansions and keyed by a
+    foreign key field; their ids are collected from all rows so the caller
+    can load them with one batched query (see app.users.loader).
+    
+    With neither parameter set, is_default is True and routes keep their
+    normal schema-validated serialization.
+    """
+    __slots__ = ("schema", "expansions", "fields", "expand")
+    
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        expansions: Dict[str, str],
+        fields: Optional[Tuple[str, ...]] = None,
+        expand: Tuple[str, ...] = ()
+    ):
+        self.schema = schema
+        self.expansions = expansions
+        self.fields = fields
+        self.expand = expand
+    
+    @classmethod
+    def parse(
+        cls,
+        schema: Type[BaseModel],
+        expansions: Dict[str, str],
+        fields: Optional[str],
+        expand: Optional[str]
+    ) -> "FieldSelection":
+        """
+        Validate the raw query parameters.
+        
+        Raises:
+            HTTPException: If a field or expansion is unknown
+        """
+        names = set(_split(fields))
+        unknown = names - set(schema.model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        
+        expand_names = set(_split(expand))
+        unknown = expand_names - set(expansions)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown expansions: {', '.join(sorted(unknown))}"
+            )
+        
+        selected = None
+        if names:
+            names.add("id")
+            selected = tuple(name for name in schema.model_fields if name in names)
+        return cls(schema, expansions, selected, tuple(name for name in expansions if name in expand_names))
+    
+    @property
+    def is_default(self) -> bool:
+        return self.fields is None and not self.expand
+    
+    def key(self) -> Tuple[Any, ...]:
+        """Part of the ETag identifying this representation."""
+        return (self.fields, self.expand)
+    
+    def exclude(self, *extra: str) -> Tuple[str, ...]:
+        """
+        Schema fields to leave out of the SELECT (see response_columns).
+        
+        Args:
+            extra: Fields the route excludes anyway
+            
+        Returns:
+            Field names not needed for the output or the expansions
+        """
+        excluded = set(extra)
+        if self.fields is not None:
+            needed = set(self.fields)
+            needed.update(self.expansions[name] for name in self.expand)
+            excluded.update(name for name in self.schema.model_fields if name not in needed)
+        return tuple(sorted(excluded))
+    
+    def related_ids(self, rows: Iterable[Any]) -> Set[int]:
+        """Foreign key values referenced by the requested expansions."""
+        keys = [self.expansions[name] for name in self.expand]
+        return {
+            value
+            for row in rows
+            for value in (getattr(row, key) for key in keys)
+            if value is not None
+        }
+    
+    def render(self, row: Any, lookup: Callable[[int], Any]) -> Dict[str, Any]:
+        """
+        Output dict for one row from a column projection.
+        
+        Fields that were not selected (e.g. an excluded description) are
+        null, as in the full representation.
+        
+        Args:
+            row: Row with the columns from exclude()
+            lookup: Returns the related object for a foreign key value
+            
+        Returns:
+            Selected fields plus one entry per expansion
+        """
+        mapping = row._mapping
+        item = {name: mapping.get(name) for name in (self.fields or self.schema.model_fields)}
+        for name in self.expand:
+            value = mapping[self.expansions[name]]
+            item[name] = lookup(value) if value is not None else None
+        return item
+    
+    def json_response(
+        self,
+        row: Any,
+        lookup: Callable[[int], Any],
+        headers: Optional[Dict[str, str]] = None
+    ) -> PreEncodedJSONResponse:
+        """Encode a single rendered row in the negotiated format."""
+        with timed("serialize"):
+            body = encode_payload(self.render(row, lookup))
+        return negotiated_response(body, headers=headers)
+    
+    def json_list_response(
+        self,
+        rows: Iterable[Any],
+        lookup: Callable[[int], Any],
+        headers: Optional[Dict[str, str]] = None
+    ) -> PreEncodedJSONResponse:
+        """Encode a list of rendered rows in the negotiated format."""
+        names = (self.fields or tuple(self.schema.model_fields)) + self.expand
+        with timed("serialize"):
+            body = encode_payload(list_payload([self.render(row, lookup) for row in rows], names))
+        return negotiated_response(body, headers=headers)
+
+
+def field_selection(schema: Type[BaseModel], expansions: Optional[Dict[str, str]] = None) -> Callable[..., FieldSelection]:
+    """
+    Dependency factory for the fields= and expand= query parameters.
+    
+    Usage:
+        selection: FieldSelection = Depends(field_selection(TaskResponse, TASK_EXPANSIONS))
+        
+    Args:
+        schema: Response schema the fields refer to
+        expansions: Expansion name -> foreign key field, e.g. {"assignee": "assigned_to"}
+        
+    Returns:
+        Dependency returning a FieldSelection
+    """
+    expansions = expansions or {}
+    expand_help = ", ".join(expansions) or "none"
+    
+    def dependency(
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return; id is always included"),
+        expand: Optional[str] = Query(None, description=f"Comma-separated related objects to embed: {expand_help}")
+    ) -> FieldSelection:
+        return FieldSelection.parse(schema, expansions, fields, expand)
+    
+    return dependency
@@ -6,6 +6,11 @@ from math import ceil
 T = TypeVar('T')
 
 
+def compute_total_pages(total: int, page_size: int) -> int:
+    """Number of pages needed to hold total items."""
+    return ceil(total / page_size) if page_size > 0 else 0
+
+
 class PaginationParams(BaseModel):
     """
     Standard pagination parameters for list endpoints.
@@ -56,7 +61,7 @@ class PaginatedResponse(BaseModel, Generic[T]):
         Returns:
             PaginatedResponse instance
         """
-        total_pages = ceil(total / page_size) if page_size > 0 else 0
+        total_pages = compute_total_pages(total, page_size)
         
         return cls(
             items=items,
@@ -0,0 +1,32 @@
+from functools import lru_cache
+from typing import Iterable, Tuple, Type
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def _response_columns(model: type, schema: Type[BaseModel], exclude: Tuple[str, ...]) -> tuple:
+    return tuple(
+        getattr(model, name)
+        for name in schema.model_fields
+        if name not in exclude and hasattr(model, name)
+    )
+
+
+def response_columns(model: type, schema: Type[BaseModel], exclude: Iterable[str] = ()) -> tuple:
+    """
+    Model columns needed to build a response schema.
+    
+    Selecting these instead of the entity returns plain rows: no identity map
+    entries, no ORM hydration, and only the columns the response uses.
+    Rows support attribute access, so they validate with from_attributes.
+    Excluded fields fall back to the schema default (None for optional text).
+    
+    Args:
+        model: SQLAlchemy model class
+        schema: Response schema
+        exclude: Field names to leave out of the SELECT
+        
+    Returns:
+        Tuple of column attributes in schema field order
+    """
+    return _response_columns(model, schema, tuple(sorted(exclude)))
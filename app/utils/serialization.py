@@ -0,0 +1,296 @@
+import enum
+from contextvars import ContextVar
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy.engine import Row
+from app.core.metrics import timed
+from app.utils.pagination import compute_total_pages
+
+try:
+    import msgpack
+except ImportError:  # optional; JSON is always available
+    msgpack = None
+
+
+# Wire formats, negotiated from the Accept header (see negotiate_format).
+JSON = "json"
+MSGPACK = "msgpack"
+MSGPACK_COLUMNAR = "msgpack-columnar"
+
+MEDIA_TYPES = {
+    JSON: "application/json",
+    MSGPACK: "application/msgpack",
+    MSGPACK_COLUMNAR: "application/msgpack; layout=columnar",
+}
+
+MSGPACK_MEDIA_RANGES = ("application/msgpack", "application/x-msgpack")
+
+current_format: ContextVar[str] = ContextVar("current_format", default=JSON)
+
+
+class PreEncodedJSONResponse(Response):
+    """
+    Response whose body is already JSON-encoded bytes.
+    
+    FastAPI returns Response instances untouched, so routes that build one
+    skip response_model validation and jsonable_encoder. The route's
+    response_model is still used for the OpenAPI schema. Bodies in a
+    negotiated MessagePack format pass their media type explicitly.
+    """
+    media_type = "application/json"
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """
+    Pick the wire format for an Accept header.
+    
+    application/msgpack (or application/x-msgpack) selects MessagePack;
+    adding the parameter layout=columnar selects the columnar list layout.
+    The highest q-value wins, earlier entries win ties, and JSON is used
+    for everything else, including when msgpack is not installed.
+    
+    Args:
+        accept: Accept header value
+        
+    Returns:
+        JSON, MSGPACK or MSGPACK_COLUMNAR
+    """
+    if not accept or msgpack is None or "msgpack" not in accept:
+        return JSON
+    
+    best, best_q = JSON, -1.0
+    for media_range in accept.split(","):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        options = dict(param.partition("=")[::2] for param in params)
+        try:
+            q = float(options.get("q", 1))
+        except ValueError:
+            continue
+        media_type = media_type.lower()
+        if media_type in MSGPACK_MEDIA_RANGES:
+            candidate = MSGPACK_COLUMNAR if options.get("layout") == "columnar" else MSGPACK
+        elif media_type in ("application/json", "application/*", "*/*"):
+            candidate = JSON
+        else:
+            continue
+        if q > best_q:
+            best, best_q = candidate, q
+    return best if best_q > 0 else JSON
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def encode_payload(payload: Any) -> bytes:
+    """
+    Encode plain Python data in the negotiated format.
+    
+    Datetimes become ISO 8601 strings and enums their values in both
+    formats, so MessagePack bodies decode to the same data as JSON.
+    """
+    if current_format.get() == JSON:
+        return to_json(payload)
+    return msgpack.packb(payload, default=_msgpack_default)
+
+
+def list_payload(items: List[Dict[str, Any]], names: Sequence[str]) -> Any:
+    """
+    Lay out a list of objects for the negotiated format.
+    
+    The columnar layout is one array per field, {"id": [...], "title": [...]},
+    which repeats no keys and packs homogeneous arrays for large lists.
+    
+    Args:
+        items: Objects with the given keys
+        names: Field names in output order
+        
+    Returns:
+        items unchanged, or the columnar mapping
+    """
+    if current_format.get() != MSGPACK_COLUMNAR:
+        return items
+    return {name: [item.get(name) for item in items] for name in names}
+
+
+def negotiated_response(
+    body: bytes,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None
+) -> PreEncodedJSONResponse:
+    """Response for a body encoded with encode_payload(); varies on Accept."""
+    headers = {**(headers or {}), "Vary": "Accept"}
+    return PreEncodedJSONResponse(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type=MEDIA_TYPES[current_format.get()]
+    )
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def to_models(schema: Type[BaseModel], rows: Iterable[Any]) -> List[BaseModel]:
+    """
+    Build response models from ORM objects or rows in a single pass.
+    
+    Rows from a column projection (see app.utils.projection) already carry
+    the schema's column types, so they are constructed without re-validation.
+    ORM instances are validated with from_attributes.
+    
+    Args:
+        schema: Response schema with from_attributes enabled
+        rows: ORM instances or Row objects
+        
+    Returns:
+        List of response models
+    """
+    rows = list(rows)
+    if rows and isinstance(rows[0], Row):
+        return [schema.model_construct(**row._mapping) for row in rows]
+    return _list_adapter(schema).validate_python(rows, from_attributes=True)
+
+
+def _row_columns(schema: Type[BaseModel], rows: List[Row]) -> Dict[str, List[Any]]:
+    """
+    Columns of projected rows as JSON-compatible lists, in schema field order.
+    
+    Conversion is decided once per column instead of per value; fields
+    left out of the projection get the schema default, as in to_models().
+    """
+    by_name = dict(zip(rows[0]._fields, (list(column) for column in zip(*rows))))
+    columns = {}
+    for name, field in schema.model_fields.items():
+        column = by_name.get(name)
+        if column is None:
+            column = [field.get_default(call_default_factory=True)] * len(rows)
+        else:
+            sample = next((value for value in column if value is not None), None)
+            if isinstance(sample, (datetime, date, time)):
+                column = [None if value is None else value.isoformat() for value in column]
+            elif isinstance(sample, enum.Enum):
+                column = [None if value is None else value.value for value in column]
+        columns[name] = column
+    return columns
+
+
+def _msgpack_items(schema: Type[BaseModel], rows: Iterable[Any]) -> Any:
+    """
+    List items as JSON-compatible Python data in the negotiated MessagePack layout.
+    
+    Projected rows are converted column by column without building models;
+    ORM instances go through the schema like the JSON path.
+    """
+    rows = list(rows)
+    if rows and isinstance(rows[0], Row):
+        columns = _row_columns(schema, rows)
+        if current_format.get() == MSGPACK_COLUMNAR:
+            return columns
+        names = tuple(columns)
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
+    items = _list_adapter(schema).dump_python(to_models(schema, rows), mode="json")
+    return list_payload(items, tuple(schema.model_fields))
+
+
+def json_response(
+    schema: Type[BaseModel],
+    obj: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None
+) -> PreEncodedJSONResponse:
+    """
+    Serialize a single object through its response schema.
+    
+    Encoded as JSON unless the client negotiated MessagePack.
+    
+    Args:
+        schema: Response schema
+        obj: ORM instance or row
+        status_code: HTTP status code
+        headers: Optional extra response headers
+        
+    Returns:
+        Response with pre-encoded body
+    """
+    with timed("serialize"):
+        model = schema.model_validate(obj, from_attributes=True)
+        if current_format.get() == JSON:
+            body = schema.__pydantic_serializer__.to_json(model)
+        else:
+            body = encode_payload(schema.__pydantic_serializer__.to_python(model, mode="json"))
+    return negotiated_response(body, status_code=status_code, headers=headers)
+
+
+def json_list_response(
+    schema: Type[BaseModel],
+    rows: Iterable[Any],
+    headers: Optional[Dict[str, str]] = None
+) -> PreEncodedJSONResponse:
+    """
+    Serialize a list of objects through their response schema.
+    
+    Encoded as a JSON array unless the client negotiated MessagePack
+    (row or columnar layout).
+    
+    Args:
+        schema: Response schema for each item
+        rows: ORM instances or rows
+        headers: Optional extra response headers
+        
+    Returns:
+        Response with pre-encoded array body
+    """
+    with timed("serialize"):
+        if current_format.get() == JSON:
+            body = _list_adapter(schema).dump_json(to_models(schema, rows))
+        else:
+            body = encode_payload(_msgpack_items(schema, rows))
+    return negotiated_response(body, headers=headers)
+
+
+def paginated_json_response(
+    schema: Type[BaseModel],
+    rows: Iterable[Any],
+    total: int,
+    page: int,
+    page_size: int,
+    headers: Optional[Dict[str, str]] = None
+) -> PreEncodedJSONResponse:
+    """
+    Serialize a page of objects in the PaginatedResponse envelope.
+    
+    Items are validated once; the envelope is encoded directly instead of
+    being validated as PaginatedResponse[schema] a second time. With
+    MessagePack, only "items" changes layout in the columnar variant.
+    
+    Args:
+        schema: Response schema for each item
+        rows: ORM instances or rows for the current page
+        total: Total number of items across all pages
+        page: Current page number
+        page_size: Number of items per page
+        headers: Optional extra response headers
+        
+    Returns:
+        Response with pre-encoded body
+    """
+    with timed("serialize"):
+        body = encode_payload({
+            "items": to_models(schema, rows) if current_format.get() == JSON else _msgpack_items(schema, rows),
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": compute_total_pages(total, page_size)
+        })
+    return negotiated_response(body, headers=headers)
@@ -0,0 +1,96 @@
+from typing import Any, Dict, Iterable, Optional, Sequence
+from sqlalchemy import delete, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+
+def versioned_update(
+    db: Session,
+    model: type,
+    row_id: int,
+    organization_id: int,
+    values: Dict[str, Any],
+    columns: Sequence[Any],
+    versions: Optional[Iterable[int]] = None,
+    conditions: Iterable[Any] = ()
+) -> Optional[Row]:
+    """
+    Update one versioned row in a single statement and return it.
+    
+    Runs UPDATE ... SET version = version + 1 WHERE id AND tenant
+    [AND version IN versions] [AND conditions] RETURNING columns, so the
+    precondition, the permission check and the write are one atomic
+    statement with no read beforehand. Dialects without UPDATE RETURNING
+    read the row back after the update.
+    
+    Nothing is committed; a None result means no row matched and the
+    caller decides between 404, 403 and 412.
+    
+    Args:
+        db: Database session
+        model: Model with VersionMixin and TenantMixin
+        row_id: Primary key of the row
+        organization_id: Current tenant ID
+        values: Column values to set
+        columns: Columns to return (see response_columns)
+        versions: Accepted current versions (from If-Match), None for any
+        conditions: Extra filter expressions the row must satisfy
+        
+    Returns:
+        Updated row, or None if no row matched
+    """
+    statement = update(model).where(model.id == row_id, model.organization_id == organization_id, *conditions)
+    if versions is not None:
+        statement = statement.where(model.version.in_(tuple(versions)))
+    statement = statement.values(**values, version=model.version + 1).execution_options(synchronize_session=False)
+    
+    if db.get_bind().dialect.update_returning:
+        return db.execute(statement.returning(*columns)).first()
+    
+    if db.execute(statement).rowcount == 0:
+        return None
+    return db.query(*columns).filter(model.id == row_id, model.organization_id == organization_id).first()
+
+
+def versioned_delete(
+    db: Session,
+    model: type,
+    row_id: int,
+    organization_id: int,
+    columns: Sequence[Any],
+    versions: Optional[Iterable[int]] = None
+) -> Optional[Row]:
+    """
+    Delete one versioned row in a single statement and return its columns.
+    
+    Runs DELETE ... WHERE id AND tenant [AND version IN versions]
+    RETURNING columns instead of the ORM's delete of a loaded instance,
+    whose version check fails with StaleDataError when a concurrent
+    update committed in between. Dialects without DELETE RETURNING read
+    the row before deleting it.
+    
+    Nothing is committed; a None result means no row matched.
+    
+    Args:
+        db: Database session
+        model: Model with VersionMixin and TenantMixin
+        row_id: Primary key of the row
+        organization_id: Current tenant ID
+        columns: Columns to return
+        versions: Accepted current versions, None for any
+        
+    Returns:
+        Deleted row, or None if no row matched
+    """
+    criteria = [model.id == row_id, model.organization_id == organization_id]
+    if versions is not None:
+        criteria.append(model.version.in_(tuple(versions)))
+    statement = delete(model).where(*criteria).execution_options(synchronize_session=False)
+    
+    if db.get_bind().dialect.delete_returning:
+        return db.execute(statement.returning(*columns)).first()
+    
+    row = db.query(*columns).filter(*criteria).first()
+    if row is None or db.execute(statement).rowcount == 0:
+        return None
+    return row
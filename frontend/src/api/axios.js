@@ -52,4 +52,19 @@ api.interceptors.response.use(
   }
 )
 
+// Request config making a PUT conditional on the version the client last saw;
+// the server answers 412 if someone else changed the entity in between.
+export const ifMatch = (entity) =>
+  entity?.version ? { headers: { 'If-Match': `"${entity.version}"` } } : {}
+
+// After a failed conditional PUT: on 412 offers to reload the entity, dropping
+// the edits. Anything else, or a declined reload, is rethrown for the form.
+export const reloadOnConflict = (error, label, reload) => {
+  const conflict = error.response?.status === 412
+  if (!conflict || !window.confirm(`This ${label} was changed by someone else. Load the latest version? Your edits will be discarded.`)) {
+    throw error
+  }
+  reload()
+}
+
 export default api
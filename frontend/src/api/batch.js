@@ -0,0 +1,30 @@
+import api from './axios'
+
+// Must match BATCH_MAX_REQUESTS on the server.
+const MAX_BATCH_SIZE = 20
+
+/**
+ * Run several GET requests in one round trip through POST /batch/.
+ *
+ * Paths are relative to the API base URL and use the route's exact form
+ * (e.g. '/projects/?page=1'); sub-requests do not follow redirects.
+ * Resolves to one { status, data } per path, in order. A failing item
+ * does not reject the whole call; check its status.
+ */
+export const batchGet = async (paths) => {
+  const chunks = []
+  for (let i = 0; i < paths.length; i += MAX_BATCH_SIZE) {
+    chunks.push(paths.slice(i, i + MAX_BATCH_SIZE))
+  }
+
+  const results = await Promise.all(chunks.map(chunk =>
+    api.post('/batch/', { requests: chunk.map(path => ({ method: 'GET', path })) })
+  ))
+
+  return results.flatMap(res => res.data.responses.map(item => ({
+    status: item.status,
+    data: item.body
+  })))
+}
+
+export const isOk = (item) => item.status >= 200 && item.status < 300
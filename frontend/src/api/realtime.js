@@ -0,0 +1,78 @@
+import api from './axios'
+
+const RECONNECT_DELAY_MS = 2000
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms))
+
+const parseEvent = (block) => {
+  let type = 'message'
+  const data = []
+  for (const line of block.split('\n')) {
+    if (line.startsWith('event:')) {
+      type = line.slice(6).trim()
+    } else if (line.startsWith('data:')) {
+      data.push(line.slice(5).trim())
+    }
+  }
+  return data.length > 0 ? { type, data: JSON.parse(data.join('\n')) } : null
+}
+
+/**
+ * Follow committed changes through the /realtime/stream Server-Sent Events endpoint.
+ *
+ * Uses fetch instead of EventSource so the bearer token goes in a header,
+ * not the URL. onChanges receives lists of { topic, entity, op, id, data };
+ * onResync is called when changes may have been missed (server request or
+ * reconnect) and the caller should reload. Returns an unsubscribe function.
+ */
+export const subscribeChanges = ({ projectIds = [], boardIds = [], taskIds = [] }, onChanges, onResync) => {
+  const controller = new AbortController()
+  const params = new URLSearchParams()
+  projectIds.forEach(id => params.append('project_id', id))
+  boardIds.forEach(id => params.append('board_id', id))
+  taskIds.forEach(id => params.append('task_id', id))
+
+  const run = async () => {
+    let connectedBefore = false
+    while (!controller.signal.aborted) {
+      try {
+        const response = await fetch(`${api.defaults.baseURL}/realtime/stream?${params}`, {
+          headers: { Authorization: `Bearer ${localStorage.getItem('access_token')}` },
+          signal: controller.signal
+        })
+        if (!response.ok) {
+          throw new Error(`Realtime stream failed with status ${response.status}`)
+        }
+        if (connectedBefore) {
+          onResync()
+        }
+        connectedBefore = true
+
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+        let buffer = ''
+        for (;;) {
+          const { value, done } = await reader.read()
+          if (done) break
+          buffer += value
+          let index
+          while ((index = buffer.indexOf('\n\n')) >= 0) {
+            const event = parseEvent(buffer.slice(0, index))
+            buffer = buffer.slice(index + 2)
+            if (event?.type === 'changes') {
+              onChanges(event.data)
+            } else if (event?.type === 'resync') {
+              onResync()
+            }
+          }
+        }
+      } catch (error) {
+        if (controller.signal.aborted) return
+        console.error('Realtime stream error:', error)
+      }
+      await sleep(RECONNECT_DELAY_MS)
+    }
+  }
+
+  run()
+  return () => controller.abort()
+}
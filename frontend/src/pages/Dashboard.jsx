@@ -4,6 +4,7 @@ import { useAuth } from '../context/AuthContext'
 import ProjectModal from '../components/ProjectModal'
 import TaskModal from '../components/TaskModal'
 import api from '../api/axios'
+import { batchGet, isOk } from '../api/batch'
 import { FolderKanban, CheckSquare, Users } from 'lucide-react'
 
 const Dashboard = () => {
@@ -25,38 +26,35 @@ const Dashboard = () => {
 
   const fetchStats = async () => {
     try {
-      const [projectsRes, usersRes] = await Promise.all([
-        api.get('/projects?page=1&page_size=1'),
-        api.get('/users?page=1&page_size=100')
+      const [projectsRes, usersRes, projectsList] = await batchGet([
+        '/projects/?page=1&page_size=1',
+        '/users/?page=1&page_size=100',
+        '/projects/?page=1&page_size=100'
       ])
-      
-      const projectsList = await api.get('/projects?page=1&page_size=100')
-      const allProjects = projectsList.data.items || []
+      const allProjects = (isOk(projectsList) && projectsList.data.items) || []
 
-      let totalTasks = 0
+      const boardsRes = await batchGet(allProjects.map(project => `/boards/project/${project.id}`))
       const allBoards = []
+      boardsRes.forEach((res, i) => {
+        if (isOk(res)) {
+          allBoards.push(...(res.data || []))
+        } else {
+          console.error(`Error fetching boards for project ${allProjects[i].id}:`, res.data)
+        }
+      })
 
-      for (const project of allProjects) {
-        try {
-          const boardsRes = await api.get(`/boards/project/${project.id}`)
-          const projectBoards = boardsRes.data || []
-          allBoards.push(...projectBoards)
-
-          for (const board of projectBoards) {
-            try {
-              const tasksRes = await api.get(`/tasks/board/${board.id}`)
-              const activeTasks = (tasksRes.data || []).filter(task => 
-                task.status !== 'DONE'
-              )
-              totalTasks += activeTasks.length
-            } catch (error) {
-              console.error(`Error fetching tasks for board ${board.id}:`, error)
-            }
-          }
-        } catch (error) {
-          console.error(`Error fetching boards for project ${project.id}:`, error)
+      let totalTasks = 0
+      const tasksRes = await batchGet(allBoards.map(board => `/tasks/board/${board.id}?fields=status`))
+      tasksRes.forEach((res, i) => {
+        if (isOk(res)) {
+          const activeTasks = (res.data || []).filter(task => 
+            task.status !== 'DONE'
+          )
+          totalTasks += activeTasks.length
+        } else {
+          console.error(`Error fetching tasks for board ${allBoards[i].id}:`, res.data)
         }
-      }
+      })
 
       setBoards(allBoards)
       setUsers(usersRes.data.items || [])
@@ -5,7 +5,8 @@ import { useAuth } from '../context/AuthContext'
 import ProjectModal from '../components/ProjectModal'
 import BoardModal from '../components/BoardModal'
 import TaskModal from '../components/TaskModal'
-import api from '../api/axios'
+import api, { ifMatch, reloadOnConflict } from '../api/axios'
+import { subscribeChanges } from '../api/realtime'
 import { Edit, Trash2, Plus, CheckSquare, Columns } from 'lucide-react'
 
 const ProjectDetail = () => {
@@ -32,6 +33,48 @@ const ProjectDetail = () => {
     fetchUsers()
   }, [id])
 
+  const boardIdsKey = boards.map(board => board.id).join(',')
+
+  useEffect(() => {
+    const boardIds = boardIdsKey ? boardIdsKey.split(',') : []
+    return subscribeChanges({ projectIds: [id], boardIds }, applyChanges, fetchBoards)
+  }, [id, boardIdsKey])
+
+  const sortTasks = (list) => [...list].sort((a, b) =>
+    a.position - b.position || a.created_at.localeCompare(b.created_at)
+  )
+
+  const applyChanges = (events) => {
+    for (const event of events) {
+      if (event.entity === 'board') {
+        if (event.op === 'created') {
+          setBoards(prev => prev.some(board => board.id === event.id) ? prev : [...prev, event.data])
+          setTasks(prev => ({ ...prev, [event.id]: prev[event.id] || [] }))
+        } else if (event.op === 'updated') {
+          setBoards(prev => prev
+            .map(board => board.id === event.id ? { ...board, ...event.data } : board)
+            .filter(board => board.is_active !== false))
+        } else if (event.op === 'deleted') {
+          setBoards(prev => prev.filter(board => board.id !== event.id))
+        }
+      } else if (event.entity === 'task') {
+        const boardId = Number(event.topic.split(':')[1])
+        setTasks(prev => {
+          const current = prev[boardId] || []
+          let next = current
+          if (event.op === 'created') {
+            next = current.some(task => task.id === event.id) ? current : sortTasks([...current, event.data])
+          } else if (event.op === 'updated') {
+            next = sortTasks(current.map(task => task.id === event.id ? { ...task, ...event.data } : task))
+          } else if (event.op === 'deleted') {
+            next = current.filter(task => task.id !== event.id)
+          }
+          return { ...prev, [boardId]: next }
+        })
+      }
+    }
+  }
+
   const fetchProject = async () => {
     try {
       const response = await api.get(`/projects/${id}`)
@@ -74,7 +117,12 @@ const ProjectDetail = () => {
   }
 
   const handleUpdateProject = async (formData) => {
-    await api.put(`/projects/${id}`, formData)
+    try {
+      await api.put(`/projects/${id}`, formData, ifMatch(project))
+    } catch (error) {
+      reloadOnConflict(error, 'project', fetchProject)
+      return
+    }
     fetchProject()
   }
 
@@ -94,12 +142,14 @@ const ProjectDetail = () => {
 
   const handleCreateTask = async (formData) => {
     await api.post('/tasks', formData)
-    fetchTasksForBoard(formData.board_id)
   }
 
   const handleUpdateTask = async (formData) => {
-    await api.put(`/tasks/${selectedTask.id}`, formData)
-    fetchTasksForBoard(formData.board_id)
+    try {
+      await api.put(`/tasks/${selectedTask.id}`, formData, ifMatch(selectedTask))
+    } catch (error) {
+      reloadOnConflict(error, 'task', () => fetchTasksForBoard(selectedTask.board_id))
+    }
     setSelectedTask(null)
   }
 
@@ -107,7 +157,6 @@ const ProjectDetail = () => {
     if (window.confirm('Are you sure you want to delete this task?')) {
       try {
         await api.delete(`/tasks/${taskId}`)
-        fetchTasksForBoard(boardId)
       } catch (error) {
         console.error('Error deleting task:', error)
       }
@@ -116,12 +165,14 @@ const ProjectDetail = () => {
 
   const handleCreateBoard = async (formData) => {
     await api.post('/boards', formData)
-    fetchBoards()
   }
 
   const handleUpdateBoard = async (formData) => {
-    await api.put(`/boards/${selectedBoard.id}`, formData)
-    fetchBoards()
+    try {
+      await api.put(`/boards/${selectedBoard.id}`, formData, ifMatch(selectedBoard))
+    } catch (error) {
+      reloadOnConflict(error, 'board', fetchBoards)
+    }
     setSelectedBoard(null)
   }
 
@@ -129,7 +180,6 @@ const ProjectDetail = () => {
     if (window.confirm('Are you sure you want to delete this board? All tasks in this board will be deleted.')) {
       try {
         await api.delete(`/boards/${boardId}`)
-        fetchBoards()
       } catch (error) {
         console.error('Error deleting board:', error)
       }
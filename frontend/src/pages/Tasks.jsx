@@ -3,7 +3,8 @@ import { useNavigate } from 'react-router-dom'
 import Layout from '../components/Layout'
 import { useAuth } from '../context/AuthContext'
 import TaskModal from '../components/TaskModal'
-import api from '../api/axios'
+import api, { ifMatch, reloadOnConflict } from '../api/axios'
+import { batchGet, isOk } from '../api/batch'
 import { CheckSquare, Edit, Trash2 } from 'lucide-react'
 
 const Tasks = () => {
@@ -24,42 +25,44 @@ const Tasks = () => {
 
   const fetchData = async () => {
     try {
-      const [projectsRes, usersRes] = await Promise.all([
-        api.get('/projects'),
-        api.get('/users')
-      ])
+      const [projectsRes, usersRes] = await batchGet(['/projects/', '/users/'])
       
-      const projectsList = projectsRes.data.items || []
+      const projectsList = (isOk(projectsRes) && projectsRes.data.items) || []
       setProjects(projectsList)
-      setUsers(usersRes.data.items || [])
+      setUsers((isOk(usersRes) && usersRes.data.items) || [])
 
+      const boardsRes = await batchGet(projectsList.map(project => `/boards/project/${project.id}`))
       const allBoards = []
-      const allTasks = []
-
-      for (const project of projectsList) {
-        try {
-          const boardsRes = await api.get(`/boards/project/${project.id}`)
-          const projectBoards = boardsRes.data || []
-          allBoards.push(...projectBoards)
-
-          for (const board of projectBoards) {
-            try {
-              const tasksRes = await api.get(`/tasks/board/${board.id}`)
-              const boardTasks = (tasksRes.data || []).map(task => ({
-                ...task,
-                boardName: board.name,
-                projectName: project.name,
-                projectId: project.id
-              }))
-              allTasks.push(...boardTasks)
-            } catch (error) {
-              console.error(`Error fetching tasks for board ${board.id}:`, error)
-            }
+      const boardProjects = []
+      boardsRes.forEach((res, i) => {
+        const project = projectsList[i]
+        if (isOk(res)) {
+          for (const board of res.data || []) {
+            allBoards.push(board)
+            boardProjects.push(project)
           }
-        } catch (error) {
-          console.error(`Error fetching boards for project ${project.id}:`, error)
+        } else {
+          console.error(`Error fetching boards for project ${project.id}:`, res.data)
         }
-      }
+      })
+
+      const tasksRes = await batchGet(allBoards.map(board => `/tasks/board/${board.id}`))
+      const allTasks = []
+      tasksRes.forEach((res, i) => {
+        const board = allBoards[i]
+        const project = boardProjects[i]
+        if (isOk(res)) {
+          const boardTasks = (res.data || []).map(task => ({
+            ...task,
+            boardName: board.name,
+            projectName: project.name,
+            projectId: project.id
+          }))
+          allTasks.push(...boardTasks)
+        } else {
+          console.error(`Error fetching tasks for board ${board.id}:`, res.data)
+        }
+      })
 
       setBoards(allBoards)
       setTasks(allTasks)
@@ -71,7 +74,13 @@ const Tasks = () => {
   }
 
   const handleUpdateTask = async (formData) => {
-    await api.put(`/tasks/${selectedTask.id}`, formData)
+    try {
+      await api.put(`/tasks/${selectedTask.id}`, formData, ifMatch(selectedTask))
+    } catch (error) {
+      reloadOnConflict(error, 'task', fetchData)
+      setSelectedTask(null)
+      return
+    }
     fetchData()
     setSelectedTask(null)
   }
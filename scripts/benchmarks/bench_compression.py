@@ -0,0 +1,110 @@
+"""
+Benchmark: bandwidth versus CPU for compressing task list responses
+with the encoders used by app.core.compression.
+
+Payloads are TaskResponse lists encoded through the production fast path,
+with varied, seeded titles and descriptions so text does not repeat
+verbatim (repeated strings would overstate the compression ratio).
+Transfer time is estimated for the given link speed.
+
+Usage:
+    python scripts/benchmarks/bench_compression.py [--repeat 5] [--mbps 10]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.compression import BrotliCompressor, GzipCompressor, brotli
+from app.tasks.models import TaskStatus, TaskPriority
+from app.tasks.schemas import TaskResponse
+from app.utils.serialization import json_list_response
+
+
+WORDS = (
+    "board sprint deploy review customer invoice latency dashboard export "
+    "login error mobile layout payment webhook retry queue report filter "
+    "search onboarding migration staging release rollback alert metric "
+    "permission tenant billing schema index cache timeout token refresh"
+).split()
+
+
+def make_tasks(count: int, rng: random.Random):
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            board_id=1 + i % 20,
+            organization_id=1,
+            title=" ".join(rng.choices(WORDS, k=rng.randint(3, 8))).capitalize(),
+            description=" ".join(rng.choices(WORDS, k=rng.randint(0, 80))) or None,
+            status=statuses[i % len(statuses)],
+            priority=priorities[i % len(priorities)],
+            assigned_to=rng.randint(1, 50),
+            created_by=rng.randint(1, 7),
+            due_date=now + timedelta(days=rng.randint(0, 60)),
+            position=i,
+            created_at=now,
+            updated_at=now + timedelta(seconds=rng.randint(0, 86400))
+        )
+        for i in range(count)
+    ]
+
+
+def encoders():
+    yield "identity", None
+    for level in (1, 6, 9):
+        yield f"gzip-{level}", lambda level=level: GzipCompressor(level)
+    if brotli is not None:
+        for quality in (1, 4, 6, 11):
+            yield f"br-{quality}", lambda quality=quality: BrotliCompressor(quality)
+
+
+def measure(factory, body: bytes, repeat: int):
+    if factory is None:
+        return 0.0, len(body)
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(factory().compress(body, final=True))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mbps", type=float, default=10.0, help="Link speed for the transfer estimate")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    if brotli is None:
+        print("brotli not installed; showing gzip only")
+    bytes_per_ms = args.mbps * 1_000_000 / 8 / 1000
+    
+    print(f"{'tasks':>7} {'encoding':<10}{'KiB':>10}{'ratio':>8}{'cpu ms':>9}{'MB/s':>8}{'xfer ms':>9}{'total ms':>10}")
+    for count in (20, 200, 2_000, 10_000):
+        body = json_list_response(TaskResponse, make_tasks(count, random.Random(args.seed))).body
+        for name, factory in encoders():
+            seconds, size = measure(factory, body, args.repeat)
+            cpu_ms = seconds * 1000
+            transfer_ms = size / bytes_per_ms
+            throughput = len(body) / seconds / 1e6 if seconds else float("inf")
+            print(
+                f"{count:>7} {name:<10}{size / 1024:>10.1f}{len(body) / size:>8.1f}"
+                f"{cpu_ms:>9.2f}{throughput:>8.0f}{transfer_ms:>9.1f}{cpu_ms + transfer_ms:>10.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: peak memory of the streaming export (ExportService.stream)
+for a small and a large tenant.
+
+Builds a throwaway SQLite database with one organization holding --rows
+tasks, then runs each export in a fresh child process and reports its
+peak RSS, the growth over an equally configured run against a small
+tenant, throughput and output size. Exits with status 1 when the growth
+exceeds --max-growth-mib, so it can run as a regression check.
+
+--compare-all additionally measures loading the whole tenant with
+.all() before encoding it as NDJSON, the approach the export replaces.
+
+Usage:
+    python scripts/benchmarks/bench_export_memory.py [--rows 1000000] [--format ndjson]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from pydantic_core import to_json
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database.base import Base
+from app.organizations.models import Organization
+from app.users.models import User, UserOrganization  # noqa: F401 (registers tables)
+from app.roles.models import Role  # noqa: F401
+from app.projects.models import Project
+from app.boards.models import Board
+from app.tasks.models import Task
+from app.comments.models import Comment  # noqa: F401
+from app.exports.schemas import ExportEntity, ExportFormat
+from app.exports.service import ExportService
+
+
+SMALL_TENANT_ROWS = 10_000
+INSERT_CHUNK = 50_000
+
+
+def build_database(path: str, organizations: dict):
+    """Create the schema and insert {organization_id: task count} tasks."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    description = "Export every task of the organization without buffering. " * 4
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"id": 1, "email": "bench@example.com", "password_hash": "x"}])
+        for organization_id, count in organizations.items():
+            connection.execute(insert(Organization), [{
+                "id": organization_id, "name": f"Org {organization_id}", "slug": f"org-{organization_id}", "is_active": True
+            }])
+            connection.execute(insert(Project), [{
+                "id": organization_id, "name": "P", "slug": "p", "organization_id": organization_id, "created_by": 1
+            }])
+            connection.execute(insert(Board), [{
+                "id": organization_id, "name": "B", "project_id": organization_id, "organization_id": organization_id
+            }])
+            for start in range(0, count, INSERT_CHUNK):
+                connection.execute(insert(Task), [
+                    {
+                        "board_id": organization_id,
+                        "organization_id": organization_id,
+                        "title": f"Task {i}",
+                        "description": description,
+                        "assigned_to": 1,
+                        "created_by": 1,
+                        "position": i,
+                        "created_at": now,
+                        "updated_at": now
+                    }
+                    for i in range(start, min(start + INSERT_CHUNK, count))
+                ])
+    engine.dispose()
+
+
+def _run_export(path: str, organization_id: int, export_format: str, load_all: bool, results) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    session_factory = sessionmaker(bind=engine)
+    start = time.perf_counter()
+    size = 0
+    if load_all:
+        db = session_factory()
+        try:
+            rows = db.execute(ExportService.build_query(ExportEntity.TASKS, organization_id)).all()
+            size = len(b"".join(to_json(row._asdict()) + b"\n" for row in rows))
+        finally:
+            db.close()
+    else:
+        for chunk in ExportService.stream(
+            ExportEntity.TASKS, organization_id, ExportFormat(export_format), session_factory=session_factory
+        ):
+            size += len(chunk)
+    results.put((
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        time.perf_counter() - start,
+        size
+    ))
+
+
+def measure(path: str, organization_id: int, export_format: str, load_all: bool = False):
+    """Run one export in a fresh process: (peak RSS MiB, seconds, bytes)."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run_export, args=(path, organization_id, export_format, load_all, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=[f.value for f in ExportFormat], default="ndjson")
+    parser.add_argument("--max-growth-mib", type=float, default=64.0)
+    parser.add_argument("--compare-all", action="store_true")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        start = time.perf_counter()
+        build_database(path, {1: SMALL_TENANT_ROWS, 2: args.rows})
+        print(f"built {args.rows + SMALL_TENANT_ROWS} tasks in {time.perf_counter() - start:.1f}s")
+        
+        cases = [
+            (f"stream, {SMALL_TENANT_ROWS} rows", 1, False),
+            (f"stream, {args.rows} rows", 2, False),
+        ]
+        if args.compare_all:
+            cases.append((f".all(), {args.rows} rows", 2, True))
+        
+        print(f"{'export':<30}{'peak MiB':>12}{'seconds':>10}{'rows/s':>12}{'MiB out':>10}")
+        peaks = []
+        for name, organization_id, load_all in cases:
+            peak, seconds, size = measure(path, organization_id, args.format, load_all)
+            rows = SMALL_TENANT_ROWS if organization_id == 1 else args.rows
+            peaks.append(peak)
+            print(f"{name:<30}{peak:>12.1f}{seconds:>10.2f}{rows / seconds:>12.0f}{size / 2 ** 20:>10.1f}")
+    
+    growth = peaks[1] - peaks[0]
+    print(f"peak RSS growth for {args.rows} rows: {growth:.1f} MiB (limit {args.max_growth_mib:.0f} MiB)")
+    if growth > args.max_growth_mib:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
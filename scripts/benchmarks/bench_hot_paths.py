@@ -0,0 +1,310 @@
+"""
+Microbenchmarks for per-request hot paths: JWT creation and decoding,
+the get_current_user -> get_tenant_id dependency chain, TaskCreate /
+TaskUpdate validation, PaginatedResponse construction and ORM/row to
+response-schema conversion.
+
+Each benchmark is calibrated so one sample takes at least --min-time,
+then timed for --samples samples after a warm-up sample. Reported per
+call: median, mean +- standard deviation and min; samples more than
+1.5 IQR outside the quartiles are counted as outliers, and a relative
+standard deviation above 10% marks the result unstable (rerun on an
+idle machine). A separate pass under tracemalloc reports, per call, the
+peak traced memory and the blocks still allocated afterwards (non-zero
+means caching or a leak); tracemalloc is off while timing.
+
+--save writes the results with Python and library versions as JSON.
+--compare reports the change against such a file and exits with status
+1 when a median slows down, or peak memory grows, by more than
+--threshold and beyond twice the combined noise.
+
+Usage:
+    python scripts/benchmarks/bench_hot_paths.py [--filter jwt] [--samples 20]
+        [--save hot_paths.json] [--compare baseline.json]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import pydantic
+import sqlalchemy
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from app.auth.revocation import revocation_registry
+from app.core.dependencies import get_current_user, get_tenant_id
+from app.core.security import create_access_token, decode_token
+from app.database.base import Base
+from app.organizations.models import Organization
+from app.users.models import User, UserOrganization  # noqa: F401 (registers tables)
+from app.roles.models import Role  # noqa: F401
+from app.projects.models import Project
+from app.boards.models import Board
+from app.tasks.models import Task
+from app.comments.models import Comment  # noqa: F401
+from app.projects.schemas import ProjectResponse
+from app.tasks.schemas import TaskCreate, TaskResponse, TaskUpdate
+from app.utils.pagination import PaginatedResponse
+from app.utils.projection import response_columns
+from app.utils.serialization import paginated_json_response, to_models
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable[[], Any]
+
+
+def run_coroutine(coroutine) -> Any:
+    """Drive a coroutine that never suspends without the cost of an event loop."""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coroutine.close()
+    raise RuntimeError("coroutine suspended; benchmark it with an event loop")
+
+
+def build_fixtures(rows: int) -> Dict[str, Any]:
+    """ORM tasks, projected task rows and project rows from an in-memory database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    with engine.begin() as connection:
+        connection.execute(insert(Organization), [{"id": 1, "name": "Bench", "slug": "bench", "is_active": True}])
+        connection.execute(insert(User), [{"id": 1, "email": "bench@example.com", "password_hash": "x"}])
+        connection.execute(insert(Project), [
+            {
+                "id": i, "name": f"Project {i}", "slug": f"project-{i}", "description": "Quarterly roadmap items",
+                "organization_id": 1, "created_by": 1, "created_at": now, "updated_at": now
+            }
+            for i in range(1, 21)
+        ])
+        connection.execute(insert(Board), [{"id": 1, "name": "B", "project_id": 1, "organization_id": 1}])
+        connection.execute(insert(Task), [
+            {
+                "board_id": 1, "organization_id": 1, "title": f"Task {i}", "description": "Fix the login redirect",
+                "assigned_to": 1, "created_by": 1, "position": i, "due_date": now, "created_at": now, "updated_at": now
+            }
+            for i in range(rows)
+        ])
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    fixtures = {
+        "orm_tasks": session.query(Task).order_by(Task.id).all(),
+        "task_rows": session.query(*response_columns(Task, TaskResponse)).order_by(Task.id).all(),
+        "project_rows": session.query(*response_columns(Project, ProjectResponse)).order_by(Project.id).all(),
+    }
+    session.expunge_all()
+    session.close()
+    engine.dispose()
+    return fixtures
+
+
+def build_benchmarks(rows: int) -> List[Benchmark]:
+    fixtures = build_fixtures(rows)
+    orm_tasks, task_rows, project_rows = fixtures["orm_tasks"], fixtures["task_rows"], fixtures["project_rows"]
+    claims = {
+        "user_id": 1, "email": "bench@example.com", "first_name": "Bench", "last_name": "User",
+        "organization_id": 1, "role": "ORG_ADMIN"
+    }
+    token = create_access_token(claims)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    request = Request({"type": "http", "method": "GET", "path": "/api/v1/tasks/1", "headers": []})
+    create_payload = {
+        "board_id": 1, "title": "Write release notes", "description": "Summarize the sprint",
+        "status": "IN_PROGRESS", "priority": "HIGH", "assigned_to": 7, "due_date": "2026-03-01T09:00:00", "position": 3
+    }
+    update_payload = {"status": "DONE", "position": 5}
+    projects = to_models(ProjectResponse, project_rows)
+    # Steady state: the server refreshes the revocation list from a background thread.
+    revocation_registry._next_refresh = float("inf")
+    
+    async def auth_chain():
+        user = await get_current_user(request, credentials)
+        return await get_tenant_id(user)
+    
+    return [
+        Benchmark("jwt: create_access_token", lambda: create_access_token(claims)),
+        Benchmark("jwt: decode_token", lambda: decode_token(token)),
+        Benchmark("deps: get_current_user -> get_tenant_id", lambda: run_coroutine(auth_chain())),
+        Benchmark("validate: TaskCreate", lambda: TaskCreate.model_validate(create_payload)),
+        Benchmark("validate: TaskUpdate (2 fields)", lambda: TaskUpdate.model_validate(update_payload)),
+        Benchmark("paginate: PaginatedResponse.create (20 projects)", lambda: PaginatedResponse.create(
+            projects, 20, 1, 20
+        )),
+        Benchmark("paginate: paginated_json_response (20 rows)", lambda: paginated_json_response(
+            ProjectResponse, project_rows, 20, 1, 20
+        )),
+        Benchmark("convert: TaskResponse.model_validate (1 ORM)", lambda: TaskResponse.model_validate(
+            orm_tasks[0], from_attributes=True
+        )),
+        Benchmark(f"convert: to_models ({rows} ORM)", lambda: to_models(TaskResponse, orm_tasks)),
+        Benchmark(f"convert: to_models ({rows} rows)", lambda: to_models(TaskResponse, task_rows)),
+    ]
+
+
+def calibrate(func: Callable[[], Any], min_time: float) -> int:
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= min_time:
+            return loops
+        loops *= 2
+
+
+def time_benchmark(func: Callable[[], Any], samples: int, min_time: float) -> Dict[str, Any]:
+    """Seconds per call for each sample, with summary statistics."""
+    loops = calibrate(func, min_time)
+    gc.collect()
+    timings = []
+    for sample in range(samples + 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if sample:
+            timings.append((time.perf_counter() - start) / loops)
+    ordered = sorted(timings)
+    q1, _, q3 = statistics.quantiles(ordered, n=4)
+    spread = 1.5 * (q3 - q1)
+    mean = statistics.fmean(timings)
+    stdev = statistics.stdev(timings)
+    return {
+        "loops": loops,
+        "samples": timings,
+        "median": statistics.median(timings),
+        "mean": mean,
+        "stdev": stdev,
+        "min": ordered[0],
+        "outliers": sum(1 for t in timings if t < q1 - spread or t > q3 + spread),
+        "unstable": stdev / mean > 0.10,
+    }
+
+
+def trace_allocations(func: Callable[[], Any], calls: int) -> Dict[str, float]:
+    """Peak traced bytes per call and blocks retained per call."""
+    func()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peaks = [0] * calls
+        before = tracemalloc.take_snapshot()
+        for i in range(calls):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            func()
+            peaks[i] = tracemalloc.get_traced_memory()[1] - baseline
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # Blocks allocated by this loop itself (the peak values) are not the benchmark's.
+    own = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+    retained = sum(
+        stat.count_diff for stat in after.filter_traces(own).compare_to(before.filter_traces(own), "filename")
+    )
+    return {"peak_bytes": statistics.median(peaks), "retained_blocks": retained / calls}
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pydantic": pydantic.VERSION,
+        "sqlalchemy": sqlalchemy.__version__,
+    }
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Benchmarks that slowed down or grew beyond the threshold and the noise."""
+    regressions = []
+    print(f"\n{'benchmark':<50}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = current["median"] / base["median"] - 1
+        noise = 2 * max(current["stdev"] / current["mean"], base["stdev"] / base["mean"])
+        significant = abs(change) > max(threshold, noise)
+        mark = "" if not significant else (" slower" if change > 0 else " faster")
+        print(f"{name:<50}{format_time(base['median']):>12}{format_time(current['median']):>12}{change:>+9.1%}{mark}")
+        if significant and change > 0:
+            regressions.append(f"{name}: median {change:+.1%}")
+        if "peak_bytes" in base and base["peak_bytes"]:
+            growth = current["peak_bytes"] / base["peak_bytes"] - 1
+            if growth > threshold:
+                regressions.append(f"{name}: peak memory {growth:+.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--min-time", type=float, default=0.02, help="Seconds per sample")
+    parser.add_argument("--alloc-calls", type=int, default=200, help="Calls traced by tracemalloc")
+    parser.add_argument("--rows", type=int, default=100, help="Rows converted by the list benchmarks")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare with a JSON file from --save")
+    parser.add_argument("--threshold", type=float, default=0.05, help="Smallest change reported as a regression")
+    args = parser.parse_args()
+    
+    benchmarks = [b for b in build_benchmarks(args.rows) if not args.filter or args.filter in b.name]
+    print(f"{'benchmark':<50}{'median':>11}{'mean +- stdev':>22}{'min':>11}{'peak KiB':>10}{'retained':>10}")
+    results = {}
+    for benchmark in benchmarks:
+        stats = time_benchmark(benchmark.func, args.samples, args.min_time)
+        stats.update(trace_allocations(benchmark.func, args.alloc_calls))
+        results[benchmark.name] = stats
+        notes = []
+        if stats["outliers"]:
+            notes.append(f"{stats['outliers']} outliers")
+        if stats["unstable"]:
+            notes.append("unstable")
+        print(
+            f"{benchmark.name:<50}{format_time(stats['median']):>11}"
+            f"{format_time(stats['mean']) + ' +- ' + format_time(stats['stdev']):>22}"
+            f"{format_time(stats['min']):>11}{stats['peak_bytes'] / 1024:>10.1f}{stats['retained_blocks']:>10.2f}"
+            + (f"  ({', '.join(notes)})" if notes else "")
+        )
+    
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "benchmarks": results}, f, indent=2)
+        print(f"Saved {args.save}")
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["environment"] != environment():
+            print("Note: baseline was recorded in a different environment:", baseline["environment"])
+        regressions = compare(results, baseline["benchmarks"], args.threshold)
+        if regressions:
+            print("Regressions:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: listing a large board through ORM entities versus the
+column-projection read path in TaskService.list_tasks_by_board.
+
+Builds a throwaway SQLite database with one board holding --tasks tasks
+(each with a multi-KB description) and reports median latency and
+tracemalloc peak for query + serialization.
+
+Usage:
+    python scripts/benchmarks/bench_list_projection.py [--tasks 20000] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database.base import Base
+from app.organizations.models import Organization
+from app.users.models import User, UserOrganization
+from app.roles.models import Role
+from app.projects.models import Project
+from app.boards.models import Board
+from app.tasks.models import Task
+from app.comments.models import Comment
+from app.tasks.schemas import TaskResponse
+from app.tasks.service import TaskService
+from app.utils.serialization import json_list_response
+
+
+def build_database(path: str, task_count: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    description = "As a user I want the board to load quickly. " * 60
+    with engine.begin() as connection:
+        connection.execute(insert(Organization), [{"id": 1, "name": "Bench", "slug": "bench", "is_active": True}])
+        connection.execute(insert(User), [{"id": 1, "email": "bench@example.com", "password_hash": "x"}])
+        connection.execute(insert(Project), [{"id": 1, "name": "P", "slug": "p", "organization_id": 1, "created_by": 1}])
+        connection.execute(insert(Board), [{"id": 1, "name": "B", "project_id": 1, "organization_id": 1}])
+        connection.execute(insert(Task), [
+            {
+                "board_id": 1,
+                "organization_id": 1,
+                "title": f"Task {i}",
+                "description": description,
+                "assigned_to": 1,
+                "created_by": 1,
+                "position": i,
+                "created_at": now,
+                "updated_at": now
+            }
+            for i in range(task_count)
+        ])
+    return engine
+
+
+def orm_path(db):
+    tasks = db.query(Task).filter(
+        Task.board_id == 1,
+        Task.organization_id == 1
+    ).order_by(Task.position, Task.created_at).all()
+    return json_list_response(TaskResponse, tasks).body
+
+
+def projection_path(db, include_description: bool):
+    rows = TaskService.list_tasks_by_board(db, 1, 1, exclude=() if include_description else ("description",))
+    return json_list_response(TaskResponse, rows).body
+
+
+def measure(session_factory, func, repeat: int):
+    """Latency and peak allocations are measured in separate runs; tracemalloc distorts timings."""
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            start = time.perf_counter()
+            size = len(func(db))
+            timings.append(time.perf_counter() - start)
+        finally:
+            db.close()
+    
+    db = session_factory()
+    try:
+        tracemalloc.start()
+        func(db)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        db.close()
+    return statistics.median(timings), peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_database(os.path.join(tmp, "bench.db"), args.tasks)
+        session_factory = sessionmaker(bind=engine)
+        cases = [
+            ("ORM entities", orm_path),
+            ("projection", lambda db: projection_path(db, True)),
+            ("projection, no description", lambda db: projection_path(db, False)),
+        ]
+        print(f"{args.tasks} tasks on one board")
+        print(f"{'path':<30}{'median ms':>12}{'peak MiB':>12}{'body KiB':>12}")
+        for name, func in cases:
+            seconds, peak, size = measure(session_factory, func, args.repeat)
+            print(f"{name:<30}{seconds * 1000:>12.1f}{peak / 2 ** 20:>12.1f}{size / 1024:>12.0f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: serializing task lists through FastAPI's response_model path
+versus the pre-encoded fast path in app.utils.serialization.
+
+Usage:
+    python scripts/benchmarks/bench_serialization.py [--repeat 7]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.tasks.models import TaskStatus, TaskPriority
+from app.tasks.schemas import TaskResponse
+from app.utils.pagination import PaginatedResponse
+from app.utils.serialization import json_list_response, paginated_json_response
+
+
+def make_tasks(count: int):
+    """Build ORM-like task objects (attribute access, like SQLAlchemy instances)."""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            board_id=1 + i % 20,
+            organization_id=1,
+            title=f"Task {i}: implement feature",
+            description="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+            status=statuses[i % len(statuses)],
+            priority=priorities[i % len(priorities)],
+            assigned_to=1 + i % 50,
+            created_by=1 + i % 7,
+            due_date=now + timedelta(days=i % 30),
+            position=i,
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def fastapi_list(field, tasks) -> bytes:
+    """What FastAPI does for `return tasks` with response_model=List[TaskResponse]."""
+    content = asyncio.run(serialize_response(field=field, response_content=tasks))
+    return JSONResponse(content).body
+
+
+def fastapi_paginated(field, tasks) -> bytes:
+    """PaginatedResponse.create validation, then FastAPI's response_model validation."""
+    page = PaginatedResponse[TaskResponse].create(items=tasks, total=len(tasks), page=1, page_size=len(tasks))
+    content = asyncio.run(serialize_response(field=field, response_content=page))
+    return JSONResponse(content).body
+
+
+def fast_list(tasks) -> bytes:
+    return json_list_response(TaskResponse, tasks).body
+
+
+def fast_paginated(tasks) -> bytes:
+    return paginated_json_response(TaskResponse, tasks, total=len(tasks), page=1, page_size=len(tasks)).body
+
+
+def measure(func, repeat: int) -> float:
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    list_field = create_response_field(name="response", type_=List[TaskResponse])
+    page_field = create_response_field(name="response", type_=PaginatedResponse[TaskResponse])
+
+    print(f"{'case':<28}{'n':>8}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for count in (1_000, 10_000):
+        tasks = make_tasks(count)
+        cases = [
+            ("List[TaskResponse]", lambda: fastapi_list(list_field, tasks), lambda: fast_list(tasks)),
+            ("PaginatedResponse", lambda: fastapi_paginated(page_field, tasks), lambda: fast_paginated(tasks)),
+        ]
+        for name, before, after in cases:
+            before_s = measure(before, args.repeat)
+            after_s = measure(after, args.repeat)
+            print(f"{name:<28}{count:>8}{before_s * 1000:>12.2f}{after_s * 1000:>12.2f}{before_s / after_s:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
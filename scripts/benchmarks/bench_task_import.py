@@ -0,0 +1,144 @@
+"""
+Benchmark: throughput of the bulk task import (app.tasks.importer).
+
+Writes --rows generated tasks as CSV and NDJSON, then reports records/s
+for parsing alone, parsing plus batch validation against TaskCreate,
+and the full import (validation, reference checks, insert, checkpoint)
+into a throwaway SQLite database. On PostgreSQL the insert step uses
+COPY; point --database-url at a scratch database to measure it.
+
+Usage:
+    python scripts/benchmarks/bench_task_import.py [--rows 200000] [--batch-size 5000]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database.base import Base
+from app.organizations.models import Organization
+from app.users.models import User, UserOrganization
+from app.roles.models import Role
+from app.projects.models import Project
+from app.boards.models import Board
+from app.tasks.models import Task  # noqa: F401 (registers tables)
+from app.comments.models import Comment  # noqa: F401
+from app.tasks.importer import ImportCheckpoint, TaskImporter, read_records
+from app.tasks.schemas import TaskCreate
+
+
+BOARDS = 20
+FIELDS = ("board_id", "title", "description", "status", "priority", "assigned_to", "due_date", "position")
+STATUSES = ("TODO", "IN_PROGRESS", "IN_REVIEW", "DONE", "BLOCKED")
+
+batch_adapter = TypeAdapter(List[TaskCreate])
+
+
+def generate(path: str, rows: int, import_format: str) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f) if import_format == "csv" else None
+        if writer:
+            writer.writerow(FIELDS)
+        for i in range(rows):
+            values = (
+                1 + i % BOARDS,
+                f"Imported task {i}",
+                "Steps to reproduce: open the board, drag a card." if i % 3 == 0 else "",
+                STATUSES[i % len(STATUSES)],
+                "MEDIUM",
+                1 if i % 4 == 0 else "",
+                "2026-03-01T09:00:00" if i % 10 == 0 else "",
+                i
+            )
+            if writer:
+                writer.writerow(values)
+            else:
+                f.write(json.dumps({k: v for k, v in zip(FIELDS, values) if v != ""}) + "\n")
+
+
+def build_database(url: str):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Organization), [{"id": 1, "name": "Bench", "slug": "bench", "is_active": True}])
+        connection.execute(insert(User), [{"id": 1, "email": "bench@example.com", "password_hash": "x"}])
+        connection.execute(insert(Role), [{"id": 1, "name": "ORG_ADMIN"}])
+        connection.execute(insert(UserOrganization), [{"user_id": 1, "organization_id": 1, "role_id": 1}])
+        connection.execute(insert(Project), [{"id": 1, "name": "P", "slug": "p", "organization_id": 1, "created_by": 1}])
+        connection.execute(insert(Board), [
+            {"id": i, "name": f"B{i}", "project_id": 1, "organization_id": 1} for i in range(1, BOARDS + 1)
+        ])
+    return engine
+
+
+def parse_only(path: str, import_format: str) -> int:
+    with open(path, encoding="utf-8", newline="") as f:
+        return sum(1 for _ in read_records(f, import_format))
+
+
+def parse_and_validate(path: str, import_format: str, batch_size: int) -> int:
+    count = 0
+    with open(path, encoding="utf-8", newline="") as f:
+        batch = []
+        for _, fields, _ in read_records(f, import_format):
+            batch.append(fields)
+            if len(batch) == batch_size:
+                count += len(batch_adapter.validate_python(batch))
+                batch = []
+        if batch:
+            count += len(batch_adapter.validate_python(batch))
+    return count
+
+
+def full_import(path: str, import_format: str, batch_size: int, session_factory, tmp: str) -> int:
+    db = session_factory()
+    try:
+        importer = TaskImporter(db, 1, 1, batch_size)
+        checkpoint = ImportCheckpoint(os.path.join(tmp, f"{import_format}.checkpoint.json"), path)
+        with open(path, encoding="utf-8", newline="") as f:
+            progress = importer.run(read_records(f, import_format), os.path.join(tmp, "rejects.ndjson"), checkpoint)
+        return progress.inserted
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--database-url", help="Default: a temporary SQLite file")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_database(args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        session_factory = sessionmaker(bind=engine)
+        print(f"{args.rows} tasks, batches of {args.batch_size}, {engine.dialect.name}")
+        print(f"{'format':<8}{'stage':<22}{'seconds':>10}{'records/s':>12}")
+        for import_format in ("csv", "ndjson"):
+            path = os.path.join(tmp, f"tasks.{import_format}")
+            generate(path, args.rows, import_format)
+            stages = [
+                ("parse", lambda: parse_only(path, import_format)),
+                ("parse + validate", lambda: parse_and_validate(path, import_format, args.batch_size)),
+                ("full import", lambda: full_import(path, import_format, args.batch_size, session_factory, tmp)),
+            ]
+            for name, func in stages:
+                start = time.perf_counter()
+                count = func()
+                seconds = time.perf_counter() - start
+                assert count == args.rows, (name, count)
+                print(f"{import_format:<8}{name:<22}{seconds:>10.2f}{count / seconds:>12.0f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
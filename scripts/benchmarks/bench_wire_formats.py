@@ -0,0 +1,133 @@
+"""
+Benchmark: JSON versus MessagePack (row and columnar layouts) for
+List[TaskResponse] bodies at 1k and 10k items.
+
+Bodies are produced by json_list_response under each negotiated format,
+i.e. the same code path as a request with the matching Accept header,
+for two inputs: ORM-like objects (validated through the schema) and
+column-projection rows from an in-memory SQLite table (what the list
+endpoints pass). Reports encode time, body size, gzip-compressed size
+and client-side decode time (json.loads / msgpack.unpackb).
+
+Requires the optional msgpack package.
+
+Usage:
+    python scripts/benchmarks/bench_wire_formats.py [--repeat 7]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.database.base import Base
+from app.organizations.models import Organization  # noqa: F401 (registers tables)
+from app.users.models import User, UserOrganization  # noqa: F401
+from app.roles.models import Role  # noqa: F401
+from app.projects.models import Project  # noqa: F401
+from app.boards.models import Board  # noqa: F401
+from app.comments.models import Comment  # noqa: F401
+from app.tasks.models import Task, TaskStatus, TaskPriority
+from app.tasks.schemas import TaskResponse
+from app.utils.projection import response_columns
+from app.utils.serialization import (
+    JSON, MSGPACK, MSGPACK_COLUMNAR, current_format, json_list_response, msgpack
+)
+
+
+WORDS = (
+    "board sprint deploy review customer invoice latency dashboard export "
+    "login error mobile layout payment webhook retry queue report filter "
+    "search onboarding migration staging release rollback alert metric"
+).split()
+
+
+def make_tasks(count: int, rng: random.Random):
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            board_id=1 + i % 20,
+            organization_id=1,
+            title=" ".join(rng.choices(WORDS, k=rng.randint(3, 8))).capitalize(),
+            description=" ".join(rng.choices(WORDS, k=rng.randint(0, 40))) or None,
+            status=statuses[i % len(statuses)],
+            priority=priorities[i % len(priorities)],
+            assigned_to=rng.randint(1, 50),
+            created_by=rng.randint(1, 7),
+            due_date=now + timedelta(days=rng.randint(0, 60)),
+            position=i,
+            created_at=now,
+            updated_at=now + timedelta(seconds=rng.randint(0, 86400))
+        )
+        for i in range(count)
+    ]
+
+
+def load_rows(tasks):
+    """Insert the tasks into an in-memory table and read them back as projection rows."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.execute(Task.__table__.insert(), [vars(task) for task in tasks])
+        db.commit()
+        return db.query(*response_columns(Task, TaskResponse)).order_by(Task.id).all()
+
+
+def encode(wire_format: str, tasks) -> bytes:
+    token = current_format.set(wire_format)
+    try:
+        return json_list_response(TaskResponse, tasks).body
+    finally:
+        current_format.reset(token)
+
+
+def measure(func, repeat: int) -> float:
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    if msgpack is None:
+        sys.exit("msgpack is not installed; pip install msgpack")
+    
+    decoders = {JSON: json.loads, MSGPACK: msgpack.unpackb, MSGPACK_COLUMNAR: msgpack.unpackb}
+    
+    print(f"{'input':<7}{'format':<18}{'n':>8}{'encode ms':>12}{'bytes':>12}{'gzip bytes':>12}{'decode ms':>12}")
+    for count in (1_000, 10_000):
+        tasks = make_tasks(count, random.Random(args.seed))
+        for source, items in (("orm", tasks), ("rows", load_rows(tasks))):
+            for wire_format in (JSON, MSGPACK, MSGPACK_COLUMNAR):
+                body = encode(wire_format, items)
+                encode_s = measure(lambda: encode(wire_format, items), args.repeat)
+                decode_s = measure(lambda: decoders[wire_format](body), args.repeat)
+                gzip_size = len(zlib.compress(body, 6))
+                print(
+                    f"{source:<7}{wire_format:<18}{count:>8}{encode_s * 1000:>12.2f}"
+                    f"{len(body):>12}{gzip_size:>12}{decode_s * 1000:>12.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+Query-plan regression check for the queries issued by the service classes.
+
+Runs each service method against a large seeded database, records the
+SQL it sends, and EXPLAINs every statement with its real parameters
+(EXPLAIN QUERY PLAN on SQLite, EXPLAIN (FORMAT JSON) on PostgreSQL).
+Export queries are explained without being executed. Parameters come
+from the largest tenant: its busiest board, most-commented task and an
+admin.
+
+Checks:
+- no sequential scan of a tenant-scoped table
+- no sort node, except for cases that declare allow_sort because no
+  index can provide their order
+
+Plan shapes (node types, tables and indexes, no costs) are compared with
+scripts/benchmarks/query_plans/<dialect>.txt; differences are printed as
+a diff. --update rewrites the snapshot after an intended change. The
+exit status is 1 on a failed check or a snapshot difference.
+
+Index choice depends on the data, so the snapshot records the row counts
+it was taken on and is only compared against the same dataset; on any
+other data the checks above still run. The committed snapshot needs a
+new database created and seeded with exactly (indexes added to an older
+database can change which of two equivalent indexes the planner picks):
+    python scripts/init_db.py
+    python scripts/generate_data.py --tenants 100 --tasks 1000000
+
+Usage:
+    python scripts/benchmarks/check_query_plans.py [--database-url URL] [--update]
+"""
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.database.base import Base, TenantMixin
+from app.auth.schemas import LoginRequest
+from app.auth.service import AuthService
+from app.organizations.service import OrganizationService
+from app.projects.service import ProjectService
+from app.boards.models import Board
+from app.boards.service import BoardService
+from app.tasks.models import Task
+from app.tasks.service import TaskService
+from app.comments.models import Comment
+from app.comments.service import CommentService
+from app.users.models import User, UserOrganization
+from app.organizations.models import Organization
+from app.users.service import UserService
+from app.roles.models import Role
+from app.realtime.service import RealtimeService
+from app.exports.schemas import ExportEntity
+from app.exports.service import ExportService
+
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_plans")
+TENANT_TABLES = {
+    mapper.local_table.name for mapper in Base.registry.mappers if issubclass(mapper.class_, TenantMixin)
+} | {UserOrganization.__tablename__}
+
+
+class Case(NamedTuple):
+    name: str
+    run: Callable[[Any, Dict[str, Any]], Any]
+    allow_sort: bool = False
+
+
+def export_case(entity: ExportEntity, allow_sort: bool = False) -> Case:
+    return Case(
+        f"ExportService.build_query[{entity.value}]",
+        lambda db, s: ExportService.build_query(entity, s["org"]),
+        allow_sort
+    )
+
+
+CASES = [
+    Case("AuthService.login_user", lambda db, s: AuthService.login_user(
+        db, LoginRequest(email=s["email"], password=s["password"])
+    )),
+    # Ordered by organization name; a user belongs to a handful of organizations.
+    Case("AuthService.list_memberships", lambda db, s: AuthService.list_memberships(db, s["user"]), allow_sort=True),
+    Case("OrganizationService.get_organization", lambda db, s: OrganizationService.get_organization(db, s["org"])),
+    Case("ProjectService.get_project", lambda db, s: ProjectService.get_project(db, s["project"], s["org"])),
+    Case("ProjectService.list_projects", lambda db, s: ProjectService.list_projects(db, s["org"], 0, 20)),
+    Case("ProjectService.get_project_version", lambda db, s: ProjectService.get_project_version(db, s["project"], s["org"])),
+    Case("ProjectService.get_projects_version", lambda db, s: ProjectService.get_projects_version(db, s["org"])),
+    Case("BoardService.get_board", lambda db, s: BoardService.get_board(db, s["board"], s["org"])),
+    Case("BoardService.list_boards_by_project", lambda db, s: BoardService.list_boards_by_project(db, s["project"], s["org"])),
+    Case("BoardService.get_board_version", lambda db, s: BoardService.get_board_version(db, s["board"], s["org"])),
+    Case(
+        "BoardService.get_project_boards_version",
+        lambda db, s: BoardService.get_project_boards_version(db, s["project"], s["org"])
+    ),
+    Case("TaskService.get_task", lambda db, s: TaskService.get_task(db, s["task"], s["org"])),
+    Case("TaskService.get_task_row", lambda db, s: TaskService.get_task_row(db, s["task"], s["org"])),
+    Case("TaskService.list_tasks_by_board", lambda db, s: TaskService.list_tasks_by_board(db, s["board"], s["org"])),
+    Case(
+        "TaskService.list_tasks_by_board[status]",
+        lambda db, s: TaskService.list_tasks_by_board(db, s["board"], s["org"], status="TODO")
+    ),
+    Case(
+        "TaskService.list_tasks_by_board[assigned_to]",
+        lambda db, s: TaskService.list_tasks_by_board(db, s["board"], s["org"], assigned_to=s["assignee"])
+    ),
+    Case("TaskService.get_task_version", lambda db, s: TaskService.get_task_version(db, s["task"], s["org"])),
+    Case("TaskService.get_board_tasks_version", lambda db, s: TaskService.get_board_tasks_version(db, s["board"], s["org"])),
+    Case("CommentService.get_comment", lambda db, s: CommentService.get_comment(db, s["comment"], s["org"])),
+    Case("CommentService.list_comments_by_task", lambda db, s: CommentService.list_comments_by_task(db, s["task"], s["org"])),
+    Case("CommentService.get_comment_version", lambda db, s: CommentService.get_comment_version(db, s["comment"], s["org"])),
+    Case(
+        "CommentService.get_task_comments_version",
+        lambda db, s: CommentService.get_task_comments_version(db, s["task"], s["org"])
+    ),
+    Case("UserService.list_users_by_organization", lambda db, s: UserService.list_users_by_organization(db, s["org"])),
+    Case("UserService.get_users_version", lambda db, s: UserService.get_users_version(db, s["org"])),
+    Case("RealtimeService.authorize_topics", lambda db, s: RealtimeService.authorize_topics(
+        db, s["org"], [s["project"]], [s["board"]], [s["task"]]
+    )),
+    export_case(ExportEntity.TASKS),
+    export_case(ExportEntity.COMMENTS),
+    export_case(ExportEntity.PROJECTS),
+    # Ordered by membership id; a tenant has at most a few thousand members.
+    export_case(ExportEntity.MEMBERSHIPS, allow_sort=True),
+]
+
+
+def pick_samples(db, password: str) -> Dict[str, Any]:
+    """Ids from the largest tenant, so plans reflect the worst case."""
+    org = db.execute(
+        select(Task.organization_id).group_by(Task.organization_id).order_by(func.count().desc()).limit(1)
+    ).scalar()
+    if org is None:
+        raise SystemExit("No tasks in the database; run scripts/generate_data.py first")
+    board = db.execute(
+        select(Task.board_id).where(Task.organization_id == org)
+        .group_by(Task.board_id).order_by(func.count().desc()).limit(1)
+    ).scalar()
+    task = db.execute(
+        select(Comment.task_id).where(Comment.organization_id == org)
+        .group_by(Comment.task_id).order_by(func.count().desc()).limit(1)
+    ).scalar() or db.execute(select(Task.id).where(Task.board_id == board).limit(1)).scalar()
+    admin = db.execute(
+        select(User.id, User.email).join(UserOrganization, UserOrganization.user_id == User.id)
+        .join(Role, Role.id == UserOrganization.role_id)
+        .where(UserOrganization.organization_id == org, Role.name == "ORG_ADMIN")
+        .order_by(User.id).limit(1)
+    ).one()
+    return {
+        "org": org,
+        "board": board,
+        "project": db.get(Board, board).project_id,
+        "task": task,
+        "assignee": db.execute(
+            select(Task.assigned_to).where(Task.board_id == board, Task.assigned_to.isnot(None)).limit(1)
+        ).scalar(),
+        "comment": db.execute(select(Comment.id).where(Comment.task_id == task).limit(1)).scalar(),
+        "user": admin.id,
+        "email": admin.email,
+        "password": password,
+    }
+
+
+def capture(engine: Engine, session_factory: Callable, case: Case, samples: Dict[str, Any]) -> List[tuple]:
+    """(statement, parameters) of every query the case issues, or of the Select it returns."""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    
+    db = session_factory()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = case.run(db, samples)
+    except HTTPException:
+        result = None
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        db.rollback()
+        db.close()
+    if hasattr(result, "compile") and hasattr(result, "selected_columns"):
+        compiled = result.compile(dialect=engine.dialect)
+        params = compiled.construct_params()
+        if compiled.positional:
+            params = tuple(params[name] for name in compiled.positiontup)
+        statements = [(str(compiled), params)]
+    return [(statement, params) for statement, params in statements if statement.lstrip().upper().startswith("SELECT")]
+
+
+def explain_sqlite(connection, statement: str, params: Any) -> List[str]:
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).all()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def explain_postgresql(connection, statement: str, params: Any) -> List[str]:
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    lines = []
+    
+    def walk(node: dict, depth: int) -> None:
+        line = node["Node Type"]
+        if "Relation Name" in node:
+            line += f" on {node['Relation Name']}"
+        if "Index Name" in node:
+            line += f" using {node['Index Name']}"
+        if "Sort Key" in node:
+            line += f" by {', '.join(node['Sort Key'])}"
+        lines.append("  " * depth + line)
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+    
+    walk(plan[0]["Plan"], 0)
+    return lines
+
+
+def violations(dialect: str, lines: List[str], allow_sort: bool) -> List[str]:
+    problems = []
+    for line in lines:
+        text = line.strip()
+        if dialect == "sqlite":
+            scan = re.match(r"SCAN (\w+)", text)
+            is_sort = text.startswith("USE TEMP B-TREE FOR") and "ORDER BY" in text
+        else:
+            scan = re.match(r"Seq Scan on (\w+)", text)
+            is_sort = text.startswith(("Sort", "Incremental Sort"))
+        if scan and scan.group(1) in TENANT_TABLES:
+            problems.append(f"sequential scan of tenant table {scan.group(1)}: {text}")
+        if is_sort and not allow_sort:
+            problems.append(f"sort node: {text}")
+    return problems
+
+
+def dataset_signature(db) -> str:
+    """Row counts identifying the dataset a snapshot was taken on."""
+    counts = [
+        f"{model.__tablename__}={db.execute(select(func.count()).select_from(model)).scalar()}"
+        for model in (Organization, User, Task, Comment)
+    ]
+    return "# dataset: " + " ".join(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--password", default="password123", help="Admin password, so login_user reaches its membership query")
+    parser.add_argument("--update", action="store_true", help="Rewrite the snapshot")
+    parser.add_argument("--show-sql", action="store_true")
+    args = parser.parse_args()
+    
+    engine = create_engine(args.database_url)
+    dialect = engine.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        raise SystemExit(f"Unsupported database: {dialect}")
+    explain = explain_sqlite if dialect == "sqlite" else explain_postgresql
+    session_factory = sessionmaker(bind=engine)
+    
+    with session_factory() as db:
+        tasks = db.execute(select(func.count()).select_from(Task)).scalar()
+        dataset = dataset_signature(db)
+        samples = pick_samples(db, args.password)
+    if tasks < 100_000:
+        print(f"Warning: only {tasks} tasks; plans on small tables are not representative", file=sys.stderr)
+    
+    snapshot = [dataset]
+    failures = 0
+    with engine.connect() as connection:
+        for case in CASES:
+            statements = capture(engine, session_factory, case, samples)
+            snapshot.append(f"[{case.name}]")
+            for i, (statement, params) in enumerate(statements):
+                lines = explain(connection, statement, params)
+                if i:
+                    snapshot.append("  --")
+                snapshot.extend("  " + line for line in lines)
+                problems = violations(dialect, lines, case.allow_sort)
+                if problems or args.show_sql:
+                    print(f"{case.name}:\n    {' '.join(statement.split())}")
+                for problem in problems:
+                    failures += 1
+                    print(f"    FAIL {problem}")
+            if not statements:
+                snapshot.append("  (no SELECT issued)")
+    engine.dispose()
+    
+    path = os.path.join(SNAPSHOT_DIR, f"{dialect}.txt")
+    text = "\n".join(snapshot) + "\n"
+    if args.update or not os.path.exists(path):
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"Wrote {path}")
+    else:
+        with open(path, encoding="utf-8") as f:
+            expected = f.read()
+        expected_dataset = expected.split("\n", 1)[0]
+        if expected_dataset != dataset:
+            print(
+                f"Snapshot was taken on a different dataset, plan shapes not compared:\n"
+                f"  snapshot: {expected_dataset}\n  current:  {dataset}"
+            )
+        else:
+            diff = list(difflib.unified_diff(
+                expected.splitlines(), text.splitlines(), f"{dialect}.txt (snapshot)", f"{dialect}.txt (current)", lineterm=""
+            ))
+            if diff:
+                failures += 1
+                print("Plan shapes differ from the snapshot (rerun with --update if intended):")
+                print("\n".join(diff))
+    
+    print(f"{len(CASES)} cases, {failures} problem(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
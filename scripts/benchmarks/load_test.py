@@ -0,0 +1,464 @@
+"""
+Load test: replay realistic user sessions against the API and report
+latency percentiles, throughput and errors per route.
+
+Each virtual user logs in as a real member of a tenant and then runs
+scenarios drawn from --mix, issuing the same requests as the frontend:
+
+    login       POST /auth/login
+    dashboard   the three POST /batch/ rounds of the dashboard page
+    board_view  project, boards, every board's tasks and the member list
+    drag_drop   PUT /tasks/{id} with a new status and position
+    comment     a task's comments, then POST /comments/
+
+GETs send If-None-Match like a browser cache would; 304s count as
+successes. Accounts are read from the database (--database-url) and
+tenants are picked with Zipf weights by member count (--tenant-skew,
+0 for uniform), so a few large tenants receive most of the traffic.
+All accounts must share --password, as with scripts/generate_data.py.
+drag_drop and comment write to the database.
+
+Without --url the app runs in-process through httpx's ASGI transport,
+including its startup and shutdown handlers; with --url the requests go
+to a running server (e.g. uvicorn) over HTTP.
+
+--save writes the results as JSON. --baseline compares p95 latency,
+error rate and throughput per route with an earlier result and exits
+with status 1 on a regression beyond the given tolerances, for CI.
+
+Usage:
+    python scripts/benchmarks/load_test.py [--url http://localhost:8000] [--concurrency 20]
+        [--duration 60] [--mix board_view=5,drag_drop=3] [--save results.json]
+        [--baseline baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+from sqlalchemy import create_engine, func, select
+from app.core.config import settings
+from app.roles.models import Role
+from app.users.models import User, UserOrganization
+
+
+SCENARIOS = ("login", "dashboard", "board_view", "drag_drop", "comment")
+DEFAULT_MIX = "login=1,dashboard=2,board_view=5,drag_drop=3,comment=2"
+STATUSES = ("TODO", "IN_PROGRESS", "IN_REVIEW", "DONE", "BLOCKED")
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_accounts(database_url: str, concurrency: int, skew: float, rng: random.Random) -> List[dict]:
+    """
+    Pick one account per virtual user.
+    
+    Tenants are ranked by active member count and chosen with weight
+    1 / rank ** skew; the account is a random active member of the tenant.
+    """
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            tenants = connection.execute(
+                select(UserOrganization.organization_id, func.count())
+                .where(UserOrganization.is_active == True)
+                .group_by(UserOrganization.organization_id)
+                .order_by(func.count().desc(), UserOrganization.organization_id)
+            ).all()
+            if not tenants:
+                raise SystemExit("No active memberships in the database; run scripts/generate_data.py first")
+            weights = [1 / (rank ** skew) for rank in range(1, len(tenants) + 1)]
+            chosen = rng.choices([tenant for tenant, _ in tenants], weights=weights, k=concurrency)
+            members = defaultdict(list)
+            rows = connection.execute(
+                select(User.id, User.email, UserOrganization.organization_id, Role.name)
+                .join(UserOrganization, UserOrganization.user_id == User.id)
+                .join(Role, Role.id == UserOrganization.role_id)
+                .where(
+                    UserOrganization.organization_id.in_(set(chosen)),
+                    UserOrganization.is_active == True,
+                    User.is_active == True
+                )
+                .order_by(User.id)
+            )
+            for user_id, email, organization_id, role in rows:
+                members[organization_id].append({
+                    "user_id": user_id, "email": email, "organization_id": organization_id, "role": role
+                })
+    finally:
+        engine.dispose()
+    return [rng.choice(members[tenant]) for tenant in chosen if members[tenant]]
+
+
+class Recorder:
+    """Latency samples and status counts per route label."""
+    
+    def __init__(self):
+        self.recording = False
+        self.started = 0.0
+        self.stopped = 0.0
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+    
+    def start(self) -> None:
+        self.recording = True
+        self.started = time.perf_counter()
+    
+    def stop(self) -> None:
+        self.recording = False
+        self.stopped = time.perf_counter()
+    
+    def add(self, label: str, seconds: float, outcome: Any) -> None:
+        if self.recording:
+            self.samples[label].append(seconds)
+            self.statuses[label][str(outcome)] += 1
+    
+    def summary(self) -> Dict[str, dict]:
+        elapsed = max(self.stopped - self.started, 1e-9)
+        
+        def describe(latencies: List[float], statuses: Counter) -> dict:
+            ordered = sorted(latencies)
+            errors = sum(n for outcome, n in statuses.items() if not outcome.isdigit() or int(outcome) >= 400)
+            return {
+                "count": len(ordered),
+                "errors": errors,
+                "error_rate": errors / len(ordered) if ordered else 0.0,
+                "throughput": len(ordered) / elapsed,
+                "mean_ms": 1000 * sum(ordered) / len(ordered) if ordered else 0.0,
+                "p50_ms": 1000 * percentile(ordered, 0.50),
+                "p95_ms": 1000 * percentile(ordered, 0.95),
+                "p99_ms": 1000 * percentile(ordered, 0.99),
+                "max_ms": 1000 * ordered[-1] if ordered else 0.0,
+                "statuses": dict(statuses),
+            }
+        
+        routes = {label: describe(self.samples[label], self.statuses[label]) for label in sorted(self.samples)}
+        total_statuses = Counter()
+        for statuses in self.statuses.values():
+            total_statuses.update(statuses)
+        total = describe([s for samples in self.samples.values() for s in samples], total_statuses)
+        return {"duration": elapsed, "routes": routes, "total": total}
+
+
+class VirtualUser:
+    """One simulated browser session: a token, an ETag cache and what it has seen."""
+    
+    def __init__(
+        self, client: httpx.AsyncClient, account: dict, password: str,
+        recorder: Recorder, scenarios: Recorder, rng: random.Random
+    ):
+        self.client = client
+        self.account = account
+        self.password = password
+        self.recorder = recorder
+        self.scenarios = scenarios
+        self.rng = rng
+        self.headers: Dict[str, str] = {}
+        self.cache: Dict[str, tuple] = {}
+        self.projects: List[int] = []
+        self.tasks: List[dict] = []
+    
+    async def request(self, label: str, method: str, path: str, **kwargs) -> Optional[Any]:
+        """Send one request, record it under label and return the JSON body (or None on failure)."""
+        headers = dict(self.headers)
+        cached = self.cache.get(path) if method == "GET" else None
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, settings.API_V1_STR + path, headers=headers, **kwargs)
+        except httpx.HTTPError as exc:
+            self.recorder.add(label, time.perf_counter() - start, type(exc).__name__)
+            return None
+        self.recorder.add(label, time.perf_counter() - start, response.status_code)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        if response.status_code >= 400 or response.status_code == 204:
+            return None
+        body = response.json()
+        if method == "GET" and "etag" in response.headers:
+            self.cache[path] = (response.headers["etag"], body)
+        return body
+    
+    async def batch(self, label: str, paths: List[str]) -> List[Any]:
+        """The frontend's batchGet: chunks of BATCH_MAX_REQUESTS sent concurrently."""
+        size = settings.BATCH_MAX_REQUESTS
+        chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+        results = await asyncio.gather(*(
+            self.request(label, "POST", "/batch/", json={"requests": [{"method": "GET", "path": p} for p in chunk]})
+            for chunk in chunks
+        ))
+        bodies = []
+        for chunk, result in zip(chunks, results):
+            items = result["responses"] if result else [{"status": 0, "body": None}] * len(chunk)
+            bodies.extend(item["body"] if 200 <= item["status"] < 300 else None for item in items)
+        return bodies
+    
+    async def login(self) -> bool:
+        body = await self.request(
+            "POST /auth/login", "POST", "/auth/login",
+            json={"email": self.account["email"], "password": self.password}
+        )
+        if body:
+            self.headers = {"Authorization": f"Bearer {body['access_token']}"}
+        return body is not None
+    
+    async def dashboard(self) -> None:
+        _, _, projects = await self.batch("POST /batch/ [dashboard projects]", [
+            "/projects/?page=1&page_size=1",
+            "/users/?page=1&page_size=100",
+            "/projects/?page=1&page_size=100",
+        ])
+        self.projects = [project["id"] for project in (projects or {}).get("items", [])]
+        boards = await self.batch("POST /batch/ [dashboard boards]", [f"/boards/project/{p}" for p in self.projects])
+        board_ids = [board["id"] for result in boards for board in (result or [])]
+        await self.batch("POST /batch/ [dashboard tasks]", [f"/tasks/board/{b}?fields=status" for b in board_ids])
+    
+    async def board_view(self) -> None:
+        if not self.projects:
+            await self.dashboard()
+            if not self.projects:
+                return
+        project_id = self.rng.choice(self.projects)
+        _, boards, _ = await asyncio.gather(
+            self.request("GET /projects/{id}", "GET", f"/projects/{project_id}"),
+            self.request("GET /boards/project/{id}", "GET", f"/boards/project/{project_id}"),
+            self.request("GET /users/", "GET", "/users/"),
+        )
+        results = await asyncio.gather(*(
+            self.request("GET /tasks/board/{id}", "GET", f"/tasks/board/{board['id']}") for board in boards or []
+        ))
+        self.tasks = [task for result in results for task in (result or [])]
+    
+    def pick_task(self) -> Optional[dict]:
+        """A task this user may change; members may only move their own or assigned tasks."""
+        tasks = self.tasks
+        if self.account["role"] == "MEMBER":
+            user_id = self.account["user_id"]
+            tasks = [t for t in tasks if t.get("created_by") == user_id or t.get("assigned_to") == user_id]
+        return self.rng.choice(tasks) if tasks else None
+    
+    async def drag_drop(self) -> None:
+        task = self.pick_task()
+        if task is None:
+            await self.board_view()
+            task = self.pick_task()
+        if task is None:
+            return
+        status = self.rng.choice([s for s in STATUSES if s != task.get("status")])
+        body = await self.request(
+            "PUT /tasks/{id}", "PUT", f"/tasks/{task['id']}",
+            json={"status": status, "position": self.rng.randrange(100)}
+        )
+        if body:
+            task.update(body)
+    
+    async def comment(self) -> None:
+        if not self.tasks:
+            await self.board_view()
+            if not self.tasks:
+                return
+        task = self.rng.choice(self.tasks)
+        await self.request("GET /comments/task/{id}", "GET", f"/comments/task/{task['id']}")
+        await self.request(
+            "POST /comments/", "POST", "/comments/",
+            json={"task_id": task["id"], "content": f"Load test comment {self.rng.randrange(10 ** 6)}"}
+        )
+    
+    async def run(self, mix: Dict[str, float], deadline: float, think: float) -> None:
+        if not await self.login():
+            return
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        while time.perf_counter() < deadline:
+            name = self.rng.choices(names, weights=weights)[0]
+            start = time.perf_counter()
+            await getattr(self, name)()
+            self.scenarios.add(name, time.perf_counter() - start, 200)
+            if think:
+                await asyncio.sleep(self.rng.expovariate(1 / think))
+
+
+async def run_load(args: argparse.Namespace, accounts: List[dict]) -> Dict[str, Recorder]:
+    recorders = {"routes": Recorder(), "scenarios": Recorder()}
+    app = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        from app.main import app
+        await app.router.startup()
+        # Unhandled errors become 500 responses, as behind a real server.
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout)
+    try:
+        start = time.perf_counter()
+        deadline = start + args.warmup + args.duration
+        users = [
+            VirtualUser(
+                client, account, args.password, recorders["routes"], recorders["scenarios"],
+                random.Random(args.seed + i)
+            )
+            for i, account in enumerate(accounts)
+        ]
+        tasks = [asyncio.create_task(user.run(args.mix, deadline, args.think_ms / 1000)) for user in users]
+        await asyncio.sleep(args.warmup)
+        for recorder in recorders.values():
+            recorder.start()
+        await asyncio.gather(*tasks)
+        for recorder in recorders.values():
+            recorder.stop()
+    finally:
+        await client.aclose()
+        if app is not None:
+            await app.router.shutdown()
+    return recorders
+
+
+def print_summary(summary: dict, heading: str) -> None:
+    print(f"{heading:<40}{'count':>8}{'errors':>8}{'per s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for label, stats in list(summary["routes"].items()) + [("total", summary["total"])]:
+        print(
+            f"{label:<40}{stats['count']:>8}{stats['errors']:>8}{stats['throughput']:>9.1f}"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+        )
+
+
+def compare(
+    summary: dict, baseline: dict, max_latency: float, max_errors: float, max_throughput: float, min_samples: int
+) -> List[str]:
+    """Routes that regressed against the baseline, as messages; routes with too few samples are only shown."""
+    regressions = []
+    for label, base in baseline["routes"].items():
+        current = summary["routes"].get(label)
+        if current is None:
+            print(f"  {label}: not exercised in this run")
+            continue
+        p95_change = current["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        throughput_change = 1 - current["throughput"] / base["throughput"] if base["throughput"] else 0.0
+        error_change = current["error_rate"] - base["error_rate"]
+        print(
+            f"  {label:<40} p95 {base['p95_ms']:.1f} -> {current['p95_ms']:.1f} ms ({p95_change:+.0%}), "
+            f"errors {base['error_rate']:.2%} -> {current['error_rate']:.2%}"
+        )
+        if min(base["count"], current["count"]) < min_samples:
+            continue
+        if p95_change > max_latency:
+            regressions.append(f"{label}: p95 {p95_change:+.0%} (limit +{max_latency:.0%})")
+        if error_change > max_errors:
+            regressions.append(f"{label}: error rate +{error_change:.2%} (limit +{max_errors:.2%})")
+        if throughput_change > max_throughput:
+            regressions.append(f"{label}: throughput -{throughput_change:.0%} (limit -{max_throughput:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server; default: the app in-process")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="Where to find accounts")
+    parser.add_argument("--password", default="password123", help="Password of every account")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds run before measuring")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between scenarios")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Default: {DEFAULT_MIX}")
+    parser.add_argument("--tenant-skew", type=float, default=1.1, help="Zipf exponent over tenants; 0 for uniform")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with this JSON file from --save")
+    parser.add_argument("--max-latency-regression", type=float, default=0.25, help="Allowed p95 increase")
+    parser.add_argument("--max-error-increase", type=float, default=0.01, help="Allowed error rate increase")
+    parser.add_argument("--max-throughput-drop", type=float, default=0.25, help="Allowed throughput decrease")
+    parser.add_argument("--min-samples", type=int, default=30, help="Routes with fewer requests are not judged")
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    accounts = load_accounts(args.database_url, args.concurrency, args.tenant_skew, rng)
+    tenants = Counter(account["organization_id"] for account in accounts)
+    print(
+        f"{len(accounts)} virtual users across {len(tenants)} tenants "
+        f"(busiest: {tenants.most_common(1)[0][1]} users), target {args.url or 'in-process ASGI'}"
+    )
+    
+    recorders = asyncio.run(run_load(args, accounts))
+    summary = recorders["routes"].summary()
+    scenarios = recorders["scenarios"].summary()
+    print_summary(summary, "route")
+    print()
+    print_summary(scenarios, "scenario")
+    
+    if args.save:
+        result = {
+            "meta": {
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "revision": git_revision(),
+                "target": args.url or "asgi",
+                "concurrency": len(accounts),
+                "tenants": len(tenants),
+                "duration": args.duration,
+                "think_ms": args.think_ms,
+                "mix": args.mix,
+                "tenant_skew": args.tenant_skew,
+                "seed": args.seed,
+            },
+            **summary,
+            "scenarios": scenarios["routes"],
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Saved {args.save}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.baseline} (revision {baseline.get('meta', {}).get('revision')}):")
+        regressions = compare(
+            summary, baseline, args.max_latency_regression, args.max_error_increase, args.max_throughput_drop,
+            args.min_samples
+        )
+        if regressions:
+            print("Regressions:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
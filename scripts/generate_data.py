@@ -0,0 +1,301 @@
+"""
+Generate a large synthetic multi-tenant dataset for performance work.
+
+Creates --tenants organizations whose sizes follow a Zipf distribution
+(a few large tenants, a long tail of small ones) with --tasks tasks in
+total, plus users, memberships, projects, boards and comments scaled
+to each tenant. Rows are written in bulk (COPY on PostgreSQL, a single
+executemany elsewhere) with explicit IDs after the current maximum, so
+the data is added to whatever the database already holds.
+
+The same arguments and --seed produce the same data on an empty
+database. All users share the password given by --password (hashed
+once). Run scripts/init_db.py first so the tables and roles exist.
+
+Usage:
+    python scripts/generate_data.py --tenants 200 --tasks 10000000
+    python scripts/generate_data.py --tasks 100000 --database-url sqlite:///bench.db
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from app.organizations.models import Organization
+from app.users.models import User, UserOrganization
+from app.roles.models import Role
+from app.projects.models import Project
+from app.boards.models import Board
+from app.tasks.models import Task, TaskStatus, TaskPriority
+from app.comments.models import Comment
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.utils.bulk import BulkInserter
+
+
+WORDS = (
+    "api board sprint deploy review customer invoice latency dashboard export login error "
+    "mobile layout payment webhook retry queue report filter search cache index migration "
+    "billing onboarding email notification permission audit upload import backup release"
+).split()
+
+STATUS_WEIGHTS = {
+    TaskStatus.TODO: 30, TaskStatus.IN_PROGRESS: 15, TaskStatus.IN_REVIEW: 5,
+    TaskStatus.DONE: 45, TaskStatus.BLOCKED: 5
+}
+PRIORITY_WEIGHTS = {TaskPriority.LOW: 25, TaskPriority.MEDIUM: 50, TaskPriority.HIGH: 20, TaskPriority.URGENT: 5}
+
+# Generated timestamps fall in the year before this instant, so they do
+# not depend on when the script runs.
+EPOCH = datetime(2026, 1, 1)
+YEAR_SECONDS = 365 * 24 * 3600
+
+TEXT_POOL_SIZE = 2000
+
+
+def zipf_sizes(total: int, tenants: int, exponent: float, rng: random.Random) -> List[int]:
+    """Split total into tenant sizes proportional to 1 / rank ** exponent, in random order."""
+    weights = [1 / rank ** exponent for rank in range(1, tenants + 1)]
+    scale = total / sum(weights)
+    sizes = [int(weight * scale) for weight in weights]
+    sizes[0] += total - sum(sizes)
+    rng.shuffle(sizes)
+    return sizes
+
+
+class DataGenerator:
+    """Generates tenants one at a time and writes them in bulk."""
+    
+    def __init__(self, engine: Engine, args: argparse.Namespace):
+        self.engine = engine
+        self.args = args
+        self.rng = random.Random(args.seed)
+        dialect = engine.dialect
+        self.inserters = {
+            "organizations": BulkInserter(
+                Organization.__table__, ("id", "name", "slug"), ("is_active", "created_at", "updated_at"), dialect
+            ),
+            "users": BulkInserter(
+                User.__table__, ("id", "email", "first_name", "last_name"),
+                ("password_hash", "is_active", "is_verified", "created_at", "updated_at"), dialect
+            ),
+            "user_organizations": BulkInserter(
+                UserOrganization.__table__, ("id", "user_id", "role_id"),
+                ("organization_id", "is_active", "created_at", "updated_at"), dialect
+            ),
+            "projects": BulkInserter(
+                Project.__table__, ("id", "name", "slug", "description", "created_by"),
+                ("organization_id", "is_active", "created_at", "updated_at"), dialect
+            ),
+            "boards": BulkInserter(
+                Board.__table__, ("id", "project_id", "name", "position"),
+                ("organization_id", "is_active", "created_at", "updated_at"), dialect
+            ),
+            "tasks": BulkInserter(
+                Task.__table__,
+                ("id", "board_id", "title", "description", "status", "priority", "assigned_to",
+                 "created_by", "due_date", "position", "created_at", "updated_at"),
+                ("organization_id",), dialect
+            ),
+            "comments": BulkInserter(
+                Comment.__table__, ("id", "task_id", "user_id", "content", "created_at", "updated_at"),
+                ("organization_id",), dialect
+            ),
+        }
+        self.counts = {table: 0 for table in self.inserters}
+        self.next_id: Dict[str, int] = {}
+        self.titles = [
+            " ".join(self.rng.choices(WORDS, k=self.rng.randint(3, 7))).capitalize()
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.descriptions = [
+            " ".join(self.rng.choices(WORDS, k=self.rng.randint(20, 120))).capitalize() + "."
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.password_hash = get_password_hash(args.password)
+    
+    def allocate(self, table: str, count: int) -> range:
+        start = self.next_id[table]
+        self.next_id[table] = start + count
+        return range(start, start + count)
+    
+    def timestamp(self) -> datetime:
+        return EPOCH - timedelta(seconds=self.rng.randrange(YEAR_SECONDS))
+    
+    def run(self) -> None:
+        args = self.args
+        with self.engine.connect() as connection:
+            roles = dict(connection.execute(select(Role.name, Role.id)).all())
+            missing = {"ORG_ADMIN", "PROJECT_MANAGER", "MEMBER"} - roles.keys()
+            if missing:
+                sys.exit(f"Missing roles {sorted(missing)}; run scripts/init_db.py first")
+            self.roles = roles
+            for table in self.inserters:
+                column = self.inserters[table].table.c.id
+                self.next_id[table] = (connection.execute(select(func.max(column))).scalar() or 0) + 1
+            
+            sizes = zipf_sizes(args.tasks, args.tenants, args.zipf, self.rng)
+            print(f"Largest tenants: {sorted(sizes, reverse=True)[:5]} tasks; smallest: {min(sizes)}")
+            started = time.perf_counter()
+            for index, size in enumerate(sizes, 1):
+                self.generate_tenant(connection, size)
+                connection.commit()
+                elapsed = time.perf_counter() - started
+                print(
+                    f"\r{index}/{len(sizes)} tenants, {self.counts['tasks']} tasks "
+                    f"({self.counts['tasks'] / max(elapsed, 1e-9):.0f} tasks/s)",
+                    end="", file=sys.stderr, flush=True
+                )
+            print(file=sys.stderr)
+            self.finish(connection)
+            connection.commit()
+        
+        elapsed = time.perf_counter() - started
+        total = sum(self.counts.values())
+        print(f"Inserted {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/s)")
+        for table, count in self.counts.items():
+            print(f"  {table:<20}{count:>12}")
+    
+    def insert(self, connection: Connection, table: str, rows: List[tuple], constants: tuple) -> None:
+        self.inserters[table].insert(connection, rows, constants)
+        self.counts[table] += len(rows)
+    
+    def generate_tenant(self, connection: Connection, task_count: int) -> None:
+        rng = self.rng
+        args = self.args
+        now = self.timestamp()
+        (organization_id,) = self.allocate("organizations", 1)
+        self.insert(connection, "organizations", [
+            (organization_id, f"Tenant {organization_id}", f"tenant-{args.seed}-{organization_id}")
+        ], (True, now, now))
+        
+        user_ids = list(self.allocate("users", min(max(task_count // args.tasks_per_user, 3), args.max_users)))
+        self.insert(connection, "users", [
+            (user_id, f"user{user_id}@tenant{organization_id}.example.com", "User", str(user_id))
+            for user_id in user_ids
+        ], (self.password_hash, True, True, now, now))
+        managers = max(1, len(user_ids) // 10)
+        self.insert(connection, "user_organizations", [
+            (membership_id, user_id, self.roles[
+                "ORG_ADMIN" if i == 0 else "PROJECT_MANAGER" if i <= managers else "MEMBER"
+            ])
+            for i, (membership_id, user_id) in enumerate(zip(self.allocate("user_organizations", len(user_ids)), user_ids))
+        ], (organization_id, True, now, now))
+        
+        project_ids = list(self.allocate("projects", max(1, task_count // args.tasks_per_project)))
+        self.insert(connection, "projects", [
+            (project_id, f"Project {project_id}", f"project-{project_id}", rng.choice(self.descriptions), rng.choice(user_ids))
+            for project_id in project_ids
+        ], (organization_id, True, now, now))
+        
+        boards = []
+        for project_id in project_ids:
+            for position in range(rng.randint(2, 6)):
+                boards.append((project_id, position))
+        board_ids = list(self.allocate("boards", len(boards)))
+        self.insert(connection, "boards", [
+            (board_id, project_id, f"Board {position + 1}", position)
+            for board_id, (project_id, position) in zip(board_ids, boards)
+        ], (organization_id, True, now, now))
+        
+        # Boards and assignees are skewed too: a few hot boards and busy people.
+        board_weights = [1 / rank ** args.zipf for rank in range(1, len(board_ids) + 1)]
+        user_weights = [1 / rank ** args.zipf for rank in range(1, len(user_ids) + 1)]
+        positions = dict.fromkeys(board_ids, 0)
+        for start in range(0, task_count, args.batch_size):
+            self.generate_tasks(
+                connection, organization_id, min(args.batch_size, task_count - start),
+                board_ids, board_weights, user_ids, user_weights, positions
+            )
+    
+    def generate_tasks(
+        self,
+        connection: Connection,
+        organization_id: int,
+        count: int,
+        board_ids: List[int],
+        board_weights: List[float],
+        user_ids: List[int],
+        user_weights: List[float],
+        positions: Dict[int, int]
+    ) -> None:
+        rng = self.rng
+        args = self.args
+        task_ids = self.allocate("tasks", count)
+        boards = rng.choices(board_ids, board_weights, k=count)
+        statuses = rng.choices(list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values()), k=count)
+        priorities = rng.choices(list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values()), k=count)
+        assignees = rng.choices(user_ids, user_weights, k=count)
+        creators = rng.choices(user_ids, user_weights, k=count)
+        rows = []
+        created = []
+        for i, task_id in enumerate(task_ids):
+            board_id = boards[i]
+            position = positions[board_id]
+            positions[board_id] = position + 1
+            created_at = self.timestamp()
+            created.append(created_at)
+            rows.append((
+                task_id,
+                board_id,
+                rng.choice(self.titles),
+                rng.choice(self.descriptions) if rng.random() < 0.4 else None,
+                statuses[i],
+                priorities[i],
+                assignees[i] if rng.random() < 0.8 else None,
+                creators[i],
+                created_at + timedelta(days=rng.randint(1, 60)) if rng.random() < 0.3 else None,
+                position,
+                created_at,
+                created_at
+            ))
+        self.insert(connection, "tasks", rows, (organization_id,))
+        
+        comment_count = int(count * args.comments_per_task)
+        if comment_count:
+            indexes = sorted(rng.choices(range(count), k=comment_count))
+            authors = rng.choices(user_ids, user_weights, k=comment_count)
+            comments = []
+            for comment_id, index, user_id in zip(self.allocate("comments", comment_count), indexes, authors):
+                created_at = created[index] + timedelta(seconds=rng.randrange(30 * 24 * 3600))
+                comments.append((comment_id, task_ids[index], user_id, rng.choice(self.titles), created_at, created_at))
+            self.insert(connection, "comments", comments, (organization_id,))
+    
+    def finish(self, connection: Connection) -> None:
+        """Move ID sequences past the generated IDs and refresh planner statistics."""
+        if self.engine.dialect.name == "postgresql":
+            for table in self.inserters:
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+                ))
+        connection.execute(text("ANALYZE"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenants", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="Total tasks across all tenants")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Skew exponent for tenant, board and assignee sizes")
+    parser.add_argument("--comments-per-task", type=float, default=1.5)
+    parser.add_argument("--tasks-per-user", type=int, default=200)
+    parser.add_argument("--max-users", type=int, default=5000)
+    parser.add_argument("--tasks-per-project", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Tasks per bulk insert")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--database-url", help="Default: DATABASE_URL from settings")
+    args = parser.parse_args()
+    
+    # A separate engine: the application's echoes SQL in development.
+    engine = create_engine(args.database_url or settings.DATABASE_URL)
+    DataGenerator(engine, args).run()
+
+
+if __name__ == "__main__":
+    main()
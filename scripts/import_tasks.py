@@ -0,0 +1,93 @@
+"""
+Bulk-import tasks into one organization from a CSV or NDJSON file.
+
+CSV files need a header row with TaskCreate field names (board_id,
+title, description, status, priority, assigned_to, due_date, position);
+NDJSON files hold one such object per line. "assignee_email" may be
+given instead of "assigned_to".
+
+Rejected records go to <file>.rejects.ndjson with the reason per field.
+Progress is checkpointed to <file>.checkpoint.json after every batch;
+running the same command again resumes where it stopped. Use --restart
+to ignore an existing checkpoint.
+
+Usage:
+    python scripts/import_tasks.py tasks.csv --organization-id 1 --user-id 1
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.invalidation import invalidation_bus
+from app.database.session import SessionLocal
+from app.tasks.importer import ImportCheckpoint, ImportProgress, TaskImporter, read_records
+from app.users.models import UserOrganization
+
+
+def print_progress(progress: ImportProgress) -> None:
+    elapsed = time.perf_counter() - progress.started
+    print(
+        f"\r{progress.records} records, {progress.inserted} inserted, {progress.rejected} rejected"
+        f" ({elapsed:.1f}s)",
+        end="",
+        file=sys.stderr,
+        flush=True
+    )
+
+
+def import_tasks(args: argparse.Namespace) -> int:
+    import_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    rejects_path = args.rejects or f"{args.path}.rejects.ndjson"
+    checkpoint = ImportCheckpoint(args.checkpoint or f"{args.path}.checkpoint.json", args.path)
+    if not args.restart and checkpoint.load():
+        print(f"Resuming after record {checkpoint.state['records']}", file=sys.stderr)
+    records_before = checkpoint.state["records"]
+    
+    db = SessionLocal()
+    invalidation_bus.start()
+    try:
+        member = db.query(UserOrganization).filter(
+            UserOrganization.user_id == args.user_id,
+            UserOrganization.organization_id == args.organization_id,
+            UserOrganization.is_active == True
+        ).first()
+        if member is None:
+            print(f"User {args.user_id} is not an active member of organization {args.organization_id}", file=sys.stderr)
+            return 2
+        
+        importer = TaskImporter(db, args.organization_id, args.user_id, args.batch_size)
+        with open(args.path, encoding="utf-8", newline="") as stream:
+            started = time.perf_counter()
+            progress = importer.run(read_records(stream, import_format), rejects_path, checkpoint, print_progress)
+            elapsed = time.perf_counter() - started
+    finally:
+        invalidation_bus.stop()
+        db.close()
+    
+    print(file=sys.stderr)
+    print(
+        f"Imported {progress.inserted} tasks, rejected {progress.rejected} "
+        f"in {elapsed:.1f}s ({(progress.records - records_before) / max(elapsed, 1e-9):.0f} records/s)"
+    )
+    if progress.rejected:
+        print(f"Rejected records: {rejects_path}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--organization-id", type=int, required=True)
+    parser.add_argument("--user-id", type=int, required=True, help="Member recorded as the creator of every task")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Default: from the file extension")
+    parser.add_argument("--batch-size", type=int, help="Default: IMPORT_BATCH_SIZE")
+    parser.add_argument("--rejects")
+    parser.add_argument("--checkpoint")
+    parser.add_argument("--restart", action="store_true")
+    sys.exit(import_tasks(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
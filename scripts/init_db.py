@@ -2,6 +2,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from app.database.session import SessionLocal, engine
 from app.database.base import Base
@@ -12,6 +13,7 @@ from app.projects.models import Project
 from app.boards.models import Board
 from app.tasks.models import Task
 from app.comments.models import Comment
+from app.auth.models import RevokedToken
 
 
 def init_roles(db: Session):
@@ -36,12 +38,52 @@ def init_roles(db: Session):
     db.commit()
 
 
+def create_missing_indexes():
+    """
+    Create indexes added to models after their tables were created.
+    
+    create_all() skips existing tables together with their indexes.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def add_missing_columns():
+    """
+    Add columns added to models after their tables were created.
+    
+    Only columns that are nullable or have a server default can be added
+    to a table that already has rows.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not (column.nullable or column.server_default is not None):
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                conn.exec_driver_sql(ddl)
+                print(f"Added column {table.name}.{column.name}")
+
+
 def init_database():
     """
     Initialize the database with tables and default data.
     """
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    create_missing_indexes()
     print("Database tables created successfully!")
     
     db = SessionLocal()
@@ -0,0 +1,27 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read at import time, so the environment is set up before any app import.
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+os.environ.setdefault("ENVIRONMENT", "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.base import Base  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+import scripts.init_db  # noqa: E402,F401  (imports every model)
+
+
+@pytest.fixture
+def db():
+    """Session on freshly created tables, dropped afterwards."""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from app.batch.context import BatchContext
+from app.batch.schemas import BatchOperation
+from app.batch.service import BatchService
+from app.core.config import settings
+from app.database.session import get_db
+from app.organizations.models import Organization
+
+
+@pytest.mark.parametrize("path", [
+    "/batch",
+    "/batch/?x=1",
+    "/realtime/stream?board_id=1",
+    "/realtime/stream",
+    "/exports/tasks?format=csv",
+    "/exports/comments",
+])
+def test_rejects_nested_and_streaming_paths(path):
+    with pytest.raises(ValidationError):
+        BatchOperation(path=path)
+
+
+@pytest.mark.parametrize("path", ["relative", "//evil.example/tasks"])
+def test_rejects_paths_outside_the_api(path):
+    with pytest.raises(ValidationError):
+        BatchOperation(path=path)
+
+
+@pytest.mark.parametrize("path", ["/projects/?page=2", "/tasks/board/1", "/realtimeish", "/exportsx/1"])
+def test_accepts_api_paths(path):
+    assert BatchOperation(path=path).path == path
+
+
+def batch_app(log):
+    """App with test routes under the API prefix, sharing the batch session through get_db."""
+    app = FastAPI()
+    
+    @app.get(settings.API_V1_STR + "/fail")
+    def fail(db: Session = Depends(get_db)):
+        db.add(Organization(name="Uncommitted", slug="uncommitted"))
+        db.flush()
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    @app.get(settings.API_V1_STR + "/count")
+    def count(db: Session = Depends(get_db)):
+        return {"organizations": db.query(Organization).count()}
+    
+    @app.get(settings.API_V1_STR + "/slow/{name}")
+    async def slow(name: str):
+        log.append(f"start {name}")
+        await asyncio.sleep(0.01)
+        log.append(f"end {name}")
+        return {}
+    
+    return app
+
+
+def run_batch(app, db, *paths):
+    scope = {"type": "http", "method": "POST", "path": "/api/v1/batch/", "headers": [], "app": app}
+    context = BatchContext("token", {"user_id": 1}, db)
+    operations = [BatchOperation(id=str(i), path=path) for i, path in enumerate(paths)]
+    body = asyncio.run(BatchService.execute(Request(scope), operations, context))
+    return json.loads(body)["responses"]
+
+
+def test_failed_get_is_rolled_back(db):
+    responses = run_batch(batch_app([]), db, "/fail", "/count")
+    
+    assert [r["status"] for r in responses] == [404, 200]
+    assert responses[1]["body"] == {"organizations": 0}
+
+
+def test_items_run_in_order(db):
+    log = []
+    run_batch(batch_app(log), db, "/slow/a", "/slow/b")
+    assert log == ["start a", "end a", "start b", "end b"]
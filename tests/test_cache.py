@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from fastapi import Request, Response
+from app.core.cache import LRUCacheBackend, ResponseCache
+
+
+def cache():
+    return ResponseCache(LRUCacheBackend(100), default_ttl=60, max_ttl=60)
+
+
+def request(path="/tasks/1", route="/tasks/{task_id}", query=b""):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query,
+        "headers": [],
+        "route": SimpleNamespace(path=route)
+    }
+    return Request(scope)
+
+
+class Builder:
+    """Sync build callable counting its calls and the threads it ran on."""
+    
+    def __init__(self, status_code=200, delay=0.0):
+        self.status_code = status_code
+        self.delay = delay
+        self.calls = 0
+        self.threads = set()
+    
+    def __call__(self):
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return Response(content=b'{"n": %d}' % self.calls, status_code=self.status_code, media_type="application/json")
+
+
+def serve(c, build, tenant_id=1, namespace="tasks", req=None):
+    return asyncio.run(c.serve(req or request(), namespace, tenant_id, "member", build))
+
+
+def test_miss_then_hit():
+    c, build = cache(), Builder()
+    
+    first = serve(c, build)
+    second = serve(c, build)
+    
+    assert build.calls == 1
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.body == first.body
+    assert threading.get_ident() not in build.threads
+
+
+def test_invalidate_drops_only_that_tenant_and_namespace():
+    c, build = cache(), Builder()
+    serve(c, build, tenant_id=1)
+    serve(c, build, tenant_id=2)
+    serve(c, build, tenant_id=1, namespace=("tasks", "users"))
+    
+    c.invalidate(1, "users")
+    assert serve(c, build, tenant_id=1).headers["X-Cache"] == "HIT"
+    assert serve(c, build, tenant_id=1, namespace=("tasks", "users")).headers["X-Cache"] == "MISS"
+    
+    c.invalidate(1, "tasks")
+    assert serve(c, build, tenant_id=1).headers["X-Cache"] == "MISS"
+    assert serve(c, build, tenant_id=2).headers["X-Cache"] == "HIT"
+    assert build.calls == 5
+
+
+def test_errors_are_not_stored():
+    c, build = cache(), Builder(status_code=404)
+    serve(c, build)
+    serve(c, build)
+    assert build.calls == 2
+    assert c.stats()["/tasks/{task_id}"]["stores"] == 0
+
+
+def test_stats_per_route_template():
+    c, build = cache(), Builder()
+    serve(c, build, req=request("/tasks/1"))
+    serve(c, build, req=request("/tasks/2"))
+    serve(c, build, req=request("/tasks/1"))
+    serve(c, build, req=request("/boards/1", route="/boards/{board_id}"))
+    
+    stats = c.stats()
+    assert stats["/tasks/{task_id}"]["misses"] == 2
+    assert stats["/tasks/{task_id}"]["hits"] == 1
+    assert stats["/boards/{board_id}"]["misses"] == 1
+    assert 0.33 < stats["/tasks/{task_id}"]["hit_ratio"] < 0.34
+
+
+def test_concurrent_misses_are_coalesced():
+    c, build = cache(), Builder(delay=0.05)
+    
+    async def burst():
+        return await asyncio.gather(*(c.serve(request(), "tasks", 1, "member", build) for _ in range(5)))
+    
+    responses = asyncio.run(burst())
+    
+    assert build.calls == 1
+    assert sorted(r.headers["X-Cache"] for r in responses) == ["HIT"] * 4 + ["MISS"]
+    assert c.stats()["/tasks/{task_id}"]["coalesced"] == 4
+
+
+def test_waiters_build_themselves_when_leader_stores_nothing():
+    c, build = cache(), Builder(status_code=500, delay=0.02)
+    
+    async def burst():
+        return await asyncio.gather(*(c.serve(request(), "tasks", 1, "member", build) for _ in range(3)))
+    
+    asyncio.run(burst())
+    assert build.calls == 3
+    assert c._inflight == {}
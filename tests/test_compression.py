@@ -0,0 +1,92 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.core.compression import CompressionMiddleware, CompressionPolicy, choose_encoding
+from app.utils.etag import entity_etag, etag_headers, is_not_modified, not_modified_response
+from app.utils.serialization import PreEncodedJSONResponse
+
+BODY = json.dumps([{"id": i, "title": f"Task {i}"} for i in range(100)]).encode()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    
+    @app.get("/api/v1/tasks/{task_id}")
+    def task(request: Request, task_id: int):
+        etag = entity_etag(task_id)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        return PreEncodedJSONResponse(content=BODY, headers=etag_headers(etag))
+    
+    @app.get("/api/v1/small")
+    def small():
+        return {"ok": True}
+    
+    @app.get("/api/v1/auth/token")
+    def token():
+        return PreEncodedJSONResponse(content=BODY)
+    
+    @app.get("/api/v1/stream")
+    def stream():
+        return StreamingResponse(iter([b'{"a":1}\n', b'{"b":2}\n']), media_type="application/x-ndjson")
+    
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=512,
+        route_policies={"/api/v1/auth": CompressionPolicy(enabled=False)}
+    )
+    return TestClient(app, headers={"Accept-Encoding": "gzip"})
+
+
+def test_weakened_etag_still_matches_if_none_match(client):
+    response = client.get("/api/v1/tasks/5")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"5"'
+    assert response.content == BODY
+    
+    revalidated = client.get("/api/v1/tasks/5", headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert "content-encoding" not in revalidated.headers
+
+
+def test_identity_keeps_strong_etag(client):
+    response = client.get("/api/v1/tasks/5", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"5"'
+
+
+def test_small_bodies_are_not_compressed(client):
+    response = client.get("/api/v1/small")
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_route_policy_disables_compression(client):
+    response = client.get("/api/v1/auth/token")
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY
+
+
+def test_streaming_is_compressed_per_chunk(client):
+    with client.stream("GET", "/api/v1/stream") as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw) == b'{"a":1}\n{"b":2}\n'
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip;q=0, identity", None),
+    ("*", "br"),
+    ("deflate", None),
+])
+def test_choose_encoding(header, expected):
+    if expected == "br" and choose_encoding("br") is None:
+        expected = "gzip"  # brotli not installed
+    assert choose_encoding(header) == expected
@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import event
+from app.core.entity_cache import EntityOwnerCache
+from app.database.session import SessionLocal, engine
+from app.organizations.models import Organization
+from app.projects.models import Project
+from app.users.models import User
+
+
+@pytest.fixture
+def project(db):
+    """Project 1 owned by organization 7."""
+    db.add(User(id=1, email="owner@example.com", password_hash="x"))
+    db.add(Organization(id=7, name="Org", slug="org"))
+    db.add(Project(id=1, name="P", slug="p", organization_id=7, created_by=1))
+    db.commit()
+    return 1
+
+
+@pytest.fixture
+def queries():
+    """Statements executed on the engine while the test runs."""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_levels(db, project, queries):
+    cache = EntityOwnerCache(100)
+    
+    assert cache.owner_of(db, Project, project) == 7
+    assert cache.owner_of(db, Project, project) == 7
+    with SessionLocal() as other:
+        assert cache.owner_of(other, Project, project) == 7
+    
+    assert len(queries) == 1
+    assert cache.stats() == {"l1_hits": 1, "l2_hits": 1, "misses": 1, "entries": 1}
+
+
+def test_without_l2_each_session_queries(db, project, queries):
+    cache = EntityOwnerCache(100, l2_enabled=False)
+    
+    cache.owner_of(db, Project, project)
+    with SessionLocal() as other:
+        cache.owner_of(other, Project, project)
+    
+    assert len(queries) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_missing_rows_are_not_cached(db, project, queries):
+    cache = EntityOwnerCache(100)
+    
+    assert cache.owner_of(db, Project, 99) is None
+    assert cache.owner_of(db, Project, 99) is None
+    assert len(queries) == 2
+
+
+def test_invalidate_drops_both_levels(db, project, queries):
+    cache = EntityOwnerCache(100)
+    cache.owner_of(db, Project, project)
+    
+    cache.invalidate(Project, project, db)
+    cache.owner_of(db, Project, project)
+    
+    assert len(queries) == 2
+
+
+def test_invalidation_during_load_is_not_overwritten(db, project):
+    cache = EntityOwnerCache(100)
+    
+    def invalidate_midway(conn, cursor, statement, parameters, context, executemany):
+        cache.evict("projects", project)
+    
+    event.listen(engine, "before_cursor_execute", invalidate_midway, once=True)
+    assert cache.owner_of(db, Project, project) == 7
+    
+    # The loaded value was served but not stored in L2
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_bound(db, project):
+    cache = EntityOwnerCache(1)
+    db.add(Project(id=2, name="Q", slug="q", organization_id=7, created_by=1))
+    db.commit()
+    
+    cache.owner_of(db, Project, 1)
+    cache.owner_of(db, Project, 2)
+    
+    assert cache.stats()["entries"] == 1
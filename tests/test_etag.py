@@ -0,0 +1,32 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+from app.utils.etag import entity_etag, if_match_versions
+
+
+def request_with(if_match=None):
+    headers = [(b"if-match", if_match.encode())] if if_match is not None else []
+    return Request({"type": "http", "method": "PUT", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("header, versions", [
+    (None, None),
+    ("*", None),
+    ('"4"', (4,)),
+    ('"4-0123abcd"', (4,)),
+    ('W/"4"', (4,)),
+    ('"3", W/"5-ab"', (3, 5)),
+])
+def test_if_match_versions(header, versions):
+    assert if_match_versions(request_with(header)) == versions
+
+
+@pytest.mark.parametrize("header", ['W/"abc"', "4", '"x-1"'])
+def test_if_match_without_a_version_fails(header):
+    with pytest.raises(HTTPException) as exc:
+        if_match_versions(request_with(header))
+    assert exc.value.status_code == 412
+
+
+def test_compressed_etag_round_trips():
+    assert if_match_versions(request_with("W/" + entity_etag(7, ("title",)))) == (7,)
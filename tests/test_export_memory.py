@@ -0,0 +1,22 @@
+from scripts.benchmarks.bench_export_memory import build_database, measure
+
+SMALL_ROWS = 5_000
+LARGE_ROWS = 50_000
+
+# Streaming 10x the rows must not grow peak RSS by more than this; loading
+# the same rows with .all() grows it by several times as much.
+MAX_GROWTH_MIB = 12.0
+
+
+def test_streamed_export_memory_is_bounded(tmp_path):
+    path = str(tmp_path / "export.db")
+    build_database(path, {1: SMALL_ROWS, 2: LARGE_ROWS})
+    
+    small_peak, _, small_size = measure(path, 1, "ndjson")
+    large_peak, _, large_size = measure(path, 2, "ndjson")
+    all_peak, _, _ = measure(path, 2, "ndjson", load_all=True)
+    
+    assert large_size > 9 * small_size
+    growth = large_peak - small_peak
+    assert growth < MAX_GROWTH_MIB, f"peak RSS grew {growth:.1f} MiB for {LARGE_ROWS} rows"
+    assert all_peak - small_peak > 2 * MAX_GROWTH_MIB
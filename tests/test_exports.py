@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+
+import pytest
+from app.boards.models import Board
+from app.database.session import SessionLocal
+from app.exports.schemas import ExportEntity, ExportFormat
+from app.exports.service import ExportService
+from app.organizations.models import Organization
+from app.projects.models import Project
+from app.tasks.models import Task
+from app.users.models import User
+
+TITLES = ["=SUM(A1:A9)", "+1", "-2", "@cmd", "plain"]
+
+
+@pytest.fixture
+def tenant(db):
+    """Organization 1 with len(TITLES) tasks, and organization 2 with one task."""
+    db.add(User(id=1, email="export@example.com", password_hash="x"))
+    for organization_id in (1, 2):
+        db.add(Organization(id=organization_id, name=f"Org {organization_id}", slug=f"org-{organization_id}"))
+        db.add(Project(id=organization_id, name="P", slug="p", organization_id=organization_id, created_by=1))
+        db.add(Board(id=organization_id, name="B", project_id=organization_id, organization_id=organization_id))
+    db.flush()
+    db.add_all(Task(title=title, board_id=1, organization_id=1, created_by=1) for title in TITLES)
+    db.add(Task(title="other tenant", board_id=2, organization_id=2, created_by=1))
+    db.commit()
+    return 1
+
+
+@pytest.fixture
+def sessions():
+    """Session factory recording which of its sessions were closed."""
+    opened, closed = [], []
+    
+    def factory():
+        session = SessionLocal()
+        close = session.close
+        
+        def tracked_close():
+            closed.append(session)
+            close()
+        
+        session.close = tracked_close
+        opened.append(session)
+        return session
+    
+    factory.opened = opened
+    factory.closed = closed
+    return factory
+
+
+def test_ndjson_yields_one_chunk_per_batch(tenant, sessions):
+    chunks = list(ExportService.stream(ExportEntity.TASKS, tenant, ExportFormat.NDJSON, sessions, batch_size=2))
+    
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [row["title"] for row in rows] == TITLES
+    assert {row["organization_id"] for row in rows} == {tenant}
+    assert sessions.closed == sessions.opened and len(sessions.opened) == 1
+
+
+def test_csv_has_header_and_escapes_formulas(tenant, sessions):
+    chunks = list(ExportService.stream(ExportEntity.TASKS, tenant, ExportFormat.CSV, sessions, batch_size=2))
+    
+    assert len(chunks) == 4
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert [row["title"] for row in rows] == ["'=SUM(A1:A9)", "'+1", "'-2", "'@cmd", "plain"]
+    assert rows[0]["status"] == "TODO"
+    assert sessions.closed == sessions.opened
+
+
+def test_session_closed_when_client_disconnects(tenant, sessions):
+    stream = ExportService.stream(ExportEntity.TASKS, tenant, ExportFormat.NDJSON, sessions, batch_size=2)
+    next(stream)
+    assert sessions.closed == []
+    
+    stream.close()
+    assert sessions.closed == sessions.opened and len(sessions.opened) == 1
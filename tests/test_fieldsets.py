@@ -0,0 +1,104 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from app.boards.models import Board
+from app.database.session import engine
+from app.organizations.models import Organization
+from app.projects.models import Project
+from app.roles.models import Role
+from app.tasks.models import Task
+from app.tasks.schemas import TASK_EXPANSIONS, TaskResponse
+from app.tasks.service import TaskService
+from app.users.loader import UserLoader
+from app.users.models import User, UserOrganization
+from app.utils.fieldsets import FieldSelection
+
+
+def selection(fields=None, expand=None):
+    return FieldSelection.parse(TaskResponse, TASK_EXPANSIONS, fields, expand)
+
+
+@pytest.fixture
+def board(db):
+    """
+    Board 1 of organization 1 with three tasks: assigned to member 1,
+    to user 3 who belongs to organization 2 only, and unassigned.
+    """
+    db.add(Role(id=1, name="MEMBER"))
+    for user_id in (1, 2, 3):
+        db.add(User(id=user_id, email=f"user{user_id}@example.com", password_hash="x", first_name=f"U{user_id}"))
+    for organization_id in (1, 2):
+        db.add(Organization(id=organization_id, name=f"Org {organization_id}", slug=f"org-{organization_id}"))
+    db.flush()
+    db.add_all([
+        UserOrganization(user_id=1, organization_id=1, role_id=1),
+        UserOrganization(user_id=2, organization_id=1, role_id=1),
+        UserOrganization(user_id=3, organization_id=2, role_id=1),
+    ])
+    db.add(Project(id=1, name="P", slug="p", organization_id=1, created_by=1))
+    db.add(Board(id=1, name="B", project_id=1, organization_id=1))
+    db.flush()
+    db.add_all([
+        Task(title="a", board_id=1, organization_id=1, created_by=2, assigned_to=1),
+        Task(title="b", board_id=1, organization_id=1, created_by=2, assigned_to=3),
+        Task(title="c", board_id=1, organization_id=1, created_by=1),
+    ])
+    db.commit()
+    return 1
+
+
+@pytest.fixture
+def queries():
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_parse_orders_fields_and_adds_id():
+    parsed = selection("status, title", "creator,assignee")
+    # Schema order, whatever the order in the query
+    assert parsed.fields == tuple(name for name in TaskResponse.model_fields if name in {"id", "title", "status"})
+    assert parsed.expand == ("assignee", "creator")
+    assert selection().is_default
+
+
+@pytest.mark.parametrize("fields, expand", [("title,secret", None), (None, "owner")])
+def test_unknown_names_are_rejected(fields, expand):
+    with pytest.raises(HTTPException) as error:
+        selection(fields, expand)
+    assert error.value.status_code == 400
+
+
+def test_exclude_keeps_expansion_keys():
+    excluded = selection("title", "assignee").exclude()
+    assert {"id", "title", "assigned_to"}.isdisjoint(excluded)
+    assert {"description", "status", "created_by"} <= set(excluded)
+
+
+def test_expand_loads_users_once(db, board, queries):
+    parsed = selection("title", "assignee,creator")
+    rows = TaskService.list_tasks_by_board(db, board, 1, exclude=parsed.exclude())
+    selects = [q for q in queries if q.startswith("SELECT")]
+    assert "description" not in selects[-1]
+    
+    loader = UserLoader.for_session(db, 1)
+    loader.load_many(parsed.related_ids(rows))
+    loader.load_many(parsed.related_ids(rows))
+    assert UserLoader.for_session(db, 1) is loader
+    assert len([q for q in queries if q.startswith("SELECT")]) == len(selects) + 1
+    
+    body = json.loads(parsed.json_list_response(rows, loader.get).body)
+    by_title = {item["title"]: item for item in body}
+    assert set(by_title["a"]) == {"id", "title", "assignee", "creator"}
+    assert by_title["a"]["assignee"]["first_name"] == "U1"
+    assert by_title["a"]["creator"]["id"] == 2
+    # User 3 is not a member of the tenant
+    assert by_title["b"]["assignee"] is None
+    assert by_title["c"]["assignee"] is None
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from app.boards.models import Board
+from app.organizations.models import Organization
+from app.projects.models import Project
+from app.tasks.importer import ImportCheckpoint, TaskImporter, read_records
+from app.tasks.models import Task
+from app.users.models import User
+
+BATCH_SIZE = 2
+
+
+class Crash(BaseException):
+    """Stands in for the process being killed: no except Exception handler runs."""
+
+
+@pytest.fixture
+def source(db, tmp_path):
+    """Board 1 of organization 1 and an NDJSON file of 7 records; record 4 is invalid."""
+    db.add(User(id=1, email="importer@example.com", password_hash="x"))
+    db.add(Organization(id=1, name="Org", slug="org"))
+    db.add(Project(id=1, name="P", slug="p", organization_id=1, created_by=1))
+    db.add(Board(id=1, name="B", project_id=1, organization_id=1))
+    db.commit()
+    
+    path = tmp_path / "tasks.ndjson"
+    records = [{"board_id": 1, "title": f"Task {i}"} for i in range(1, 8)]
+    records[3] = {"board_id": 1}
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+def run(db, path):
+    checkpoint = ImportCheckpoint(f"{path}.checkpoint.json", str(path))
+    checkpoint.load()
+    with open(path, encoding="utf-8") as stream:
+        importer = TaskImporter(db, organization_id=1, user_id=1, batch_size=BATCH_SIZE)
+        return importer.run(read_records(stream, "ndjson"), f"{path}.rejects.ndjson", checkpoint)
+
+
+def crash_on_batch(monkeypatch, target, name, batch):
+    """Make target.name raise Crash on its batch-th call."""
+    original = getattr(target, name)
+    calls = []
+    
+    def crashing(self, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == batch:
+            raise Crash()
+        return original(self, *args, **kwargs)
+    
+    monkeypatch.setattr(target, name, crashing)
+
+
+def assert_imported_once(db, path, progress):
+    titles = sorted(title for (title,) in db.query(Task.title))
+    assert titles == [f"Task {i}" for i in (1, 2, 3, 5, 6, 7)]
+    assert progress.as_dict() == {"records": 7, "inserted": 6, "rejected": 1}
+    rejects = [json.loads(line) for line in open(f"{path}.rejects.ndjson", encoding="utf-8")]
+    assert [reject["record"] for reject in rejects] == [4]
+
+
+def test_crash_after_db_commit_resumes_without_duplicates(db, source, monkeypatch):
+    # Batch 2 (records 3-4) is committed, then the process dies before the checkpoint
+    crash_on_batch(monkeypatch, ImportCheckpoint, "commit", 2)
+    with pytest.raises(Crash):
+        run(db, source)
+    db.rollback()
+    assert db.query(Task).count() == 3
+    monkeypatch.undo()
+    
+    assert_imported_once(db, source, run(db, source))
+
+
+def test_crash_before_db_commit_reimports_the_batch(db, source, monkeypatch):
+    # The process dies while inserting batch 2, after its pending checkpoint was saved
+    crash_on_batch(monkeypatch, type(db), "commit", 2)
+    with pytest.raises(Crash):
+        run(db, source)
+    db.rollback()
+    assert db.query(Task).count() == 2
+    monkeypatch.undo()
+    
+    assert_imported_once(db, source, run(db, source))
+
+
+def test_completed_import_is_not_repeated(db, source):
+    run(db, source)
+    progress = run(db, source)
+    assert_imported_once(db, source, progress)
+
+
+def test_checkpoint_rejects_a_changed_file(db, source):
+    run(db, source)
+    with open(source, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"board_id": 1, "title": "Task 8"}) + "\n")
+    with pytest.raises(ValueError):
+        run(db, source)
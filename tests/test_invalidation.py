@@ -0,0 +1,40 @@
+import pytest
+from app.core.cache import LocalSharedClient, LRUCacheBackend, ResponseCache, SharedCacheBackend
+from app.core.entity_cache import EntityOwnerCache
+from app.core.invalidation import InvalidationBus, LocalTransport
+
+
+def worker(channel, backend):
+    cache = ResponseCache(backend, default_ttl=60, max_ttl=60)
+    bus = InvalidationBus(LocalTransport(channel), cache, EntityOwnerCache(100))
+    bus.start()
+    return bus
+
+
+def generation(bus, tenant_id, namespace):
+    return bus.responses.backend.get_counter(bus.responses._generation_key(tenant_id, namespace))
+
+
+@pytest.mark.parametrize("make_backend", [
+    lambda: LRUCacheBackend(100),
+    lambda: SharedCacheBackend(LocalSharedClient()),
+])
+def test_publish_invalidates_other_workers(make_backend, request):
+    a = worker(request.node.name, make_backend())
+    b = worker(request.node.name, make_backend())
+    try:
+        a.publish(1, "tasks", "boards")
+        
+        assert generation(a, 1, "tasks") == 1
+        assert generation(b, 1, "tasks") == 1
+        assert generation(b, 1, "boards") == 1
+        assert generation(b, 2, "tasks") == 0
+        assert b.received == 1 and a.received == 0
+    finally:
+        a.stop()
+        b.stop()
+
+
+def test_local_shared_client_is_not_shared():
+    assert not SharedCacheBackend(LocalSharedClient()).shared
+    assert SharedCacheBackend(object()).shared
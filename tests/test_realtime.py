@@ -0,0 +1,113 @@
+import asyncio
+import json
+import threading
+from app.realtime.events import change_event
+from app.realtime.hub import CONNECTED, HEARTBEAT, RESYNC, RealtimeHub
+
+
+def task_event(op, task_id, **data):
+    return change_event("board:1", "task", op, task_id, data)
+
+
+def changes(chunk):
+    assert chunk.startswith(b"event: changes\ndata: ")
+    return json.loads(chunk.split(b"data: ", 1)[1])
+
+
+async def open_stream(hub, tenant_id=1, topics=("board:1",)):
+    await hub.start()
+    stream = hub.stream(tenant_id, topics, max_seconds=5)
+    assert await stream.__anext__() == CONNECTED
+    return stream
+
+
+def run(scenario, **options):
+    hub = RealtimeHub(**{"coalesce_seconds": 0.02, "heartbeat_seconds": 60, "max_pending": 100, **options})
+    
+    async def main():
+        try:
+            return await asyncio.wait_for(scenario(hub), 2)
+        finally:
+            await hub.stop()
+    
+    return asyncio.run(main())
+
+
+def test_burst_is_coalesced_per_entity():
+    async def scenario(hub):
+        stream = await open_stream(hub)
+        hub.publish(1, [task_event("updated", 1, status="DONE")])
+        hub.publish(1, [task_event("updated", 1, position=3), task_event("created", 2, title="new")])
+        hub.publish(1, [task_event("updated", 2, title="renamed")])
+        chunk = await stream.__anext__()
+        await stream.aclose()
+        return chunk
+    
+    events = changes(run(scenario))
+    assert [(e["id"], e["op"], e["data"]) for e in events] == [
+        (1, "updated", {"status": "DONE", "position": 3}),
+        (2, "created", {"title": "renamed"}),
+    ]
+
+
+def test_create_then_delete_cancels_out():
+    async def scenario(hub):
+        stream = await open_stream(hub)
+        hub.publish(1, [task_event("created", 1), task_event("deleted", 1), task_event("deleted", 2)])
+        chunk = await stream.__anext__()
+        await stream.aclose()
+        return chunk
+    
+    assert [(e["id"], e["op"]) for e in changes(run(scenario))] == [(2, "deleted")]
+
+
+def test_other_tenants_and_topics_are_not_delivered():
+    async def scenario(hub):
+        stream = await open_stream(hub)
+        hub.publish(2, [task_event("updated", 1, status="DONE")])
+        hub.publish(1, [change_event("board:9", "task", "updated", 5, {"status": "DONE"})])
+        hub.publish(1, [task_event("updated", 3, status="DONE")])
+        chunk = await stream.__anext__()
+        await stream.aclose()
+        return chunk, hub.stats()
+    
+    chunk, stats = run(scenario)
+    assert [e["id"] for e in changes(chunk)] == [3]
+    assert stats["published"] == 3 and stats["delivered"] == 1
+    assert stats["subscribers"] == 0
+
+
+def test_idle_stream_gets_heartbeats():
+    async def scenario(hub):
+        stream = await open_stream(hub)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        await stream.aclose()
+        return chunks
+    
+    assert run(scenario, heartbeat_seconds=0.01) == [HEARTBEAT, HEARTBEAT]
+
+
+def test_overflow_and_bus_gaps_resync():
+    async def scenario(hub):
+        stream = await open_stream(hub)
+        hub.publish(1, [task_event("updated", task_id, status="DONE") for task_id in range(3)])
+        overflow = await stream.__anext__()
+        hub.resync()
+        gap = await stream.__anext__()
+        await stream.aclose()
+        return overflow, gap
+    
+    assert run(scenario, max_pending=2) == (RESYNC, RESYNC)
+
+
+def test_publish_from_another_thread():
+    async def scenario(hub):
+        stream = await open_stream(hub)
+        thread = threading.Thread(target=hub.publish, args=(1, [task_event("updated", 1, status="DONE")]))
+        thread.start()
+        thread.join()
+        chunk = await stream.__anext__()
+        await stream.aclose()
+        return chunk
+    
+    assert changes(run(scenario))[0]["data"] == {"status": "DONE"}
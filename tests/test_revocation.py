@@ -0,0 +1,80 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import inspect
+from app.auth.models import RevokedToken
+from app.auth.revocation import RevocationRegistry, revoke_token
+from app.database.session import engine, pool_counters
+
+
+def registry(refresh_seconds=0):
+    return RevocationRegistry(
+        engine, refresh_seconds=refresh_seconds, capacity=1000, error_rate=0.001, lookback_seconds=60
+    )
+
+
+def payload(jti):
+    return {"jti": jti, "user_id": 1, "organization_id": 1, "exp": int(time.time()) + 3600}
+
+
+def test_loads_rows_committed_out_of_id_order(db):
+    expires = datetime.utcnow() + timedelta(hours=1)
+    db.add_all([RevokedToken(id=1, jti="a", expires_at=expires), RevokedToken(id=3, jti="c", expires_at=expires)])
+    db.commit()
+    reg = registry()
+    reg.refresh()
+    
+    # id 2 commits after id 3 has been read
+    db.add(RevokedToken(id=2, jti="b", expires_at=expires))
+    db.commit()
+    reg.refresh()
+    reg.refresh()
+    
+    assert reg.is_revoked(payload("b"))
+    assert reg._bloom.count == 3
+
+
+def test_revoke_token_is_idempotent(db):
+    revoke_token(db, payload("same"))
+    revoke_token(db, payload("same"))
+    db.commit()
+    assert db.query(RevokedToken).filter(RevokedToken.jti == "same").count() == 1
+
+
+def test_started_registry_checks_memory_only(db):
+    expires = datetime.utcnow() + timedelta(hours=1)
+    db.add(RevokedToken(jti="revoked", expires_at=expires))
+    db.add(RevokedToken(user_id=2, organization_id=1, expires_at=expires))
+    db.commit()
+    reg = registry(refresh_seconds=60)
+    reg.start()
+    try:
+        checkouts = pool_counters.snapshot()["checkouts"]
+        assert not reg.is_revoked(payload("fresh"))
+        assert not asyncio.run(reg.is_revoked_async(payload("fresh")))
+        assert asyncio.run(reg.is_revoked_async({**payload("other"), "user_id": 2, "iat": 0}))
+        assert pool_counters.snapshot()["checkouts"] == checkouts
+        
+        # A filter hit is confirmed against the table
+        assert asyncio.run(reg.is_revoked_async(payload("revoked")))
+    finally:
+        reg.stop()
+
+
+def test_background_refresh_picks_up_new_revocations(db):
+    reg = registry(refresh_seconds=0.02)
+    reg.start()
+    try:
+        db.add(RevokedToken(jti="late", expires_at=datetime.utcnow() + timedelta(hours=1)))
+        db.commit()
+        deadline = time.monotonic() + 2
+        while not reg.is_revoked(payload("late")) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert reg.is_revoked(payload("late"))
+    finally:
+        reg.stop()
+
+
+def test_created_at_is_indexed(db):
+    indexes = inspect(engine).get_indexes("revoked_tokens")
+    assert any(index["column_names"] == ["created_at"] for index in indexes)
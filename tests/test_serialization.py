@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+from app.boards.models import Board
+from app.core.negotiation import ContentNegotiationMiddleware
+from app.organizations.models import Organization
+from app.projects.models import Project
+from app.tasks.models import Task
+from app.tasks.schemas import TaskResponse
+from app.tasks.service import TaskService
+from app.users.models import User
+from app.utils import serialization
+from app.utils.etag import entity_etag
+from app.utils.serialization import (
+    JSON, MSGPACK, MSGPACK_COLUMNAR, current_format, json_list_response, negotiate_format
+)
+
+
+def negotiated(accept):
+    """Format the middleware selects for an Accept header, and the one left after it."""
+    seen = []
+    
+    async def app(scope, receive, send):
+        seen.append(current_format.get())
+    
+    scope = {"type": "http", "headers": [(b"accept", accept.encode())] if accept else []}
+    asyncio.run(ContentNegotiationMiddleware(app)(scope, None, None))
+    return seen[0], current_format.get()
+
+
+@pytest.fixture
+def rows(db):
+    db.add(User(id=1, email="wire@example.com", password_hash="x"))
+    db.add(Organization(id=1, name="Org", slug="org"))
+    db.add(Project(id=1, name="P", slug="p", organization_id=1, created_by=1))
+    db.add(Board(id=1, name="B", project_id=1, organization_id=1))
+    db.flush()
+    db.add_all(Task(title=f"T{i}", board_id=1, organization_id=1, created_by=1, position=i) for i in range(3))
+    db.commit()
+    return TaskService.list_tasks_by_board(db, 1, 1)
+
+
+def encode(wire_format, rows):
+    token = current_format.set(wire_format)
+    try:
+        return json_list_response(TaskResponse, rows)
+    finally:
+        current_format.reset(token)
+
+
+def test_json_without_msgpack(monkeypatch):
+    monkeypatch.setattr(serialization, "msgpack", None)
+    assert negotiated("application/msgpack") == (JSON, JSON)
+    assert negotiated(None) == (JSON, JSON)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("application/msgpack", MSGPACK),
+    ("application/x-msgpack", MSGPACK),
+    ("application/msgpack; layout=columnar", MSGPACK_COLUMNAR),
+    ("application/json, application/msgpack", JSON),
+    ("application/json;q=0.5, application/msgpack", MSGPACK),
+    ("application/msgpack;q=0", JSON),
+    ("text/html", JSON),
+])
+def test_negotiate_format(accept, expected):
+    pytest.importorskip("msgpack")
+    assert negotiate_format(accept) == expected
+    assert negotiated(accept) == (expected, JSON)
+
+
+def test_msgpack_layouts_decode_to_the_json_data(rows):
+    msgpack = pytest.importorskip("msgpack")
+    as_json = json.loads(encode(JSON, rows).body)
+    
+    row_layout = encode(MSGPACK, rows)
+    assert row_layout.media_type == "application/msgpack"
+    assert msgpack.unpackb(row_layout.body) == as_json
+    
+    columnar = encode(MSGPACK_COLUMNAR, rows)
+    assert columnar.media_type == "application/msgpack; layout=columnar"
+    columns = msgpack.unpackb(columnar.body)
+    assert list(columns) == list(TaskResponse.model_fields)
+    assert [dict(zip(columns, values)) for values in zip(*columns.values())] == as_json
+
+
+def test_etag_depends_on_wire_format():
+    tags = set()
+    for wire_format in (JSON, MSGPACK, MSGPACK_COLUMNAR):
+        token = current_format.set(wire_format)
+        tags.add(entity_etag(4))
+        current_format.reset(token)
+    assert len(tags) == 3
+    assert '"4"' in tags
@@ -0,0 +1,66 @@
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.cache import LRUCacheBackend, ResponseCache
+from app.database import session as session_module
+from app.utils.serialization import PreEncodedJSONResponse
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Sessions created through get_db while the test runs."""
+    sessions = []
+    factory = session_module.SessionLocal
+    
+    def counting_factory():
+        sessions.append(factory())
+        return sessions[-1]
+    
+    monkeypatch.setattr(session_module, "SessionLocal", counting_factory)
+    return sessions
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    cache = ResponseCache(LRUCacheBackend(10), default_ttl=60, max_ttl=60)
+    
+    @app.get("/items")
+    async def items(request: Request, db: Session = Depends(session_module.get_db)):
+        def build():
+            value = db.execute(text("SELECT 42")).scalar()
+            return PreEncodedJSONResponse(content=str(value).encode())
+        return await cache.serve(request, "items", 1, None, build)
+    
+    @app.get("/unused")
+    def unused(db: Session = Depends(session_module.get_db)):
+        return {}
+    
+    return TestClient(app)
+
+
+def test_cache_hit_creates_no_session(client, created):
+    assert client.get("/items").json() == 42
+    assert len(created) == 1
+    
+    hit = client.get("/items")
+    assert hit.headers["X-Cache"] == "HIT"
+    assert len(created) == 1
+
+
+def test_unused_session_is_never_created(client, created):
+    client.get("/unused")
+    assert created == []
+
+
+def test_lazy_session_closes_what_it_created(created):
+    lazy = session_module.LazySession(session_module.SessionLocal)
+    lazy.close()
+    assert not lazy.created
+    
+    assert lazy.execute(text("SELECT 1")).scalar() == 1
+    assert lazy.created and created[0].in_transaction()
+    lazy.close()
+    assert not created[0].in_transaction()
@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from app.core.tracing import TracingMiddleware
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+class Exporter:
+    def __init__(self):
+        self.traces = []
+    
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def call(middleware, traceparent=None):
+    headers = [(b"traceparent", traceparent.encode())] if traceparent else []
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": headers}
+    messages = []
+    
+    async def receive():
+        return {"type": "http.request"}
+    
+    async def send(message):
+        messages.append(message)
+    
+    asyncio.run(middleware(scope, receive, send))
+    return dict(messages[0]["headers"])
+
+
+@pytest.mark.parametrize("flags, trust_parent, sampled", [
+    ("01", False, False),
+    ("01", True, True),
+    ("00", True, False),
+])
+def test_parent_sampled_flag_needs_trust(flags, trust_parent, sampled):
+    exporter = Exporter()
+    middleware = TracingMiddleware(app, exporter, sample_rate=0.0, trust_parent=trust_parent)
+    
+    headers = call(middleware, f"00-{TRACE_ID}-00f067aa0ba902b7-{flags}")
+    
+    assert bool(exporter.traces) is sampled
+    assert headers[b"x-trace-id"] == TRACE_ID.encode()
+    assert headers[b"traceparent"].endswith(b"-01" if sampled else b"-00")
+
+
+def test_untrusted_parent_uses_sample_rate():
+    exporter = Exporter()
+    middleware = TracingMiddleware(app, exporter, sample_rate=1.0)
+    
+    call(middleware, f"00-{TRACE_ID}-00f067aa0ba902b7-00")
+    call(middleware)
+    
+    assert [trace.trace_id for trace in exporter.traces][0] == TRACE_ID
+    assert len(exporter.traces) == 2
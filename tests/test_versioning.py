@@ -0,0 +1,87 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, update
+from app.boards.models import Board
+from app.boards.service import BoardService
+from app.database.session import engine
+from app.organizations.models import Organization
+from app.projects.models import Project
+from app.projects.service import ProjectService
+from app.tasks.models import Task
+from app.tasks.service import TaskService
+from app.users.models import User
+
+
+@pytest.fixture
+def tenant(db):
+    """Organization 1 with project 1, board 1 and task 1."""
+    db.add(User(id=1, email="versioning@example.com", password_hash="x"))
+    db.add(Organization(id=1, name="Org", slug="org"))
+    db.add(Project(id=1, name="P", slug="p", organization_id=1, created_by=1))
+    db.add(Board(id=1, name="B", project_id=1, organization_id=1))
+    db.flush()
+    db.add(Task(id=1, title="T", board_id=1, organization_id=1, created_by=1))
+    db.commit()
+    return 1
+
+
+@pytest.fixture
+def concurrent_update():
+    """
+    Commit a version bump from another connection right before the
+    service writes the row, as a concurrent PUT would.
+    """
+    pending = []
+    
+    def bump(conn, cursor, statement, parameters, context, executemany):
+        for model in list(pending):
+            if statement.startswith(("DELETE FROM " + model.__tablename__, "UPDATE " + model.__tablename__)):
+                pending.remove(model)
+                with engine.begin() as connection:
+                    connection.execute(update(model).values(version=model.version + 1))
+    
+    event.listen(engine, "before_cursor_execute", bump)
+    yield pending.append
+    event.remove(engine, "before_cursor_execute", bump)
+
+
+def test_delete_task_after_concurrent_update(db, tenant, concurrent_update):
+    concurrent_update(Task)
+    
+    TaskService.delete_task(db, 1, tenant, user_id=1, user_role="ORG_ADMIN")
+    
+    assert db.query(Task).count() == 0
+    with pytest.raises(HTTPException) as error:
+        TaskService.delete_task(db, 1, tenant, user_id=1, user_role="ORG_ADMIN")
+    assert error.value.status_code == 404
+
+
+def test_member_cannot_delete_task(db, tenant):
+    with pytest.raises(HTTPException) as error:
+        TaskService.delete_task(db, 1, tenant, user_id=1, user_role="MEMBER")
+    assert error.value.status_code == 403
+    assert db.query(Task).count() == 1
+
+
+def test_soft_delete_after_concurrent_update(db, tenant, concurrent_update):
+    concurrent_update(Board)
+    concurrent_update(Project)
+    
+    BoardService.delete_board(db, 1, tenant)
+    ProjectService.delete_project(db, 1, tenant)
+    
+    board, project = db.get(Board, 1), db.get(Project, 1)
+    assert not board.is_active and board.version == 3
+    assert not project.is_active and project.version == 3
+
+
+def test_delete_is_tenant_scoped(db, tenant):
+    for delete in (
+        lambda: TaskService.delete_task(db, 1, 2, user_id=1, user_role="ORG_ADMIN"),
+        lambda: BoardService.delete_board(db, 1, 2),
+        lambda: ProjectService.delete_project(db, 1, 2),
+    ):
+        with pytest.raises(HTTPException) as error:
+            delete()
+        assert error.value.status_code == 404
+    assert db.get(Board, 1).is_active and db.query(Task).count() == 1